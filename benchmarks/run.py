@@ -0,0 +1,205 @@
+import argparse
+import importlib.util
+import json
+import random
+import sys
+import time
+import timeit
+from collections import Counter
+from itertools import combinations
+
+from src import evaluator
+from src.card import Card
+from src.deck import Deck
+from src.hand import Hand
+from src.holdem import TexasHoldem
+from src.outs import analyze_outs
+
+# Hot path timings in nanoseconds per operation, best of several repeats.
+#
+#     python -m benchmarks.run --save benchmarks/baseline.json
+#     python -m benchmarks.run --compare benchmarks/baseline.json --tolerance 0.25
+#     python -m benchmarks.run --exhaustive
+#
+# --compare exits non-zero when any benchmark is slower than its baseline by
+# more than the tolerance.
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    # register a setup function returning (callable, operations per call)
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+def _random_hands(size, count=200, seed=0):
+    rng = random.Random(seed)
+    return [[Card.from_int(card) for card in rng.sample(range(52), size)] for _ in range(count)]
+
+@benchmark("card.from_string")
+def _card_from_string():
+    strings = [str(rank) + suit for rank in "23456789TJQKA" for suit in "HDCS"]
+    return lambda: [Card.from_string(card_str) for card_str in strings], len(strings)
+
+def _score_hand(size):
+    hands = _random_hands(size)
+    def run():
+        for cards in hands:
+            Hand(cards).score_hand()
+    return run, len(hands)
+
+for _size in (5, 6, 7):
+    benchmark(f"hand.score_hand.{_size}")(lambda size=_size: _score_hand(size))
+
+@benchmark("hand.compare.7")
+def _hand_compare():
+    hands = [Hand(cards) for cards in _random_hands(7)]
+    def run():
+        for hand_a, hand_b in zip(hands, hands[1:]):
+            hand_a.value = None
+            hand_b.value = None
+            hand_a < hand_b
+    return run, len(hands) - 1
+
+@benchmark("hand.add_card.streets")
+def _hand_streets():
+    hands = _random_hands(7)
+    def run():
+        for cards in hands:
+            hand = Hand(cards[:5])
+            hand.evaluate()
+            hand.add_card(cards[5])
+            hand.evaluate()
+            hand.add_card(cards[6])
+            hand.evaluate()
+    return run, len(hands)
+
+@benchmark("outs.flop")
+def _outs_flop():
+    hole = Card.cards_from_strings(["AH", "KH"])
+    board = Card.cards_from_strings(["2H", "7H", "9C"])
+    return lambda: analyze_outs(hole, board), 1
+
+@benchmark("deck.reset")
+def _deck_reset():
+    deck = Deck(random.Random(0))
+    return deck.reset, 1
+
+@benchmark("deck.shuffle")
+def _deck_shuffle():
+    deck = Deck(random.Random(0))
+    return deck.shuffle, 1
+
+def _deal_many():
+    from src.batch import deal_many
+    rounds = 10000
+    return lambda: deal_many(rounds, 9, dead=[0, 1], rng=0), rounds
+
+if importlib.util.find_spec("numpy") is not None:
+    benchmark("batch.deal_many.9")(_deal_many)
+
+@benchmark("holdem.determine_winner.6")
+def _determine_winner():
+    game = TexasHoldem([f"Player {seat}" for seat in range(6)], rng=random.Random(0))
+    game.deal()
+    game.flop()
+    game.turn()
+    game.river()
+    return game.determine_winner, 1
+
+@benchmark("holdem.snapshot_restore.6")
+def _snapshot_restore():
+    game = TexasHoldem([f"Player {seat}" for seat in range(6)], rng=random.Random(0))
+    game.deal()
+    game.flop()
+    return lambda: game.restore(game.snapshot()), 1
+
+def _simulate(number_of_players, rounds=500):
+    game = TexasHoldem(["Player 0"])
+    hand = Card.cards_from_strings(["AS", "KD"])
+    return lambda: game.simulate(hand, number_of_players, rounds, exact=False, seed=0), rounds
+
+for _players in (2, 6, 10):
+    benchmark(f"holdem.simulate.{_players}")(lambda players=_players: _simulate(players))
+
+def run_benchmarks(names=None, repeat=5) -> dict[str, float]:
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        function, operations = setup()
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=repeat, number=number))
+        results[name] = best / number / operations * 1e9
+    return results
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    # benchmarks slower than baseline * (1 + tolerance)
+    return [name for name, nanoseconds in results.items()
+            if name in baseline and nanoseconds > baseline[name] * (1 + tolerance)]
+
+# category counts of all 2,598,960 five card hands
+FIVE_CARD_COUNTS = {
+    "straight flush": 40, "four of a kind": 624, "full house": 3744, "flush": 5108, "straight": 10200,
+    "three of a kind": 54912, "two pair": 123552, "pair": 1098240, "high card": 1302540,
+}
+
+def _category_name(strength):
+    category = evaluator.category_of(strength)
+    if evaluator.PAIR + 2 <= category <= evaluator.PAIR + 14:
+        return "pair"
+    if evaluator.TWO_PAIR < category < evaluator.THREE_OF_A_KIND:
+        return "two pair"
+    return {evaluator.HIGH_CARD: "high card", evaluator.THREE_OF_A_KIND: "three of a kind",
+            evaluator.STRAIGHT: "straight", evaluator.FLUSH: "flush", evaluator.FULL_HOUSE: "full house",
+            evaluator.FOUR_OF_A_KIND: "four of a kind", evaluator.STRAIGHT_FLUSH: "straight flush",
+            evaluator.ROYAL_FLUSH: "straight flush"}[category]
+
+def exhaustive_five_card() -> tuple[float, bool]:
+    # evaluate every five card hand, returns (hands per second, counts correct)
+    evaluate5 = evaluator.evaluate5
+    start = time.perf_counter()
+    strengths = Counter(evaluate5(cards) for cards in combinations(range(52), 5))
+    seconds = time.perf_counter() - start
+    counts = Counter()
+    for strength, count in strengths.items():
+        counts[_category_name(strength)] += count
+    correct = counts == FIVE_CARD_COUNTS and len(strengths) == 7462
+    return sum(strengths.values()) / seconds, correct
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the hot paths and check them against a baseline")
+    parser.add_argument("names", nargs="*", help="benchmarks to run, all by default")
+    parser.add_argument("--save", help="write the results to this JSON baseline")
+    parser.add_argument("--compare", help="fail if slower than this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 is 25%%")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--exhaustive", action="store_true", help="also evaluate all 2,598,960 five card hands")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.names, args.repeat)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    for name, nanoseconds in results.items():
+        change = f"  {nanoseconds / baseline[name] - 1:+.1%}" if name in baseline else ""
+        print(f"{name:32} {nanoseconds:14,.0f} ns/op{change}")
+
+    failed = False
+    if args.exhaustive:
+        hands_per_second, correct = exhaustive_five_card()
+        print(f"{'exhaustive five card hands':32} {hands_per_second:14,.0f} hands/sec, counts {'ok' if correct else 'WRONG'}")
+        failed = not correct
+    if args.save:
+        with open(args.save, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+    regressions = compare(results, baseline, args.tolerance)
+    for name in regressions:
+        print(f"REGRESSION {name}: {results[name]:,.0f} ns/op against {baseline[name]:,.0f} ns/op baseline")
+    return 1 if regressions or failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
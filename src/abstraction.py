@@ -0,0 +1,240 @@
+import argparse
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import indexer
+from .batch import deal_many, evaluate_many
+
+# Strength buckets for card abstraction. Every (hole, board) state of a
+# street is described by the histogram of its hand strength on the river,
+# HS being the share of the pot won against one random hand: runouts are
+# dealt to the river in one NumPy batch and each is played against a batch
+# of opponent hands. States are then clustered with k-means under earth
+# mover's distance (the L1 distance between the histograms' CDFs), or on
+# E[HS^2] alone, and buckets are numbered from weakest to strongest.
+#
+#     python -m src.abstraction 1 50 flop_buckets.bin --checkpoint-dir ckpt --workers 8
+#
+# Feature chunks are written to the checkpoint directory as they finish, so
+# an interrupted run picks up where it stopped. States are numbered by
+# indexer.index; a table covering a whole street is a flat array of buckets
+# in index order, one built over some states also stores their indexes.
+MAGIC = b"HSBK"
+VERSION = 2
+HEADER = struct.Struct("<4sHBxII")  # magic, version, street, number of states, number of buckets
+
+def strength_features(hole, board, bins: int = 20, runouts: int = 64, opponents: int = 16,
+                      rng=None) -> tuple[np.ndarray, float]:
+    # (histogram of river HS over runouts, E[HS^2]) for one state
+    missing = 5 - len(board)
+    deals = deal_many(runouts, missing + 2 * opponents, list(hole) + list(board), rng)
+    boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.int64), (runouts, len(board))), deals[:, :missing]])
+    hero = evaluate_many(np.hstack([np.broadcast_to(np.array(hole, dtype=np.int64), (runouts, 2)), boards]))
+    opponent_cards = deals[:, missing:].reshape(runouts, opponents, 2)
+    opponent_boards = np.broadcast_to(boards[:, None, :], (runouts, opponents, 5))
+    villains = evaluate_many(np.concatenate([opponent_cards, opponent_boards], axis=2).reshape(-1, 7))
+    villains = villains.reshape(runouts, opponents)
+    strengths = ((hero[:, None] > villains) + 0.5 * (hero[:, None] == villains)).mean(axis=1)
+    histogram = np.bincount(np.minimum((strengths * bins).astype(np.intp), bins - 1), minlength=bins) / runouts
+    return histogram.astype(np.float32), float((strengths ** 2).mean())
+
+def _chunk_features(keys, street, bins, runouts, opponents, seed, chunk, path=None):
+    # features of one chunk of states, saved to path when given
+    rng = np.random.default_rng([seed, chunk])
+    histograms = np.empty((len(keys), bins), dtype=np.float32)
+    squares = np.empty(len(keys), dtype=np.float32)
+    for row, key in enumerate(keys):
+        hole, board = indexer.ids(int(key), street)
+        histograms[row], squares[row] = strength_features(hole, board, bins, runouts, opponents, rng)
+    if path is not None:
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as chunk_file:
+            np.savez(chunk_file, histograms=histograms, squares=squares)
+        os.replace(temporary, path)
+    return histograms, squares
+
+def _nearest(cdfs, centers, memory):
+    # index of the nearest center per row under EMD, in blocks of rows whose
+    # (rows, centers, bins) distance temporary fits in memory bytes
+    block = max(1, memory // (8 * centers.size))
+    nearest = np.empty(len(cdfs), dtype=np.intp)
+    for start in range(0, len(cdfs), block):
+        differences = cdfs[start:start + block, None, :] - centers[None]
+        np.abs(differences, out=differences)
+        nearest[start:start + block] = differences.sum(axis=2).argmin(axis=1)
+    return nearest
+
+def kmeans_emd(histograms: np.ndarray, k: int, iterations: int = 30, seed: int = 0,
+               memory: int = 64 << 20) -> tuple[np.ndarray, np.ndarray]:
+    # (centroid histograms, bucket per row) from k-means under earth mover's
+    # distance, seeded k-means++ style; buckets are sorted by mean strength.
+    # Distances are worked out in blocks using about memory bytes at a time.
+    rng = np.random.default_rng(seed)
+    histograms = np.asarray(histograms, dtype=np.float64)
+    cdfs = np.cumsum(histograms, axis=1)
+    k = min(k, len(cdfs))
+    centers = [cdfs[rng.integers(len(cdfs))]]
+    distances = np.abs(cdfs - centers[0]).sum(axis=1)
+    while len(centers) < k:
+        if distances.sum() == 0:
+            break
+        chosen = rng.choice(len(cdfs), p=distances / distances.sum())
+        centers.append(cdfs[chosen])
+        distances = np.minimum(distances, np.abs(cdfs - cdfs[chosen]).sum(axis=1))
+    centers = np.array(centers)
+
+    assignment = None
+    for _ in range(iterations):
+        new_assignment = _nearest(cdfs, centers, memory)
+        if assignment is not None and (new_assignment == assignment).all():
+            break
+        assignment = new_assignment
+        sizes = np.bincount(assignment, minlength=len(centers))
+        sums = np.zeros_like(centers)
+        np.add.at(sums, assignment, cdfs)
+        filled = sizes > 0
+        centers[filled] = sums[filled] / sizes[filled, None]
+
+    # the CDF's area is one minus the mean strength, so sort descending by it
+    order = np.argsort(-centers.sum(axis=1), kind="stable")
+    relabel = np.empty_like(order)
+    relabel[order] = np.arange(len(order))
+    centroids = np.diff(centers[order], axis=1, prepend=0.0)
+    return centroids, relabel[assignment]
+
+def _kmeans_1d(values: np.ndarray, k: int, iterations: int = 30) -> np.ndarray:
+    # buckets of scalar features from quantile seeded k-means, weakest first
+    centers = np.unique(np.quantile(values, (np.arange(k) + 0.5) / k))
+    for _ in range(iterations):
+        assignment = np.abs(values[:, None] - centers[None]).argmin(axis=1)
+        sizes = np.bincount(assignment, minlength=len(centers))
+        sums = np.bincount(assignment, weights=values, minlength=len(centers))
+        updated = np.where(sizes > 0, sums / np.maximum(sizes, 1), centers)
+        if np.allclose(updated, centers):
+            break
+        centers = updated
+    order = np.argsort(centers)
+    relabel = np.empty_like(order)
+    relabel[order] = np.arange(len(order))
+    return relabel[np.abs(values[:, None] - centers[None]).argmin(axis=1)]
+
+def _states(street, states):
+    if states is None:
+        return np.arange(indexer.size(street), dtype=np.uint64)
+    return np.unique(np.asarray(states, dtype=np.uint64))
+
+def build_buckets(street: int, k: int, path: str, checkpoint_dir: str | None = None, workers: int | None = None,
+                  feature: str = "histogram", bins: int = 20, runouts: int = 64, opponents: int = 16,
+                  chunk_size: int = 2048, seed: int = 0, states=None):
+    # bucket every state of a street (or the given indexes) into k
+    # buckets and write the lookup to path. With a checkpoint_dir finished
+    # feature chunks are kept there and skipped when the build is run again;
+    # a checkpoint made with other states or feature settings is refused.
+    if feature not in ("histogram", "ehs2"):
+        raise ValueError(f"Unknown feature {feature!r}, expected 'histogram' or 'ehs2'")
+    states = _states(street, states)
+    if checkpoint_dir is not None:
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        settings = np.array([street, bins, runouts, opponents, seed, chunk_size], dtype=np.int64)
+        build_path = os.path.join(checkpoint_dir, "build.npz")
+        if os.path.exists(build_path):
+            with np.load(build_path) as saved:
+                if not (np.array_equal(saved["settings"], settings) and np.array_equal(saved["states"], states)):
+                    raise ValueError(f"{checkpoint_dir} holds a build with other states or settings")
+        else:
+            temporary = build_path + ".tmp"
+            with open(temporary, "wb") as build_file:
+                np.savez(build_file, settings=settings, states=states)
+            os.replace(temporary, build_path)
+
+    chunks = [states[start:start + chunk_size] for start in range(0, len(states), chunk_size)]
+    chunk_paths = [os.path.join(checkpoint_dir, f"features_{chunk}.npz") if checkpoint_dir else None
+                   for chunk in range(len(chunks))]
+    results = [None] * len(chunks)
+    for chunk, chunk_path in enumerate(chunk_paths):
+        if chunk_path is not None and os.path.exists(chunk_path):
+            with np.load(chunk_path) as saved:
+                results[chunk] = saved["histograms"], saved["squares"]
+    missing = [chunk for chunk, result in enumerate(results) if result is None]
+    tasks = [(chunks[chunk], street, bins, runouts, opponents, seed, chunk, chunk_paths[chunk]) for chunk in missing]
+    if workers is not None and workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            computed = list(pool.map(_chunk_features, *zip(*tasks))) if tasks else []
+    else:
+        computed = [_chunk_features(*task) for task in tasks]
+    for chunk, result in zip(missing, computed):
+        results[chunk] = result
+
+    histograms = np.concatenate([histograms for histograms, _ in results])
+    squares = np.concatenate([squares for _, squares in results])
+    if feature == "histogram":
+        _, buckets = kmeans_emd(histograms, k, seed=seed)
+    else:
+        buckets = _kmeans_1d(squares.astype(np.float64), k)
+    write_buckets(path, street, states, buckets, k)
+    return BucketTable(path)
+
+def write_buckets(path: str, street: int, keys, buckets, k: int):
+    # keys are sorted indexes, left out when they cover the whole street
+    with open(path, "wb") as table_file:
+        table_file.write(HEADER.pack(MAGIC, VERSION, street, len(keys), k))
+        if len(keys) != indexer.size(street):
+            table_file.write(np.asarray(keys, dtype="<u8").tobytes())
+        table_file.write(np.asarray(buckets, dtype="<u2").tobytes())
+
+class BucketTable:
+    # a street's bucket lookup, read straight out of a memory map
+    def __init__(self, path: str):
+        with open(path, "rb") as table_file:
+            self._map = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.street, count, self.buckets = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a bucket table")
+        view = memoryview(self._map)
+        keys_size = 0 if count == indexer.size(self.street) else 8 * count
+        self._keys = view[HEADER.size:HEADER.size + keys_size].cast("Q") if keys_size else None
+        self._buckets = view[HEADER.size + keys_size:HEADER.size + keys_size + 2 * count].cast("H")
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def bucket(self, hole, board) -> int:
+        # bucket of a state given as Card lists
+        if indexer.street_of(board) != self.street:
+            raise ValueError(f"This table holds street {self.street} states")
+        key = indexer.index(hole, board)
+        if self._keys is None:
+            return self._buckets[key]
+        position = bisect_left(self._keys, key)
+        if position == len(self._keys) or self._keys[position] != key:
+            raise KeyError(f"State is not in the street {self.street} table")
+        return self._buckets[position]
+
+    def close(self):
+        if self._keys is not None:
+            self._keys.release()
+        self._buckets.release()
+        self._map.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute strength buckets for one street")
+    parser.add_argument("street", type=int, choices=range(4), help="0 preflop, 1 flop, 2 turn, 3 river")
+    parser.add_argument("buckets", type=int)
+    parser.add_argument("path")
+    parser.add_argument("--checkpoint-dir", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--feature", choices=("histogram", "ehs2"), default="histogram")
+    parser.add_argument("--runouts", type=int, default=64)
+    parser.add_argument("--opponents", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    build_buckets(args.street, args.buckets, args.path, args.checkpoint_dir, args.workers, args.feature,
+                  runouts=args.runouts, opponents=args.opponents, seed=args.seed)
+
+if __name__ == "__main__":
+    main()
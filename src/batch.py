@@ -0,0 +1,109 @@
+import numpy as np
+
+from . import evaluator
+from .card import NUMBER_OF_CARDS
+
+# NumPy views of the evaluator tables, mapped on first use
+_TABLES = None
+
+def _tables():
+    # flush strengths by rank mask, plus every rank multiset of five to seven
+    # cards as prime products sorted for searchsorted; both read straight out
+    # of the mapped table file
+    global _TABLES
+    if _TABLES is None:
+        flush, _, keys, values = evaluator.table_arrays()
+        primes = np.asarray(evaluator.RANK_PRIMES, dtype=np.uint64)
+        _TABLES = (np.frombuffer(flush, dtype=np.uint32), np.frombuffer(keys, dtype=np.uint64),
+                   np.frombuffer(values, dtype=np.uint32), primes)
+    return _TABLES
+
+def evaluate_many(cards) -> np.ndarray:
+    # strengths of an (N, 5-7) array of card ids, one row per hand
+    cards = np.asarray(cards, dtype=np.int64)
+    if cards.ndim != 2 or not 5 <= cards.shape[1] <= 7:
+        raise ValueError(f"Expected an (N, 5), (N, 6) or (N, 7) array of cards, got shape {cards.shape}")
+    flush, keys, values, primes = _tables()
+    ranks = cards >> 2
+    suits = cards & 3
+
+    # unsuited strength from the rank multiset
+    products = primes[ranks].prod(axis=1)
+    strengths = values[np.searchsorted(keys, products)].astype(np.int64)
+
+    # a suit with five or more cards overrides it, as in evaluator.evaluate7
+    suit_counts = (suits[:, :, None] == np.arange(4)).sum(axis=1)
+    flushed = np.flatnonzero(suit_counts.max(axis=1) >= 5)
+    if flushed.size:
+        flush_suit = suit_counts[flushed].argmax(axis=1)
+        in_suit = suits[flushed] == flush_suit[:, None]
+        rank_masks = np.where(in_suit, 1 << ranks[flushed], 0).sum(axis=1)
+        strengths[flushed] = flush[rank_masks]
+    return strengths
+
+def evaluate_with(base, extras) -> np.ndarray:
+    # strengths of the fixed card ids base plus each row of the (N, m) extras,
+    # five to seven cards in all. The base's prime product and suit masks are
+    # computed once, so each row only pays for its own cards.
+    flush, keys, values, primes = _tables()
+    base = np.asarray(base, dtype=np.int64)
+    extras = np.asarray(extras, dtype=np.int64)
+    if extras.ndim != 2 or not 5 <= base.size + extras.shape[1] <= 7:
+        raise ValueError(f"Expected five to seven cards per hand, got {base.size} plus {extras.shape[1:]}")
+    extra_ranks = extras >> 2
+    products = primes[extra_ranks].prod(axis=1) * primes[base >> 2].prod()
+    strengths = values[np.searchsorted(keys, products)].astype(np.int64)
+    extra_suits = extras & 3
+    for suit in range(4):
+        base_ranks = base[(base & 3) == suit] >> 2
+        if base_ranks.size + extras.shape[1] < 5:
+            continue
+        in_suit = extra_suits == suit
+        flushed = np.flatnonzero(in_suit.sum(axis=1) + base_ranks.size >= 5)
+        if flushed.size:
+            # ranks within a suit are distinct, so the sum is the rank mask
+            rank_masks = np.where(in_suit[flushed], 1 << extra_ranks[flushed], 0).sum(axis=1)
+            strengths[flushed] = flush[rank_masks + int((1 << base_ranks).sum())]
+    return strengths
+
+def deal_many(rounds: int, cards_needed: int, dead=(), rng=None) -> np.ndarray:
+    # (rounds, cards_needed) array of card ids, every row an independent deal
+    # from the cards not in dead. rng is a numpy Generator or a seed for one.
+    # A partial Fisher-Yates run on every round at once: step i swaps deck
+    # position i with a random position at or after it, so only cards_needed
+    # steps are paid. The decks are stored position major, one row of rounds
+    # per deck position, so each step touches contiguous memory.
+    rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+    dead = set(dead)
+    live = np.array([card for card in range(NUMBER_OF_CARDS) if card not in dead], dtype=np.int8)
+    if cards_needed > live.size:
+        raise ValueError(f"Cannot deal {cards_needed} cards from {live.size}")
+    steps = np.arange(cards_needed)
+    # flat index of the position each step swaps with, per round
+    picks = (rng.random((cards_needed, rounds), dtype=np.float32) * (live.size - steps)[:, None]).astype(np.intp)
+    picks += steps[:, None]
+    picks *= rounds
+    picks += np.arange(rounds)
+    decks = np.repeat(live, rounds)
+    positions = decks.reshape(live.size, rounds)
+    for step in range(cards_needed):
+        picked = decks[picks[step]]
+        decks[picks[step]] = positions[step]
+        positions[step] = picked
+    return positions[:cards_needed].T.astype(np.int64)
+
+def equity_many(hole, board, number_of_players: int, rounds: int, dead=(), rng=None) -> list[float]:
+    # TexasHoldem.simulate's win rates from one batch of deals evaluated
+    # together; hole, board and dead are card ids, seat 0 holds hole
+    missing_hole = 2 - len(hole)
+    missing_board = 5 - len(board)
+    deals = deal_many(rounds, missing_board + missing_hole + 2 * (number_of_players - 1),
+                      list(hole) + list(board) + list(dead), rng)
+    boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.int64), (rounds, len(board))), deals[:, :missing_board]])
+    dealt = missing_board + missing_hole
+    hands = [np.hstack([np.broadcast_to(np.array(hole, dtype=np.int64), (rounds, len(hole))),
+                        deals[:, missing_board:dealt], boards])]
+    hands += [np.hstack([deals[:, start:start + 2], boards]) for start in range(dealt, deals.shape[1], 2)]
+    strengths = np.stack([evaluate_many(cards) for cards in hands], axis=1)
+    winners = strengths == strengths.max(axis=1, keepdims=True)
+    return (winners / winners.sum(axis=1, keepdims=True)).mean(axis=0).tolist()
@@ -1,4 +1,3 @@
-
 from enum import Enum
 
 
@@ -29,10 +28,56 @@ class Rank(Enum):
     def __str__(self):
         return self.name.title()
 
+# Cards are encoded as small ints: id = (rank - 2) * 4 + (suit - 1), so
+# 0 is the two of hearts and 51 the ace of spades. id >> 2 is the rank index
+# (0-12) and id & 3 the suit index (0-3).
+NUMBER_OF_CARDS = 52
+
+RANKS = tuple(Rank)
+SUITS = tuple(Suit)
+
+def card_id(rank: Rank, suit: Suit) -> int:
+    return (rank.value - 2) * 4 + (suit.value - 1)
+
+def card_rank(card: int) -> int:
+    # rank value (2-14) of an encoded card
+    return (card >> 2) + 2
+
+def card_suit(card: int) -> int:
+    # suit value (1-4) of an encoded card
+    return (card & 3) + 1
+
 class Card:
-    def __init__(self, rank, suit):
-        self.rank = rank
-        self.suit = suit
+    __slots__ = ('rank', 'suit', 'id')
+
+    def __new__(cls, rank, suit):
+        # every card is one of the 52 interned instances
+        return CARDS[card_id(rank, suit)]
+
+    @classmethod
+    def _intern(cls, card: int):
+        card_obj = object.__new__(cls)
+        object.__setattr__(card_obj, 'rank', RANKS[card >> 2])
+        object.__setattr__(card_obj, 'suit', SUITS[card & 3])
+        object.__setattr__(card_obj, 'id', card)
+        return card_obj
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.id == other.id
+
+    def __hash__(self):
+        return self.id
+
+    def __int__(self):
+        return self.id
+
+    def __reduce__(self):
+        return (Card.from_int, (self.id,))
 
     def __str__(self):
         # print 3 of clubs
@@ -40,25 +85,55 @@ class Card:
 
     def __repr__(self):
         return self.__str__()
-    
+
+    def to_string(self):
+        # short form read by from_string, like AS or TD
+        return f'{_RANK_CHARS[self.rank.value - 2]}{self.suit.name[0]}'
+
+    @staticmethod
+    def from_int(card: int):
+        return CARDS[card]
+
     @staticmethod
     def cards_from_strings(cards_strs:list[str]):
         return [Card.from_string(card_str) for card_str in cards_strs]
-    
+
     @staticmethod
     def from_string(card_str:str):
         # parse format like 2H 3D 4C 5S 6H QH KD AS
-        rank_map = {rank.name[0]: rank for rank in Rank}
-        suit_map = {suit.name[0]: suit for suit in Suit}
-        
+        card = _STRING_TO_CARD.get(card_str)
+        if card is not None:
+            return card
+
         try:
             rank_int = int(card_str[:-1])
         except ValueError:
             rank_char = card_str[:-1]
-            rank_int = rank_map[rank_char.upper()].value
+            rank_int = _RANK_MAP[rank_char.upper()].value
         suit_char = card_str[-1]
-        
+
         rank = Rank(rank_int)
-        suit = suit_map[suit_char.upper()]
+        suit = _SUIT_MAP[suit_char.upper()]
+
+        return Card(rank, suit)
+
+CARDS = tuple(Card._intern(card) for card in range(NUMBER_OF_CARDS))
+
+_RANK_CHARS = '23456789TJQKA'
+
+# first letter of the enum name; later names win, so T is TEN, F is FIVE and S is SEVEN
+_RANK_MAP = {rank.name[0]: rank for rank in Rank}
+_SUIT_MAP = {suit.name[0]: suit for suit in Suit}
+
+def _build_string_table():
+    table = {}
+    for card in CARDS:
+        rank_tokens = [str(card.rank.value)]
+        rank_tokens += [char for char, rank in _RANK_MAP.items() if rank == card.rank]
+        for rank_token in rank_tokens:
+            for suit_char in (card.suit.name[0], card.suit.name[0].lower()):
+                table[rank_token + suit_char] = card
+                table[rank_token.lower() + suit_char] = card
+    return table
 
-        return Card(rank, suit)        
+_STRING_TO_CARD = _build_string_table()
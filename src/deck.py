@@ -1,31 +1,118 @@
 import random
-from enum import Enum
-from .card import Card, Rank, Suit
+from . import stats
+from .card import CARDS, NUMBER_OF_CARDS, card_id
+
 class Deck:
-    def __init__(self):
+    # The deck is one array holding every card id, split into three regions:
+    # [0, size) still in the deck with the top card last, [size, live) drawn
+    # since the last reset, and [live, 52) dead cards that reset never brings
+    # back. positions maps each card id to its index so any card can be moved
+    # between regions with a single swap.
+    def __init__(self, rng=None):
+        # rng is any random.Random; the module level generator by default
+        self.rng = rng or random
+        self._cards = list(range(NUMBER_OF_CARDS))
+        self._positions = list(range(NUMBER_OF_CARDS))
+        self._size = NUMBER_OF_CARDS
+        self._live = NUMBER_OF_CARDS
+        self.dead = 0  # bitmask of dead card ids
         self.reset()
         self.shuffle()
 
+    @property
+    def cards(self):
+        return [CARDS[card] for card in self._cards[:self._size]]
+
+    def _swap(self, index_a, index_b):
+        cards = self._cards
+        card_a, card_b = cards[index_a], cards[index_b]
+        cards[index_a], cards[index_b] = card_b, card_a
+        self._positions[card_b] = index_a
+        self._positions[card_a] = index_b
+
     def shuffle(self):
-        random.shuffle(self.cards)
+        if stats.ENABLED:
+            stats.count("deck.shuffles")
+        cards = self._cards[:self._size]
+        self.rng.shuffle(cards)
+        self._cards[:self._size] = cards
+        for index, card in enumerate(cards):
+            self._positions[card] = index
 
     def draw_card(self):
-        return self.cards.pop() if self.cards else None
-    
+        if not self._size:
+            return None
+        self._size -= 1
+        return CARDS[self._cards[self._size]]
+
+    def draw_card_ids(self, count: int) -> list[int]:
+        # count random card ids by partial Fisher-Yates, the rest of the deck is left alone
+        if count > self._size:
+            raise ValueError(f"Cannot draw {count} cards from {self._size}")
+        cards = self._cards
+        positions = self._positions
+        random_ = self.rng.random
+        drawn = []
+        for _ in range(count):
+            last = self._size - 1
+            pick = int(random_() * self._size)
+            card = cards[pick]
+            cards[pick] = cards[last]
+            positions[cards[pick]] = pick
+            cards[last] = card
+            positions[card] = last
+            self._size = last
+            drawn.append(card)
+        return drawn
+
     def draw_specific_card(self, rank, suit):
-        for card in self.cards:
-            if card.rank == rank and card.suit == suit:
-                self.cards.remove(card)
-                return card
+        card = card_id(rank, suit)
+        if self._positions[card] < self._size:
+            self._size -= 1
+            self._swap(self._positions[card], self._size)
+            return CARDS[card]
         return None
 
-    def reset(self):
-        self.cards = [Card(rank, suit) for suit in Suit for rank in Rank]
-        self.shuffle()
+    def mark_dead(self, card_ids):
+        # take cards out of the deck until clear_dead, reset does not return them
+        for card in card_ids:
+            if self.dead >> card & 1:
+                continue
+            if self._positions[card] < self._size:
+                self._size -= 1
+                self._swap(self._positions[card], self._size)
+            self._live -= 1
+            self._swap(self._positions[card], self._live)
+            self.dead |= 1 << card
+
+    def clear_dead(self):
+        # dead cards count as drawn again and come back on the next reset
+        self._live = NUMBER_OF_CARDS
+        self.dead = 0
+
+    def reset(self, shuffle=True):
+        # return every drawn card, O(1) without the shuffle
+        self._size = self._live
+        if stats.ENABLED:
+            stats.count("deck.resets")
+        if shuffle:
+            self.shuffle()
+
+    def deal_many(self, rounds: int, count: int, seed=None):
+        # (rounds, count) NumPy array of deals from the cards still in the deck, needs numpy
+        from .batch import deal_many
+        return deal_many(rounds, count, self._cards[self._size:], seed)
+
+    def snapshot(self):
+        return self._cards[:], self._positions[:], self._size, self._live, self.dead, self.rng
+
+    def restore(self, snapshot):
+        cards, positions, self._size, self._live, self.dead, self.rng = snapshot
+        self._cards[:] = cards
+        self._positions[:] = positions
 
     def __len__(self):
-        return len(self.cards)
+        return self._size
 
     def __str__(self):
-        return ', '.join([f'{rank} of {suit}' for rank, suit in self.cards])
-
+        return ', '.join(str(CARDS[card]) for card in self._cards[:self._size])
@@ -0,0 +1,104 @@
+from collections import Counter
+from dataclasses import dataclass
+from itertools import combinations, permutations
+from math import comb, sqrt
+
+from . import stats
+from .card import NUMBER_OF_CARDS
+from .evaluator import evaluate7
+
+# largest number of (runout, opponent holdings) deals settled by enumeration
+# before simulate falls back to sampling
+EXACT_LIMIT = 100_000
+
+@dataclass(frozen=True)
+class EquityEstimate:
+    rounds: int
+    rates: list[float]
+    standard_errors: list[float]
+
+    @staticmethod
+    def from_sums(rounds: int, wins: list[float], squares: list[float]):
+        # wins and squares are per seat sums of the win share and its square
+        rates = [win_count / rounds for win_count in wins]
+        standard_errors = [sqrt(max(square / rounds - rate * rate, 0.0) / max(rounds - 1, 1))
+                           for rate, square in zip(rates, squares)]
+        return EquityEstimate(rounds, rates, standard_errors)
+
+    def converged(self, tolerance: float, z: float = 1.96) -> bool:
+        # every seat's confidence interval is within +/- tolerance
+        return all(z * standard_error <= tolerance for standard_error in self.standard_errors)
+
+SUIT_PERMUTATIONS = tuple(permutations(range(4)))
+
+def permute_card(card: int, permutation) -> int:
+    return card & ~3 | permutation[card & 3]
+
+def suit_symmetries(cards, dead=()) -> list[tuple[int]]:
+    # suit relabellings that map a set of card ids, and the dead cards, onto themselves
+    known = set(cards)
+    dead = set(dead)
+    return [permutation for permutation in SUIT_PERMUTATIONS
+            if {permute_card(card, permutation) for card in known} == known
+            and {permute_card(card, permutation) for card in dead} == dead]
+
+def canonical_cards(cards, symmetries) -> tuple[int]:
+    # smallest sorted image of a set of card ids under the given relabellings
+    return min(tuple(sorted(permute_card(card, permutation) for card in cards))
+               for permutation in symmetries)
+
+def canonical_spot(hole, board, dead=()) -> tuple[tuple[int], tuple[int], tuple[int]]:
+    # one form shared by every suit relabelling of (hole, board, dead): the
+    # smallest image of the three sorted card groups under the same permutation
+    return min(tuple(tuple(sorted(permute_card(card, permutation) for card in group)) for group in (hole, board, dead))
+               for permutation in SUIT_PERMUTATIONS)
+
+def exact_size(known_cards: int, board_cards: int, number_of_players: int) -> int:
+    # deals an exact enumeration visits before suit isomorphic runouts are collapsed
+    remaining = NUMBER_OF_CARDS - known_cards
+    size = comb(remaining, 5 - board_cards)
+    remaining -= 5 - board_cards
+    for _ in range(number_of_players - 1):
+        size *= comb(remaining, 2)
+        remaining -= 2
+    return size
+
+def exact_equity(hole: list[int], board: list[int], number_of_players: int, dead=()) -> list[float]:
+    # win share of every seat over every board runout and opponent holding,
+    # seat 0 holds the known hole cards and dead cards are never dealt
+    known = hole + board
+    remaining = [card for card in range(NUMBER_OF_CARDS) if card not in known and card not in dead]
+    symmetries = suit_symmetries(known, dead)
+    runouts = Counter(canonical_cards(extra, symmetries)
+                      for extra in combinations(remaining, 5 - len(board)))
+
+    if stats.ENABLED:
+        stats.count("exact.runouts", len(runouts))
+    wins = [0.0] * number_of_players
+    total = 0
+    for extra, weight in runouts.items():
+        full_board = board + list(extra)
+        hero = evaluate7(hole + full_board)
+        left = [card for card in remaining if card not in extra]
+        holdings = {holding: evaluate7(list(holding) + full_board) for holding in combinations(left, 2)}
+        if stats.ENABLED:
+            stats.count("exact.evaluations", len(holdings) + 1)
+        for strengths in _deal_opponents(holdings, set(), number_of_players - 1):
+            strengths = [hero] + strengths
+            best = max(strengths)
+            winners = [seat for seat, strength in enumerate(strengths) if strength == best]
+            for seat in winners:
+                wins[seat] += weight / len(winners)
+            total += weight
+    return [win_count / total for win_count in wins]
+
+def _deal_opponents(holdings: dict, dead: set, opponents: int):
+    # every ordered assignment of disjoint holdings, yielded as their strengths
+    if opponents == 0:
+        yield []
+        return
+    for holding, strength in holdings.items():
+        if holding[0] in dead or holding[1] in dead:
+            continue
+        for rest in _deal_opponents(holdings, dead | set(holding), opponents - 1):
+            yield [strength] + rest
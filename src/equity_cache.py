@@ -0,0 +1,96 @@
+import sqlite3
+import struct
+from collections import OrderedDict
+
+from . import stats
+from .equity import canonical_spot
+
+# Equity answers keyed by the suit isomorphic form of a spot, so AhKh on
+# Qh Jh 2c and AsKs on Qs Js 2d share one entry. A bounded LRU sits in front
+# of an optional SQLite file that any number of processes can share:
+#
+#     cache = EquityCache(maxsize=50_000, path="equity.sqlite")
+#     game = TexasHoldem(names, equity_cache=cache)
+#
+# Every entry remembers how many rounds it was sampled from, None when it was
+# enumerated exactly, and only answers requests for at most that many rounds.
+
+class EquityCache:
+    def __init__(self, maxsize: int = 100_000, path: str | None = None):
+        self.maxsize = maxsize
+        self.path = path
+        self._entries = OrderedDict()   # key -> (rounds, rates), most recently used last
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, timeout=30, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS equity (spot TEXT PRIMARY KEY, rounds INTEGER, rates BLOB)")
+
+    @staticmethod
+    def key(hand, board, number_of_players: int, dead=()) -> tuple:
+        hole, board, dead = canonical_spot([card.id for card in hand], [card.id for card in board],
+                                           [card.id for card in dead])
+        return hole, board, dead, number_of_players
+
+    @staticmethod
+    def _spot(key) -> str:
+        return "|".join(".".join(map(str, group)) for group in key[:3]) + f"|{key[3]}"
+
+    def get(self, key, rounds: int | None) -> list[float] | None:
+        # rates for key if they were enumerated exactly or sampled from at
+        # least rounds rounds; rounds None accepts exact answers only
+        entry = self._entries.get(key)
+        if not self._answers(entry, rounds) and self._db is not None:
+            # another process may have stored a better answer
+            row = self._db.execute("SELECT rounds, rates FROM equity WHERE spot = ?", (self._spot(key),)).fetchone()
+            if row is not None:
+                entry = row[0], list(struct.unpack(f"<{len(row[1]) // 8}d", row[1]))
+                self._remember(key, entry)
+        if self._answers(entry, rounds):
+            self._entries.move_to_end(key)
+            if stats.ENABLED:
+                stats.count("equity_cache.hits")
+            return list(entry[1])
+        if stats.ENABLED:
+            stats.count("equity_cache.misses")
+        return None
+
+    @staticmethod
+    def _answers(entry, rounds) -> bool:
+        return entry is not None and (entry[0] is None or rounds is not None and entry[0] >= rounds)
+
+    def put(self, key, rates: list[float], rounds: int | None):
+        # keeps whichever of the stored and the new answer is more precise
+        if self._answers(self._entries.get(key), rounds):
+            return
+        self._remember(key, (rounds, list(rates)))
+        if self._db is not None:
+            self._db.execute(
+                "INSERT INTO equity VALUES (?, ?, ?) ON CONFLICT(spot) DO UPDATE SET rounds = excluded.rounds, "
+                "rates = excluded.rates WHERE equity.rounds IS NOT NULL "
+                "AND (excluded.rounds IS NULL OR excluded.rounds > equity.rounds)",
+                (self._spot(key), rounds, struct.pack(f"<{len(rates)}d", *rates)))
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        # forgets the in memory entries, the file is left alone
+        self._entries.clear()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,315 @@
+import mmap
+import os
+import struct
+from collections import Counter
+from itertools import combinations, combinations_with_replacement
+
+from .card import NUMBER_OF_CARDS
+
+# A hand strength is a single int: the PokerHands value of the hand in the
+# high bits and up to five rank nibbles below it, most significant first.
+# Larger always beats smaller and equal strengths split the pot.
+CATEGORY_SHIFT = 20
+
+HIGH_CARD = 1
+PAIR = 0            # pair categories are PAIR + rank of the pair (2-14)
+TWO_PAIR = 12       # two pair categories are TWO_PAIR + rank of the top pair (3-14)
+THREE_OF_A_KIND = 27
+STRAIGHT = 28
+FLUSH = 29
+FULL_HOUSE = 30
+FOUR_OF_A_KIND = 31
+STRAIGHT_FLUSH = 32
+ROYAL_FLUSH = 33
+
+RANK_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# per card lookups indexed by card id
+CARD_PRIMES = tuple(RANK_PRIMES[card >> 2] for card in range(NUMBER_OF_CARDS))
+CARD_BITS = tuple(1 << (card >> 2) for card in range(NUMBER_OF_CARDS))
+
+WHEEL = 0b1000000001111
+
+def pack(category: int, ranks) -> int:
+    strength = 0
+    for rank in ranks:
+        strength = strength << 4 | rank
+    return category << CATEGORY_SHIFT | strength << 4 * (5 - len(ranks))
+
+def category_of(strength: int) -> int:
+    return strength >> CATEGORY_SHIFT
+
+def straight_high(rank_mask: int) -> int:
+    # rank value of the highest straight in a 13 bit rank mask, 0 if there is none
+    for high in range(12, 3, -1):
+        run = 0b11111 << (high - 4)
+        if rank_mask & run == run:
+            return high + 2
+    return 5 if rank_mask & WHEEL == WHEEL else 0
+
+def ranks_of(strength: int) -> list[int]:
+    # the five ranks (with repeats) making up the best hand of a strength
+    category = category_of(strength)
+    nibbles = [(strength >> shift) & 0xF for shift in (16, 12, 8, 4, 0)]
+    if category in (STRAIGHT, STRAIGHT_FLUSH, ROYAL_FLUSH):
+        high = nibbles[0]
+        return [14, 5, 4, 3, 2] if high == 5 else list(range(high, high - 5, -1))
+    if category == FOUR_OF_A_KIND:
+        return [nibbles[0]] * 4 + [nibbles[1]]
+    if category == FULL_HOUSE:
+        return [nibbles[0]] * 3 + [nibbles[1]] * 2
+    if category == THREE_OF_A_KIND:
+        return [nibbles[0]] * 3 + nibbles[1:3]
+    if TWO_PAIR < category < THREE_OF_A_KIND:
+        return [nibbles[0]] * 2 + [nibbles[1]] * 2 + [nibbles[2]]
+    if PAIR + 2 <= category <= PAIR + 14:
+        return [nibbles[0]] * 2 + nibbles[1:4]
+    return nibbles
+
+def _flush_strength(rank_mask: int) -> int:
+    # best hand from the ranks of five or more cards of a single suit
+    high = straight_high(rank_mask)
+    if high == 14:
+        return pack(ROYAL_FLUSH, [high])
+    if high:
+        return pack(STRAIGHT_FLUSH, [high])
+    ranks = [rank + 2 for rank in range(12, -1, -1) if rank_mask >> rank & 1]
+    return pack(FLUSH, ranks[:5])
+
+def _rank_strength(ranks) -> int:
+    # best hand from the rank values of five to seven unsuited cards
+    counts = Counter(ranks)
+    by_rank = sorted(counts, reverse=True)
+    quads = [rank for rank in by_rank if counts[rank] == 4]
+    trips = [rank for rank in by_rank if counts[rank] == 3]
+    pairs = [rank for rank in by_rank if counts[rank] == 2]
+    if quads:
+        return pack(FOUR_OF_A_KIND, [quads[0], max(rank for rank in by_rank if rank != quads[0])])
+    if trips and len(trips) + len(pairs) > 1:
+        return pack(FULL_HOUSE, [trips[0], max(trips[1:] + pairs)])
+    high = straight_high(sum(1 << (rank - 2) for rank in by_rank))
+    if high:
+        return pack(STRAIGHT, [high])
+    if trips:
+        return pack(THREE_OF_A_KIND, [trips[0]] + [rank for rank in by_rank if rank != trips[0]][:2])
+    if len(pairs) > 1:
+        kicker = max(rank for rank in by_rank if rank not in pairs[:2])
+        return pack(TWO_PAIR + pairs[0], pairs[:2] + [kicker])
+    if pairs:
+        return pack(PAIR + pairs[0], [pairs[0]] + [rank for rank in by_rank if rank != pairs[0]][:3])
+    return pack(HIGH_CARD, by_rank[:5])
+
+def _prime_product(ranks) -> int:
+    product = 1
+    for rank in ranks:
+        product *= RANK_PRIMES[rank - 2]
+    return product
+
+def _rank_multisets(size: int):
+    # every multiset of rank values that fits in a deck, at most four of each rank
+    for ranks in combinations_with_replacement(range(2, 15), size):
+        if max(Counter(ranks).values()) <= 4:
+            yield ranks
+
+def _build_tables():
+    # FLUSH_TABLE is indexed by the 13 bit rank mask of a suit holding five or
+    # more cards, UNIQUE_TABLE by the mask of five distinct ranks. Every
+    # multiset of five to seven ranks is keyed by the product of its rank
+    # primes, which is unique per multiset, and returned sorted by product.
+    flush_table = [0] * (1 << 13)
+    for rank_mask in range(1 << 13):
+        if bin(rank_mask).count("1") >= 5:
+            flush_table[rank_mask] = _flush_strength(rank_mask)
+    unique_table = [0] * (1 << 13)
+    products = {}
+    for size in (5, 6, 7):
+        for ranks in _rank_multisets(size):
+            strength = _rank_strength(ranks)
+            if size == 5 and len(set(ranks)) == 5:
+                unique_table[sum(1 << (rank - 2) for rank in ranks)] = strength
+            products[_prime_product(ranks)] = strength
+    keys = sorted(products)
+    return flush_table, unique_table, keys, [products[key] for key in keys]
+
+# The tables are generated ahead of time into DATA_PATH (python -m
+# src.evaluator rebuilds it) and nothing is read at import. The first
+# evaluation maps the file and every lookup reads the map directly, so all
+# processes share one page cache copy and loading costs next to nothing.
+# Rank multisets are found through an open addressing hash laid out in the
+# file: a product starts at product % HASH_MODULUS and probes forward to its
+# slot. table_arrays hands the same mapped arrays to NumPy, with the products
+# sorted for searchsorted. Without the file the tables are built from
+# scratch, which takes about a second.
+DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "evaluator_tables.bin")
+MAGIC = b"HSEV"
+VERSION = 2
+HEADER = struct.Struct("<4sHxxII")  # magic, version, number of rank multisets, number of hash slots
+TABLE_SIZE = 1 << 13
+HASH_MODULUS = 131071
+
+_ARRAYS = None      # (flush, unique, keys, values) memoryviews over the map
+_SLOTS = None       # (product, strength) memoryviews of the hash slots, product 0 when empty
+_HASH_KEYS = None   # _SLOTS[0] once loaded
+_HASH_VALUES = None
+
+def _hash_slots(keys, values):
+    # (keys, values) per slot, probing forward without wrapping around
+    slot_keys = [0] * HASH_MODULUS
+    slot_values = [0] * HASH_MODULUS
+    for key, value in zip(keys, values):
+        slot = key % HASH_MODULUS
+        while slot < len(slot_keys) and slot_keys[slot]:
+            slot += 1
+        if slot == len(slot_keys):
+            slot_keys.append(0)
+            slot_values.append(0)
+        slot_keys[slot] = key
+        slot_values[slot] = value
+    return slot_keys, slot_values
+
+def _table_bytes() -> bytes:
+    # the table file: header, flush and unique tables, sorted products, hash
+    # slot products, then the strengths of both (the 8 byte arrays first so
+    # every array is aligned)
+    flush_table, unique_table, keys, values = _build_tables()
+    slot_keys, slot_values = _hash_slots(keys, values)
+    return b"".join([HEADER.pack(MAGIC, VERSION, len(keys), len(slot_keys)),
+                     struct.pack(f"<{TABLE_SIZE}I", *flush_table), struct.pack(f"<{TABLE_SIZE}I", *unique_table),
+                     struct.pack(f"<{len(keys)}Q", *keys), struct.pack(f"<{len(slot_keys)}Q", *slot_keys),
+                     struct.pack(f"<{len(values)}I", *values), struct.pack(f"<{len(slot_values)}I", *slot_values)])
+
+def write_tables(path: str = DATA_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as table_file:
+        table_file.write(_table_bytes())
+
+def _map_tables(path: str = DATA_PATH):
+    global _ARRAYS, _SLOTS
+    if os.path.exists(path):
+        with open(path, "rb") as table_file:
+            data = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, slots = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an evaluator table file")
+    else:
+        data = _table_bytes()
+        _, _, count, slots = HEADER.unpack_from(data)
+    view = memoryview(data)
+    sizes = [(4 * TABLE_SIZE, "I"), (4 * TABLE_SIZE, "I"), (8 * count, "Q"), (8 * slots, "Q"),
+             (4 * count, "I"), (4 * slots, "I")]
+    arrays = []
+    start = HEADER.size
+    for size, code in sizes:
+        arrays.append(view[start:start + size].cast(code))
+        start += size
+    flush, unique, keys, slot_keys, values, slot_values = arrays
+    _ARRAYS = flush, unique, keys, values
+    _SLOTS = slot_keys, slot_values
+
+def table_arrays(path: str = DATA_PATH):
+    # (flush, unique, keys, values) as read only memoryviews over the mapped file
+    if _ARRAYS is None:
+        _map_tables(path)
+    return _ARRAYS
+
+class _ProductTable:
+    # PRODUCT_TABLE: rank prime product of five to seven cards -> strength
+    def __getitem__(self, product: int) -> int:
+        return _product_strength(product)
+
+    def __len__(self):
+        return len(_ARRAYS[2])
+
+def _product_strength(product: int) -> int:
+    keys = _HASH_KEYS
+    slot = product % HASH_MODULUS
+    while keys[slot] != product:
+        slot += 1
+    return _HASH_VALUES[slot]
+
+def load_tables():
+    # point the lookup tables the evaluators index at the map, done on first evaluation
+    global FLUSH_TABLE, UNIQUE_TABLE, PRODUCT_TABLE, _HASH_KEYS, _HASH_VALUES
+    if _HASH_KEYS is None:
+        table_arrays()
+        FLUSH_TABLE, UNIQUE_TABLE = _ARRAYS[0], _ARRAYS[1]
+        PRODUCT_TABLE = _ProductTable()
+        _HASH_KEYS, _HASH_VALUES = _SLOTS
+
+def __getattr__(name):
+    # the lookup tables only exist once loaded
+    if name in ("FLUSH_TABLE", "UNIQUE_TABLE", "PRODUCT_TABLE"):
+        load_tables()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def evaluate5(cards) -> int:
+    # strength of exactly five card ids
+    if _HASH_KEYS is None:
+        load_tables()
+    c1, c2, c3, c4, c5 = cards
+    rank_mask = CARD_BITS[c1] | CARD_BITS[c2] | CARD_BITS[c3] | CARD_BITS[c4] | CARD_BITS[c5]
+    if (c1 & 3) == (c2 & 3) == (c3 & 3) == (c4 & 3) == (c5 & 3):
+        return FLUSH_TABLE[rank_mask]
+    strength = UNIQUE_TABLE[rank_mask]
+    if strength:
+        return strength
+    return _product_strength(CARD_PRIMES[c1] * CARD_PRIMES[c2] * CARD_PRIMES[c3] * CARD_PRIMES[c4] * CARD_PRIMES[c5])
+
+def evaluate7(cards) -> int:
+    # strength of six or seven card ids in one pass. With at most seven cards
+    # a suit holding five can never coexist with quads or a full house, so a
+    # flush decides the hand on its own and everything else only depends on
+    # the rank multiset.
+    if _HASH_KEYS is None:
+        load_tables()
+    suit_masks = [0, 0, 0, 0]
+    product = 1
+    for card in cards:
+        suit_masks[card & 3] |= CARD_BITS[card]
+        product *= CARD_PRIMES[card]
+    for suit_mask in suit_masks:
+        strength = FLUSH_TABLE[suit_mask]
+        if strength:
+            return strength
+    # _product_strength inlined, this is the simulation hot path
+    keys = _HASH_KEYS
+    slot = product % HASH_MODULUS
+    while keys[slot] != product:
+        slot += 1
+    return _HASH_VALUES[slot]
+
+def evaluate_state(suit_masks, product: int, size: int) -> int | None:
+    # strength of five to seven cards from running state kept as cards are
+    # added: a rank mask per suit, whose union is the straight mask, and the
+    # rank prime product, which stands for the rank histogram
+    if size < 5:
+        return None
+    if _HASH_KEYS is None:
+        load_tables()
+    for suit_mask in suit_masks:
+        strength = FLUSH_TABLE[suit_mask]
+        if strength:
+            return strength
+    if size == 5:
+        strength = UNIQUE_TABLE[suit_masks[0] | suit_masks[1] | suit_masks[2] | suit_masks[3]]
+        if strength:
+            return strength
+    keys = _HASH_KEYS
+    slot = product % HASH_MODULUS
+    while keys[slot] != product:
+        slot += 1
+    return _HASH_VALUES[slot]
+
+def evaluate(cards) -> int | None:
+    # strength of the best five card hand among any number of card ids
+    if len(cards) < 5:
+        return None
+    if len(cards) == 5:
+        return evaluate5(cards)
+    if len(cards) <= 7:
+        return evaluate7(cards)
+    return max(evaluate7(combination) for combination in combinations(cards, 7))
+
+if __name__ == "__main__":
+    write_tables()
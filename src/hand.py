@@ -3,6 +3,11 @@ from enum import Enum
 from itertools import combinations
 from typing import Counter
 from src.card import Card
+from src import evaluator, stats
+
+
+def _ranks(cards):
+    return [(card.id >> 2) + 2 for card in cards]
 
 
 class PokerHands(Enum):
@@ -53,6 +58,8 @@ class PokerHands(Enum):
         return self.value >= other.value
     def __ne__(self, other):
         return self.value != other.value
+    def __hash__(self):
+        return hash(self.value)
     def __str__(self):
         return self.name.replace("_", " ").title()
 
@@ -61,161 +68,167 @@ class PokerScore:
     hand: PokerHands
     tie_breaker: int | None = None
     cards: list[Card] | None = None
+    strength: int | None = None
+
+    def __post_init__(self):
+        # scores built by hand get a strength that orders them by hand, then tie_breaker
+        if self.strength is None:
+            object.__setattr__(self, 'strength', evaluator.pack(self.hand.value, [self.tie_breaker or 0]))
+
+    @staticmethod
+    def from_strength(strength: int, cards=None):
+        ranks = evaluator.ranks_of(strength)
+        category = evaluator.category_of(strength)
+        if evaluator.PAIR + 2 <= category <= evaluator.PAIR + 14:
+            # a pair is broken by its highest kicker
+            tie_breaker = max(ranks[2:])
+        else:
+            tie_breaker = max(ranks)
+        return PokerScore(PokerHands(category), tie_breaker, cards, strength)
 
 class Hand:
     @staticmethod
     def from_strings(card_strings: list[str]):
         return Hand([Card.from_string(card_str) for card_str in card_strings])
 
+    @staticmethod
+    def score_many(cards):
+        # strengths of an (N, 5-7) NumPy array of card ids, needs numpy
+        from src.batch import evaluate_many
+        return evaluate_many(cards)
+
     def __init__(self, cards: list[Card] = None):
         self.cards = []
 
-        self.value:PokerScore = None
+        self.strength:int = None
+        self._value:PokerScore = None
 
         if cards is not None:
             self.cards = cards
 
-        self.last_known_cards  = self.cards
-          
+        # evaluator state of last_known_cards, extended one card at a time
+        # while the hand only grows
+        self.last_known_cards = []
+        self._suit_masks = [0, 0, 0, 0]
+        self._product = 1
+
+    @property
+    def value(self) -> PokerScore:
+        if self.strength is None and len(self.cards) >= 5:
+            self.evaluate()
+        if self._value is None and self.strength is not None:
+            self._value = PokerScore.from_strength(self.strength, self.best_cards())
+        return self._value
+
+    @value.setter
+    def value(self, score: PokerScore):
+        self._value = score
+        self.strength = score.strength if score is not None else None
+
+    def _add_to_state(self, card: Card):
+        self._suit_masks[card.id & 3] |= evaluator.CARD_BITS[card.id]
+        self._product *= evaluator.CARD_PRIMES[card.id]
+        self.last_known_cards.append(card)
+
+    def _reset_state(self):
+        self.last_known_cards = []
+        self._suit_masks = [0, 0, 0, 0]
+        self._product = 1
+
+    def evaluate(self) -> int:
+        # the hand strength as a single int, larger beats smaller
+        cards = self.cards
+        known = self.last_known_cards
+        if self.strength is not None and cards == known:
+            if stats.ENABLED:
+                stats.count("hand.cache_hits")
+            return self.strength
+        if cards[:len(known)] != known:
+            self._reset_state()
+        for card in cards[len(self.last_known_cards):]:
+            self._add_to_state(card)
+        if len(cards) <= 7:
+            self.strength = evaluator.evaluate_state(self._suit_masks, self._product, len(cards))
+        else:
+            self.strength = evaluator.evaluate([card.id for card in cards])
+        self._value = None
+        if stats.ENABLED:
+            stats.count("hand.evaluations")
+        return self.strength
+
+    def best_cards(self) -> tuple[Card]:
+        # the five cards that make up the hand's strength
+        if len(self.cards) <= 5:
+            return tuple(self.cards)
+        strength = self.evaluate()
+        for examined, combination in enumerate(combinations(self.cards, 5), 1):
+            if evaluator.evaluate5([card.id for card in combination]) == strength:
+                if stats.ENABLED:
+                    stats.count("hand.combinations", examined)
+                return combination
+
     def __eq__(self, other):
         if not isinstance(other, Hand):
             return False
-        self.score_hand()
-        other.score_hand()
-        return self.value.hand == other.value.hand and self.value.tie_breaker == other.value.tie_breaker
-    
+        return self.evaluate() == other.evaluate()
+
     def __lt__(self, other):
         if not isinstance(other, Hand):
             raise NotImplementedError(f"Cannot compare Hand with {type(other)}")
-        
-        self.score_hand()
-        other.score_hand()
+        return self.evaluate() < other.evaluate()
 
-        if self.value.hand < other.value.hand:
-            return True
-        
-        if self.value.hand == other.value.hand and self.value.tie_breaker < other.value.tie_breaker:
-            return True
-    
-        return False
-    
     def __gt__(self, other):
         if not isinstance(other, Hand):
             raise NotImplementedError(f"Cannot compare Hand with {type(other)}")
-        
-        self.score_hand()
-        other.score_hand()
+        return self.evaluate() > other.evaluate()
 
-        if self.value.hand > other.value.hand:
-            return True
-        
-        if self.value.hand == other.value.hand and self.value.tie_breaker > other.value.tie_breaker:
-            return True
-    
-        return False
-    
     def __le__(self, other):
         if not isinstance(other, Hand):
             raise NotImplementedError(f"Cannot compare Hand with {type(other)}")
-        
-        self.score_hand()
-        other.score_hand()
-        
-        if self.value.hand == other.value.hand and self.value.tie_breaker > other.value.tie_breaker:
-            return False
-        
-        if self.value.hand > other.value.hand:
-            return False
-    
-        return True
-    
+        return self.evaluate() <= other.evaluate()
+
     def __ge__(self, other):
         if not isinstance(other, Hand):
             raise NotImplementedError(f"Cannot compare Hand with {type(other)}")
-        
-        self.score_hand()
-        other.score_hand()
+        return self.evaluate() >= other.evaluate()
 
-        if self.value.hand == other.value.hand and self.value.tie_breaker < other.value.tie_breaker:
-            return False
-        
-        if self.value.hand < other.value.hand:
-            return False
-    
-        return True
-    
     def __ne__(self, other):
         if not isinstance(other, Hand):
             return True
-        self.score_hand()
-        other.score_hand()
-        return self.value.hand != other.value.hand or self.value.tie_breaker != other.value.tie_breaker
+        return self.evaluate() != other.evaluate()
 
     def add_card(self, card: Card):
+        # O(1): the next evaluate only folds this card into the running state
         self.value = None
         self.cards.append(card)
 
     def remove_card(self, card: Card):
         self.value = None
         self.cards.remove(card)
+        self._reset_state()
 
     def __str__(self):
         return ', '.join(str(card) for card in self.cards)
-    
-    def score_hand(self) -> PokerScore:
-        if self.value is not None and self.last_known_cards == self.cards:
-            return self.value
-        all_combinations = combinations(self.cards, 5)
-
-        best_score:PokerScore  = None
 
-        for combination in all_combinations:
-            hand_score = self.rank_hand(combination)
-            if best_score is None or hand_score.hand > best_score.hand:
-                best_score = hand_score
+    def score_hand(self) -> PokerScore:
+        self.evaluate()
+        return self.value
 
-        self.value = best_score
-        return best_score
-    
     def rank_hand(self, cards) -> PokerScore:
-        # Helper function to get the rank of a hand
-        if self.is_royal_flush(cards):
-            return PokerScore(PokerHands.ROYAL_FLUSH, self.get_high_card(cards), cards)
-        elif self.is_straight_flush(cards):
-            return PokerScore(PokerHands.STRAIGHT_FLUSH, self.get_high_card(cards), cards)
-        elif self.is_four_of_a_kind(cards):
-            return PokerScore(PokerHands.FOUR_OF_A_KIND, self.get_high_card(cards), cards)
-        elif self.is_full_house(cards):
-            return PokerScore(PokerHands.FULL_HOUSE, self.get_high_card(cards), cards)
-        elif self.is_flush(cards):
-            return PokerScore(PokerHands.FLUSH, self.get_high_card(cards), cards)
-        elif self.is_straight(cards):
-            return PokerScore(PokerHands.STRAIGHT, self.get_high_card(cards), cards)
-        elif self.is_three_of_a_kind(cards):
-            return PokerScore(PokerHands.THREE_OF_A_KIND, self.get_high_card(cards), cards)
-        elif self.is_two_pair(cards):
-            highest_pair = self.get_two_pair_rank(cards)[0]
-            return PokerScore(PokerHands(PokerHands.PAIR_OF_ACES.value+highest_pair), self.get_high_card(cards)), cards
-        elif self.is_one_pair(cards):
-            pair_value = self.get_one_pair_rank(cards)  # Get the rank of the pair
-            kickers = sorted([card.rank.value for card in cards if card.rank.value != pair_value], reverse=True)  # Kickers are the highest other cards
-            pair = PokerHands(pair_value)  # Pair of twos is rank 2, etc.
-            return PokerScore(pair, max(kickers), cards)
-        else:
-            return PokerScore(PokerHands.HIGH_CARD, self.get_high_card(cards), cards)
-    
+        # score exactly five cards
+        return PokerScore.from_strength(evaluator.evaluate5([card.id for card in cards]), cards)
+
     # get_high_card
     def get_high_card(self, cards):
-        return max(card.rank.value for card in cards)
+        return max(_ranks(cards))
     
     # Check for flush
     def is_flush(self, cards):
-        suits = [card.suit for card in cards]
-        return len(set(suits)) == 1
+        return len({card.id & 3 for card in cards}) == 1
     
     # Check for straight
     def is_straight(self, cards):
-        ranks = sorted([card.rank.value for card in cards])
+        ranks = sorted(_ranks(cards))
         return ranks == list(range(ranks[0], ranks[0] + 5)) or ranks == [2, 3, 4, 5, 14]  # Handles Ace low straight
 
     # Check for straight flush
@@ -224,58 +237,57 @@ class Hand:
 
     # Check for royal flush
     def is_royal_flush(self, cards):
-        ranks = [card.rank.value for card in cards]
-        return self.is_straight_flush(cards) and sorted(ranks) == [10, 11, 12, 13, 14]
+        return self.is_straight_flush(cards) and sorted(_ranks(cards)) == [10, 11, 12, 13, 14]
 
     # Check for four of a kind
     def is_four_of_a_kind(self, cards):
-        rank_counts = Counter(card.rank for card in cards)
+        rank_counts = Counter(_ranks(cards))
         return 4 in rank_counts.values()
 
     def get_four_of_a_kind_rank(self, cards):
-        rank_counts = Counter(card.rank for card in cards)
+        rank_counts = Counter(_ranks(cards))
         four_rank = [rank for rank, count in rank_counts.items() if count == 4]
-        return four_rank[0].value if four_rank else None
+        return four_rank[0] if four_rank else None
 
     # Check for full house
     def is_full_house(self, cards):
-        rank_counts = Counter(card.rank for card in cards)
+        rank_counts = Counter(_ranks(cards))
         return 3 in rank_counts.values() and 2 in rank_counts.values()
 
     def get_full_house_rank(self, cards):
-        rank_counts = Counter(card.rank for card in cards)
+        rank_counts = Counter(_ranks(cards))
         three_rank = [rank for rank, count in rank_counts.items() if count == 3]
         pair_rank = [rank for rank, count in rank_counts.items() if count == 2]
-        return (three_rank[0].value, pair_rank[0].value) if three_rank and pair_rank else None
+        return (three_rank[0], pair_rank[0]) if three_rank and pair_rank else None
 
     # Check for three of a kind
     def is_three_of_a_kind(self, cards):
-        rank_counts = Counter(card.rank for card in cards)
+        rank_counts = Counter(_ranks(cards))
         return 3 in rank_counts.values()
 
     def get_three_of_a_kind_rank(self, cards):
-        rank_counts = Counter(card.rank for card in cards)
+        rank_counts = Counter(_ranks(cards))
         three_rank = [rank for rank, count in rank_counts.items() if count == 3]
-        return three_rank[0].value if three_rank else None
+        return three_rank[0] if three_rank else None
 
     # Check for two pair
     def is_two_pair(self, cards):
-        rank_counts = Counter(card.rank for card in cards)
+        rank_counts = Counter(_ranks(cards))
         pairs = [rank for rank, count in rank_counts.items() if count == 2]
         return len(pairs) == 2
 
     def get_two_pair_rank(self, cards):
-        rank_counts = Counter(card.rank for card in cards)
-        pairs = [rank.value for rank, count in rank_counts.items() if count == 2]
+        rank_counts = Counter(_ranks(cards))
+        pairs = [rank for rank, count in rank_counts.items() if count == 2]
         return sorted(pairs, reverse=True)
 
     # Check for one pair
     def is_one_pair(self, cards):
-        rank_counts = Counter(card.rank for card in cards)
+        rank_counts = Counter(_ranks(cards))
         return 2 in rank_counts.values()
 
     def get_one_pair_rank(self, cards):
-        rank_counts = Counter(card.rank for card in cards)
+        rank_counts = Counter(_ranks(cards))
         pair_rank = [rank for rank, count in rank_counts.items() if count == 2]
         pair_rank.sort(reverse=True)
-        return pair_rank[0].value if pair_rank else None
\ No newline at end of file
+        return pair_rank[0] if pair_rank else None
\ No newline at end of file
@@ -0,0 +1,165 @@
+import mmap
+import struct
+
+from .card import CARDS
+from .player import PlayerActions
+
+# Append-only hand history. The file is an 8 byte header followed by fixed
+# size little endian records, one per hand, so a reader can memory map it and
+# index records directly or view the whole file as a NumPy structured array.
+#
+# record: hand_number u32, pot i32, payouts 10 x i32,
+#         seats u8, button u8, board_count u8, action_count u8,
+#         board 5 x u8, hole cards 10 x 2 x u8, 3 pad bytes,
+#         actions 48 x (street u8, seat u8, action u8, pad u8, amount i32)
+# Missing cards are NO_CARD and actions use ACTION_CODES.
+MAGIC = b"HSHH"
+VERSION = 1
+MAX_SEATS = 10
+MAX_ACTIONS = 48
+NO_CARD = 255
+
+FILE_HEADER = struct.Struct("<4sHH")
+RECORD_HEADER = struct.Struct(f"<Ii{MAX_SEATS}iBBBB5s{MAX_SEATS * 2}s3x")
+ACTION = struct.Struct("<BBBxi")
+RECORD_SIZE = RECORD_HEADER.size + ACTION.size * MAX_ACTIONS
+
+ACTIONS = [None] + list(PlayerActions)  # None is a posted blind
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+def record_dtype():
+    # NumPy view of one record, needs numpy
+    import numpy as np
+    return np.dtype([
+        ("hand_number", "<u4"), ("pot", "<i4"), ("payouts", "<i4", (MAX_SEATS,)),
+        ("seats", "u1"), ("button", "u1"), ("board_count", "u1"), ("action_count", "u1"),
+        ("board", "u1", (5,)), ("holes", "u1", (MAX_SEATS, 2)), ("pad", "V3"),
+        ("actions", [("street", "u1"), ("seat", "u1"), ("action", "u1"), ("pad", "V1"), ("amount", "<i4")],
+         (MAX_ACTIONS,)),
+    ])
+
+def pack_record(hand_number, pot, payouts, button, board, holes, actions) -> bytes:
+    # board and holes are card ids, actions are (street, seat, PlayerActions or None, amount)
+    if len(holes) > MAX_SEATS or len(actions) > MAX_ACTIONS:
+        raise ValueError(f"Hand has more than {MAX_SEATS} seats or {MAX_ACTIONS} actions")
+    hole_bytes = bytes(card for hole in holes for card in (list(hole) + [NO_CARD] * 2)[:2])
+    record = bytearray(RECORD_SIZE)
+    RECORD_HEADER.pack_into(record, 0, hand_number, pot, *(list(payouts) + [0] * (MAX_SEATS - len(payouts))),
+                            len(holes), button, len(board), len(actions),
+                            bytes(board).ljust(5, bytes([NO_CARD])),
+                            hole_bytes.ljust(MAX_SEATS * 2, bytes([NO_CARD])))
+    for index, (street, seat, action, amount) in enumerate(actions):
+        ACTION.pack_into(record, RECORD_HEADER.size + index * ACTION.size, street, seat, ACTION_CODES[action], amount)
+    return bytes(record)
+
+class HandHistoryWriter:
+    def __init__(self, path: str):
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(MAGIC, VERSION, RECORD_SIZE))
+
+    def write(self, hand_number, pot, payouts, button, board, holes, actions):
+        self._file.write(pack_record(hand_number, pot, payouts, button, board, holes, actions))
+
+    def write_game(self, game, payouts):
+        # record the hand just played by a TexasHoldem game
+        self.write(game.hand_number, sum(payouts), payouts, game.button,
+                   [card.id for card in game.board_cards],
+                   [[card.id for card in player.cards] for player in game.players],
+                   game.actions)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class HandRecord:
+    # one record read in place from the memory map
+    __slots__ = ("_buffer", "_offset")
+
+    def __init__(self, buffer, offset):
+        self._buffer = buffer
+        self._offset = offset
+
+    def _header(self):
+        return RECORD_HEADER.unpack_from(self._buffer, self._offset)
+
+    @property
+    def hand_number(self) -> int:
+        return self._header()[0]
+
+    @property
+    def pot(self) -> int:
+        return self._header()[1]
+
+    @property
+    def payouts(self) -> list[int]:
+        header = self._header()
+        return list(header[2:2 + header[2 + MAX_SEATS]])
+
+    @property
+    def button(self) -> int:
+        return self._header()[3 + MAX_SEATS]
+
+    @property
+    def board(self):
+        header = self._header()
+        return [CARDS[card] for card in header[6 + MAX_SEATS][:header[4 + MAX_SEATS]]]
+
+    @property
+    def holes(self):
+        header = self._header()
+        hole_bytes = header[7 + MAX_SEATS]
+        return [[CARDS[card] for card in hole_bytes[seat * 2:seat * 2 + 2] if card != NO_CARD]
+                for seat in range(header[2 + MAX_SEATS])]
+
+    @property
+    def actions(self):
+        # (street, seat, PlayerActions or None for a blind, amount)
+        action_count = self._header()[5 + MAX_SEATS]
+        start = self._offset + RECORD_HEADER.size
+        return [(street, seat, ACTIONS[code], amount)
+                for street, seat, code, amount in ACTION.iter_unpack(self._buffer[start:start + action_count * ACTION.size])]
+
+class HandHistory:
+    def __init__(self, path: str):
+        with open(path, "rb") as history_file:
+            self._map = mmap.mmap(history_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size = FILE_HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"{path} is not a hand history")
+        self._buffer = memoryview(self._map)
+        self._count = (len(self._map) - FILE_HEADER.size) // RECORD_SIZE
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index: int) -> HandRecord:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("hand history index out of range")
+        return HandRecord(self._buffer, FILE_HEADER.size + index * RECORD_SIZE)
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield HandRecord(self._buffer, FILE_HEADER.size + index * RECORD_SIZE)
+
+    def as_array(self):
+        # every record as a NumPy structured array sharing the memory map
+        import numpy as np
+        return np.frombuffer(self._map, dtype=record_dtype(), count=self._count, offset=FILE_HEADER.size)
+
+    def close(self):
+        self._buffer.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,10 +1,70 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 from itertools import combinations
 from typing import Counter
 
+from . import equity, preflop, ranges, showdown, stats
 from .hand import Hand
 from .player import Player, Attitude, PlayerActions, PlayerState
+from .card import NUMBER_OF_CARDS
 from .deck import Deck
+from .evaluator import evaluate7
+
+# rounds sampled per seeded chunk in TexasHoldem.simulate
+SIMULATION_CHUNK = 250
+
+def _check_deal(needed, live, number_of_players):
+    if needed > live:
+        raise ValueError(f"{number_of_players} players need {needed} more cards but only {live} are left")
+
+def _simulate_chunk(hand, board, number_of_players, number_of_rounds, seed, chunk, dead=(), timed=False):
+    # one deck for the whole chunk: known cards are dead, every round resets
+    # the deck in O(1) and draws only the cards it needs. Returns (wins,
+    # squares, timings), timings being the chunk's seconds spent dealing and
+    # evaluating when timed, for the caller to merge into stats, else None
+    rng = random.Random(f"{seed}:{chunk}")
+    hole = [card.id for card in hand]
+    known_board = [card.id for card in board]
+    deck = Deck(rng)
+    deck.mark_dead(hole + known_board + [card.id for card in dead])
+    missing_hole = 2 - len(hole)
+    missing_board = 5 - len(known_board)
+    needed = missing_hole + missing_board + 2 * (number_of_players - 1)
+    _check_deal(needed, NUMBER_OF_CARDS - bin(deck.dead).count("1"), number_of_players)
+
+    wins = [0] * number_of_players
+    squares = [0] * number_of_players
+    deal_time = evaluate_time = 0.0
+    for _ in range(number_of_rounds):
+        if timed:
+            start = time.perf_counter()
+        deck.reset(shuffle=False)
+        drawn = deck.draw_card_ids(needed)
+        full_board = known_board + drawn[:missing_board]
+        dealt = missing_board + missing_hole
+        if timed:
+            dealt_at = time.perf_counter()
+            deal_time += dealt_at - start
+        strengths = [evaluate7(hole + drawn[missing_board:dealt] + full_board)]
+        for _ in range(number_of_players - 1):
+            strengths.append(evaluate7(drawn[dealt:dealt + 2] + full_board))
+            dealt += 2
+        if timed:
+            evaluate_time += time.perf_counter() - dealt_at
+        best = max(strengths)
+        winners = [player_index for player_index, strength in enumerate(strengths) if strength == best]
+        for player_index in winners:
+            wins[player_index] += 1 / len(winners)  # Distribute win equally in case of a tie
+            squares[player_index] += 1 / len(winners) ** 2
+    return wins, squares, (deal_time, evaluate_time) if timed else None
+
+def _add_chunk_timings(timings):
+    # merge the (deal, evaluate) seconds a timed chunk sent back into stats
+    deal_time, evaluate_time = timings
+    stats.add_time("simulate.deal", deal_time)
+    stats.add_time("simulate.evaluate", evaluate_time)
 
 class Round():
     def __init__(self, game):
@@ -15,33 +75,153 @@ class Round():
         return self.name.replace("_", " ").title()
 
 class TexasHoldem:
-    def __init__(self, players, starting_chips=500, big_blind=10):
+    def __init__(self, players, starting_chips=500, big_blind=10, rng=None, equity_cache=None):
         self.players = [Player(name, starting_chips, Attitude.CHAOTIC) for name in players]
         self.players[0].attitude = Attitude.PLAYER
-        self.deck = Deck()
+        self.deck = Deck(rng)
         self.pot = 0
         self.board_cards = []
         self.big_blind = big_blind
+        self.button = 0  # dealer seat, odd chips go to the first winner on its left
+        self.hand_number = 0
+        self.actions = []  # (street, seat, PlayerActions or None for a blind, amount) this hand
+        self.equity_cache = equity_cache  # equity_cache.EquityCache consulted by unseeded simulate calls
+        self._showdown = None  # (state, strengths) determine_winner found, kept for distribute_winnings
+
+    def start_hand(self):
+        # clear the last hand, move the button and sit out players with no chips
+        for player in self.players:
+            player.cards = []
+            player.contributed = 0
+            player.state = PlayerState.ACTIVE if player.chips > 0 else PlayerState.BUSTED
+        self.board_cards = []
+        self.pot = 0
+        self.actions = []
+        self._showdown = None
+        self.hand_number += 1
+        self.deck.clear_dead()
+        self.deck.reset()
+        self.button = (self.button + 1) % len(self.players)
 
+    def take_blinds(self):
+        # small and big blind from the first two seated players left of the button
+        seated = [player for player in self.players[self.button + 1:] + self.players[:self.button + 1]
+                  if player.state != PlayerState.BUSTED]
+        for player, blind in zip(seated, [self.big_blind // 2, self.big_blind]):
+            amount = min(blind, player.chips)
+            self.add_to_pot(player.bet(amount))
+            self.actions.append((0, self.players.index(player), None, amount))
+            if player.chips == 0:
+                player.state = PlayerState.ALL_IN
+
+    def live_players(self):
+        return [player for player in self.players if player.state in (PlayerState.ACTIVE, PlayerState.ALL_IN)]
+
+    def play_hand(self):
+        # one complete hand from blinds to showdown, returns the chips paid to each seat
+        steps = self.hand_steps()
+        try:
+            seat = next(steps)
+            while True:
+                seat = steps.send(self.players[seat].action(self))
+        except StopIteration as finished:
+            return finished.value
+
+    def hand_steps(self):
+        # play_hand as a generator for callers that decide elsewhere: yields
+        # each seat that has to act, expects its PlayerActions to be sent back
+        # and returns the chips paid to each seat
+        self.start_hand()
+        self.take_blinds()
+        self.deal()
+        return (yield from self.remaining_steps())
+
+    def remaining_steps(self, after_seat=-1):
+        # hand_steps for the rest of the hand in progress, the current betting
+        # round picking up after after_seat
+        yield from self._betting_steps(after_seat)
+        for street in (self.flop, self.turn, self.river)[self.street():]:
+            if len(self.live_players()) < 2:
+                break
+            street()
+            yield from self._betting_steps()
+        return self.distribute_winnings()
+
+    def _betting_steps(self, after_seat=-1):
+        for seat in self.seats_to_act():
+            if seat <= after_seat or self.players[seat].state != PlayerState.ACTIVE or len(self.live_players()) < 2:
+                continue
+            action = yield seat
+            self.apply_action(seat, action)
+
+    def snapshot(self):
+        # everything a hand in progress changes, as tuples and plain copies
+        # that restore puts back; far cheaper than deepcopy
+        return (tuple((player.chips, player.state, tuple(player.cards), player.contributed) for player in self.players),
+                self.pot, tuple(self.board_cards), self.button, self.hand_number,
+                self.actions, len(self.actions), self.deck.snapshot())
+
+    def restore(self, snapshot):
+        players, self.pot, board, self.button, self.hand_number, actions, action_count, deck = snapshot
+        for player, (chips, state, cards, contributed) in zip(self.players, players):
+            player.chips = chips
+            player.state = state
+            player.cards = list(cards)
+            player.contributed = contributed
+        self.board_cards = list(board)
+        self._showdown = None
+        # a hand only appends to its action list, so the list is shared and cut back
+        self.actions = actions
+        del actions[action_count:]
+        self.deck.restore(deck)
+
+    @stats.timed("deal")
     def deal(self):
         self.deck.shuffle()
         for player in self.players:
+            if player.state == PlayerState.BUSTED:
+                continue
             while len(player.cards) < 2:
                 player.cards.append(self.deck.draw_card())
 
+    def street(self):
+        # 0 preflop, 1 flop, 2 turn, 3 river
+        return max(len(self.board_cards) - 2, 0)
+
+    def apply_action(self, seat, action):
+        # play one betting decision for the player in seat
+        player = self.players[seat]
+        amount = 0
+        if action == PlayerActions.FOLD:
+            player.state = PlayerState.FOLDED
+        elif action == PlayerActions.CALL:
+            amount = min(self.big_blind, player.chips)
+            self.add_to_pot(player.bet(amount))
+        elif action == PlayerActions.RAISE:
+            #todo raise logic
+            amount = min(20, player.chips)
+            self.add_to_pot(player.bet(amount))
+        elif action == PlayerActions.ALL_IN:
+            amount = player.chips
+            self.add_to_pot(player.bet(amount))
+        if player.chips == 0 and player.state == PlayerState.ACTIVE:
+            # a used up stack stays in the hand until showdown, as after take_blinds
+            player.state = PlayerState.ALL_IN
+        self.actions.append((self.street(), seat, action, amount))
+
+    def seats_to_act(self):
+        # seats still to act this round, in order; callers re-check before each decision
+        return [seat for seat, player in enumerate(self.players) if player.state == PlayerState.ACTIVE]
+
     def round_of_betting(self):
-        for player in self.players:
-            action = player.action(self)
-            if action == PlayerActions.FOLD:
-                self.players.index(player).state = PlayerState.FOLDED
-            elif action == PlayerActions.CALL:
-                player.bet(self.big_blind)
-                self.add_to_pot(self.big_blind)
-            elif action == PlayerActions.RAISE:
-                #todo raise logic
-                player.bet(20)
-                self.add_to_pot(20)
-                
+        steps = self._betting_steps()
+        try:
+            seat = next(steps)
+            while True:
+                seat = steps.send(self.players[seat].action(self))
+        except StopIteration:
+            pass
+
     def flop(self):
         self.board_cards.extend([self.deck.draw_card() for _ in range(3)])
 
@@ -54,58 +234,209 @@ class TexasHoldem:
     def add_to_pot(self, amount):
         self.pot += amount
     
-    def determine_winner(self):
-        best_hands = []
-        
-        for player in self.players:
-            combined_cards = player.cards + self.board_cards
-            hand = Hand(combined_cards)
-            best_hands.append((player.name, hand))
+    @stats.timed("evaluation")
+    def _showdown_strengths(self):
+        # strength per seat, None for seats that cannot win the pot
+        live = [player.state in (PlayerState.ACTIVE, PlayerState.ALL_IN) for player in self.players]
+        if sum(live) == 1:
+            return [0 if is_live else None for is_live in live]
+        board = [card.id for card in self.board_cards]
+        return [evaluate7([card.id for card in player.cards] + board) if is_live else None
+                for player, is_live in zip(self.players, live)]
 
-        #sort best_rank and high_card
-        best_hands.sort(reverse=True, key=lambda x: x[2])
-        best_hands.sort(reverse=True, key=lambda x: x[1].value)
+    def _showdown_key(self):
+        # everything the showdown strengths depend on
+        return (self.hand_number, len(self.actions), tuple(card.id for card in self.board_cards),
+                tuple((player.state, tuple(card.id for card in player.cards)) for player in self.players))
 
-        # The winning hand(s)
-        winners = [best_hands[0]]
+    def determine_winner(self):
+        # (name, Hand) of every player holding the best hand, found in one pass;
+        # the strengths are kept for distribute_winnings
+        strengths = self._showdown_strengths()
+        self._showdown = self._showdown_key(), strengths
+        return self._winners(strengths)
 
-        # Check for ties
-        for hand in best_hands[1:]:
-            # Compare rank and card values to see if they tie with the current winner(s)
-            if hand[1] == winners[0][1] and hand[2] == winners[0][2]:  # Same hand rank and card values
-                winners.append(hand)
-            else:
-                break  # If the next hand is worse, stop checking for ties
+    @stats.timed("showdown")
+    def _winners(self, strengths):
+        # an uncontested seat's strength is only a placeholder for pot
+        # resolution, so its Hand is left to evaluate itself
+        contested = sum(strength is not None for strength in strengths) > 1
+        winners = []
+        for seat in showdown.best_seats(strengths):
+            player = self.players[seat]
+            hand = Hand(player.cards + self.board_cards)
+            if contested:
+                hand.strength = strengths[seat]
+            winners.append((player.name, hand))
+        return winners
 
+    def distribute_winnings(self, winners=None):
+        # pays the main and side pots from each player's contribution, in whole
+        # chips. Given the winners from determine_winner it reuses the
+        # strengths found there, as long as nothing they depend on has changed.
+        strengths = None
+        if winners is not None and self._showdown is not None and self._showdown[0] == self._showdown_key():
+            strengths = self._showdown[1]
+        self._showdown = None
+        return self._pay(strengths if strengths is not None else self._showdown_strengths())
 
-        return [winner for winner in winners]  # Return the names of the winners
-    
-    def distribute_winnings(self, winners):
-        self.pot -= self.pot % len(winners)
-        for winner in winners:
-            winning_player = next(player for player in self.players if player.name == winner[0])
-            winning_player.chips += (self.pot / len(winners))
+    @stats.timed("showdown")
+    def _pay(self, strengths):
+        contributions = [player.contributed for player in self.players]
+        dead_money = self.pot - sum(contributions)
+        payouts = showdown.resolve(strengths, contributions, dead_money, self.button)
+        for player, chips in zip(self.players, payouts):
+            player.chips += chips
+            player.contributed = 0
         self.pot = 0
+        return payouts
 
     def print_player_standings(self):
         name_string = "\t".join([player.name for player in self.players])
         chips_string = "\t".join([str(player.chips) for player in self.players])
         print(f"Players:\t{name_string}\nChip Count:\t{chips_string}")
 
-    def simulate(self, hand, number_of_players=4, number_of_rounds=1000):
+    def _table_equity(self, hand, board, number_of_players, dead):
+        # preflop table lookup, None when the spot is not in the table
+        if len(hand) != 2 or board or dead or not 2 <= number_of_players <= preflop.MAX_OPPONENTS + 1:
+            return None
+        table = preflop.load_table()
+        return None if table is None else table.rates(hand[0].id, hand[1].id, number_of_players)
+
+    def _known_equity(self, hand, board, number_of_players, dead=()):
+        # rates that need no sampling: preflop table lookups and spots small
+        # enough to enumerate, None otherwise
+        if len(hand) != 2:
+            return None
+        rates = self._table_equity(hand, board, number_of_players, dead)
+        if rates is not None:
+            return rates
+        if equity.exact_size(len(hand) + len(board) + len(dead), len(board), number_of_players) <= equity.EXACT_LIMIT:
+            return equity.exact_equity([card.id for card in hand], [card.id for card in board], number_of_players,
+                                       [card.id for card in dead])
+        return None
+
+    @staticmethod
+    def _check_players(hand, board, number_of_players, dead):
+        # the unseen cards every seat and the rest of the board need fit in the deck
+        known = len(hand) + len(board) + len(dead)
+        _check_deal(2 - len(hand) + 5 - len(board) + 2 * (number_of_players - 1), NUMBER_OF_CARDS - known,
+                    number_of_players)
+
+    def _unsampled_equity(self, hand, board, number_of_players, exact, dead):
+        # rates simulate and simulate_stream answer without sampling: the exact
+        # enumeration when exact, any known answer when exact is None
+        if exact:
+            if len(hand) != 2:
+                raise ValueError("Exact equity needs both hole cards")
+            return equity.exact_equity([card.id for card in hand], [card.id for card in board], number_of_players,
+                                       [card.id for card in dead])
+        if exact is None:
+            return self._known_equity(hand, board, number_of_players, dead)
+        return None
+
+    @stats.timed("simulate")
+    def simulate(self, hand, number_of_players=4, number_of_rounds=1000, board=None, exact=None, seed=None, workers=None,
+                 dead=None):
+        # exact: True enumerates every runout and opponent holding, False samples
+        # number_of_rounds deals, None answers from the preflop table or by
+        # enumeration when it is within equity.EXACT_LIMIT and samples otherwise.
+        # Sampling with the same seed gives the same result for any number of workers.
+        # dead cards are out of the deck. Unseeded calls go through equity_cache
+        # when the game has one.
+        board = board or []
+        dead = dead or []
+        if self.equity_cache is None or seed is not None:
+            return self._equity(hand, number_of_players, number_of_rounds, board, exact, seed, workers, dead)[0]
+        if exact is None:
+            rates = self._table_equity(hand, board, number_of_players, dead)
+            if rates is not None:
+                return rates
+        key = self.equity_cache.key(hand, board, number_of_players, dead)
+        rates = self.equity_cache.get(key, None if exact else number_of_rounds)
+        if rates is None:
+            rates, rounds = self._equity(hand, number_of_players, number_of_rounds, board, exact, seed, workers, dead)
+            self.equity_cache.put(key, rates, rounds)
+        return rates
+
+    def _equity(self, hand, number_of_players, number_of_rounds, board, exact, seed, workers, dead):
+        # (rates, rounds sampled) for simulate, rounds is None when the answer needed no sampling
+        self._check_players(hand, board, number_of_players, dead)
+        rates = self._unsampled_equity(hand, board, number_of_players, exact, dead)
+        if rates is not None:
+            return rates, None
+
+        # rounds are played in fixed size chunks, each with its own generator
+        # derived from the seed, so the result does not depend on workers
+        if seed is None:
+            seed = random.getrandbits(64)
+        tasks = [(hand, board, number_of_players, min(SIMULATION_CHUNK, number_of_rounds - start), seed, chunk, dead,
+                  stats.ENABLED)
+                 for chunk, start in enumerate(range(0, number_of_rounds, SIMULATION_CHUNK))]
+        if workers is not None and workers > 1:
+            with ProcessPoolExecutor(workers) as pool:
+                results = list(pool.map(_simulate_chunk, *zip(*tasks)))
+        else:
+            results = [_simulate_chunk(*task) for task in tasks]
+        if stats.ENABLED:
+            stats.count("simulate.rounds", number_of_rounds)
+            stats.count("simulate.evaluations", number_of_rounds * number_of_players)
+            for _, _, timings in results:
+                _add_chunk_timings(timings)
+        wins = [sum(chunk_wins[player_index] for chunk_wins, _, _ in results)
+                for player_index in range(number_of_players)]
+        return [win_count/number_of_rounds for win_count in wins], number_of_rounds
+
+    @stats.timed("simulate")
+    def simulate_ranges(self, seat_ranges, board=None, number_of_rounds=10000, exact=None, seed=None, dead=None):
+        # simulate with a weighted range per seat instead of one known hand
+        # against random ones, e.g. ["QQ+, AKs", "22+, A2s+, KTo+"]; see src.ranges
+        return ranges.range_equity(seat_ranges, board, dead, number_of_rounds, exact, seed)
+
+    def simulate_stream(self, hand, number_of_players=4, board=None, tolerance=0.01, time_budget=None,
+                        max_rounds=None, seed=None, z=1.96, exact=None, dead=None):
+        # yields an equity.EquityEstimate after every chunk of rounds and stops once
+        # every seat is within +/- tolerance at z standard errors, time_budget
+        # seconds have passed or max_rounds were played. Spots simulate would
+        # answer without sampling, every spot with exact=True and known ones
+        # with exact=None, yield that answer once with rounds 0 and standard
+        # errors of 0.0. For preflop table lookups that leaves out the table's
+        # own sampling error, preflop.build_table's rounds per hand.
+        if max_rounds is not None and max_rounds < 1:
+            raise ValueError(f"max_rounds must be at least 1, got {max_rounds}")
+        board = board or []
+        dead = dead or []
+        self._check_players(hand, board, number_of_players, dead)
+        rates = self._unsampled_equity(hand, board, number_of_players, exact, dead)
+        if rates is not None:
+            yield equity.EquityEstimate(0, rates, [0.0] * number_of_players)
+            return
+
+        deadline = None if time_budget is None else time.monotonic() + time_budget
+        if seed is None:
+            seed = random.getrandbits(64)
         wins = [0] * number_of_players
-        for _ in range(number_of_rounds):
-            sub_game = TexasHoldem([Player(f"Player {i}", attitude=Attitude.PASSIVE) for i in range(number_of_players)])
-            sub_game.players[0].cards = [sub_game.deck.draw_specific_card(card.rank, card.suit) for card in hand]
-            sub_game.deal()
-            sub_game.flop()
-            sub_game.turn()
-            sub_game.river()
-            winners = sub_game.determine_winner()
-            for winner in winners:
-                player_index = int(winner[0].name.split()[-1])  # Extract player index from name (e.g., "Player 0")
-                wins[player_index] += 1 / len(winners)  # Distribute win equally in case of a tie
-        return [win_count/number_of_rounds for win_count in wins]
+        squares = [0] * number_of_players
+        rounds = 0
+        chunk = 0
+        while True:
+            chunk_rounds = SIMULATION_CHUNK if max_rounds is None else min(SIMULATION_CHUNK, max_rounds - rounds)
+            chunk_wins, chunk_squares, timings = _simulate_chunk(hand, board, number_of_players, chunk_rounds, seed,
+                                                                 chunk, dead, stats.ENABLED)
+            if timings is not None:
+                _add_chunk_timings(timings)
+            wins = [total + added for total, added in zip(wins, chunk_wins)]
+            squares = [total + added for total, added in zip(squares, chunk_squares)]
+            rounds += chunk_rounds
+            chunk += 1
+            estimate = equity.EquityEstimate.from_sums(rounds, wins, squares)
+            yield estimate
+            if estimate.converged(tolerance, z):
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            if max_rounds is not None and rounds >= max_rounds:
+                return
 
     def __str__(self):
         return f"Players: {[player.name for player in self.players]}, Pot: {self.pot}, Board: {self.board_cards}"
\ No newline at end of file
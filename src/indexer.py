@@ -0,0 +1,169 @@
+from bisect import bisect_right
+from math import comb
+
+from .card import CARDS
+
+# A perfect index over suit isomorphic (hole, board) states: every street's
+# states are numbered 0 .. size(street) - 1 with no gaps, so a table keyed
+# by them is a flat array.
+#
+#     index(hole, board)   -> int, shared by every suit relabelling of the spot
+#     cards(index, street) -> (hole, board), one spot with that index
+#
+# A spot is split by suit: each suit holds a set of hole ranks and a set of
+# board ranks, its configuration. Relabelling suits only reorders the four
+# configurations, so the spot's class is their multiset. The index is laid
+# out by shape, the (hole count, board count) of each suit sorted from the
+# largest: every shape pattern gets a block, and within it suits of the same
+# shape form a multiset of configuration numbers indexed in colex order.
+#
+#     street   0      1          2           3
+#     states   169    1,286,792  13,960,050  123,156,254
+
+BOARD_CARDS = (0, 3, 4, 5)  # per street
+RANKS = 13
+
+def _colex(ranks) -> int:
+    # index of a sorted set of distinct small ints among sets of its size
+    return sum(comb(rank, position + 1) for position, rank in enumerate(ranks))
+
+def _uncolex(index: int, size: int) -> list[int]:
+    ranks = []
+    for position in range(size, 0, -1):
+        rank = position - 1
+        while comb(rank + 1, position) <= index:
+            rank += 1
+        index -= comb(rank, position)
+        ranks.append(rank)
+    return ranks[::-1]
+
+# per 13 bit rank mask: its ranks, their count and their colex index
+_MASK_RANKS = [[rank for rank in range(RANKS) if mask >> rank & 1] for mask in range(1 << RANKS)]
+_MASK_SIZE = [len(ranks) for ranks in _MASK_RANKS]
+_MASK_COLEX = [_colex(ranks) for ranks in _MASK_RANKS]
+
+class _StreetIndexer:
+    def __init__(self, board_cards: int):
+        self.board_cards = board_cards
+        # every way to split the hole and board cards over four suits, as
+        # shapes sorted from the largest
+        patterns = set()
+
+        def split(suit, hole_left, board_left, shapes):
+            if suit == 3:
+                patterns.add(tuple(sorted(shapes + [(hole_left, board_left)], reverse=True)))
+                return
+            for hole in range(hole_left + 1):
+                for board in range(board_left + 1):
+                    split(suit + 1, hole_left - hole, board_left - board, shapes + [(hole, board)])
+
+        split(0, 2, board_cards, [])
+        self.patterns = sorted(patterns)
+        self.offsets = []
+        self.groups = []    # per pattern, (shape, suits of that shape, multisets of that many)
+        total = 0
+        for pattern in self.patterns:
+            groups = []
+            for shape in sorted(set(pattern), reverse=True):
+                count = pattern.count(shape)
+                groups.append((shape, count, comb(self._configurations(shape) + count - 1, count)))
+            self.offsets.append(total)
+            self.groups.append(groups)
+            block = 1
+            for _, _, multisets in groups:
+                block *= multisets
+            total += block
+        self.size = total
+        self._pattern_numbers = {pattern: number for number, pattern in enumerate(self.patterns)}
+
+    @staticmethod
+    def _configurations(shape) -> int:
+        hole, board = shape
+        return comb(RANKS, hole) * comb(RANKS - hole, board)
+
+    def index(self, hole, board) -> int:
+        # index of card ids
+        if len(hole) != 2 or len(board) != self.board_cards:
+            raise ValueError(f"Expected two hole cards and {self.board_cards} board cards")
+        hole_masks = [0, 0, 0, 0]
+        board_masks = [0, 0, 0, 0]
+        for card in hole:
+            hole_masks[card & 3] |= 1 << (card >> 2)
+        for card in board:
+            board_masks[card & 3] |= 1 << (card >> 2)
+        suits = []
+        cards_seen = 0
+        for hole_mask, board_mask in zip(hole_masks, board_masks):
+            cards_seen += _MASK_SIZE[hole_mask | board_mask]
+            hole_count = _MASK_SIZE[hole_mask]
+            # board ranks renumbered over the ranks the hole left free
+            free_board = board_mask & ~hole_mask
+            for rank in _MASK_RANKS[hole_mask][::-1]:
+                free_board = free_board & ((1 << rank) - 1) | free_board >> (rank + 1) << rank
+            shape = hole_count, _MASK_SIZE[board_mask]
+            suits.append((shape, _MASK_COLEX[hole_mask] * comb(RANKS - hole_count, shape[1]) + _MASK_COLEX[free_board]))
+        if cards_seen != 2 + self.board_cards:
+            raise ValueError("The same card was given twice")
+        suits.sort(reverse=True)
+        pattern = tuple(shape for shape, _ in suits)
+        number = self._pattern_numbers[pattern]
+        position = 0
+        start = 0
+        for _, count, multisets in self.groups[number]:
+            values = sorted(configuration for _, configuration in suits[start:start + count])
+            position = position * multisets + _colex([value + offset for offset, value in enumerate(values)])
+            start += count
+        return self.offsets[number] + position
+
+    def ids(self, index: int) -> tuple[list[int], list[int]]:
+        # card ids of one spot with the index
+        if not 0 <= index < self.size:
+            raise ValueError(f"Index {index} is outside 0..{self.size - 1}")
+        number = bisect_right(self.offsets, index) - 1
+        position = index - self.offsets[number]
+        suits = []
+        for shape, count, multisets in reversed(self.groups[number]):
+            position, multiset = divmod(position, multisets)
+            values = [value - offset for offset, value in enumerate(_uncolex(multiset, count))]
+            suits[:0] = [(shape, value) for value in reversed(values)]
+        hole, board = [], []
+        for suit, ((hole_count, board_count), configuration) in enumerate(suits):
+            hole_index, board_index = divmod(configuration, comb(RANKS - hole_count, board_count))
+            hole_ranks = _uncolex(hole_index, hole_count)
+            free = [rank for rank in range(RANKS) if rank not in hole_ranks]
+            hole += [rank * 4 + suit for rank in hole_ranks]
+            board += [free[rank] * 4 + suit for rank in _uncolex(board_index, board_count)]
+        return sorted(hole), sorted(board)
+
+_INDEXERS = {}
+
+def _indexer(street: int) -> _StreetIndexer:
+    if street not in _INDEXERS:
+        if street not in range(len(BOARD_CARDS)):
+            raise ValueError(f"Unknown street {street}, expected 0 to 3")
+        _INDEXERS[street] = _StreetIndexer(BOARD_CARDS[street])
+    return _INDEXERS[street]
+
+def street_of(board) -> int:
+    if len(board) not in BOARD_CARDS:
+        raise ValueError(f"A board has 0, 3, 4 or 5 cards, got {len(board)}")
+    return BOARD_CARDS.index(len(board))
+
+def size(street: int) -> int:
+    # number of suit isomorphic states on a street
+    return _indexer(street).size
+
+def index_ids(hole: list[int], board: list[int]) -> int:
+    return _indexer(street_of(board)).index(hole, board)
+
+def ids(index: int, street: int) -> tuple[list[int], list[int]]:
+    return _indexer(street).ids(index)
+
+def index(hole, board) -> int:
+    # index of a spot given as Card lists
+    return index_ids([card.id for card in hole], [card.id for card in board])
+
+def cards(index: int, street: int) -> tuple[list, list]:
+    # (hole, board) Cards of one spot with the index
+    hole, board = ids(index, street)
+    return [CARDS[card] for card in hole], [CARDS[card] for card in board]
@@ -0,0 +1,220 @@
+from dataclasses import dataclass
+from math import comb
+
+from . import stats
+from .card import CARDS, NUMBER_OF_CARDS, Card
+from .evaluator import (CARD_BITS, CARD_PRIMES, CATEGORY_SHIFT, FLUSH, FULL_HOUSE, HIGH_CARD, PAIR, STRAIGHT,
+                        STRAIGHT_FLUSH, THREE_OF_A_KIND, WHEEL, category_of, evaluate_state)
+from .hand import PokerHands
+
+# Outs on the flop or turn. Every unseen card is added to one running
+# evaluator state (a rank mask per suit and the rank prime product, as Hand
+# keeps) and taken back off again, so each candidate costs a few table
+# lookups. A card is an out when it lifts the hand to a better class (pair,
+# two pair, trips and so on) by more than it lifts the board's own class, so
+# the hole cards have to take part: a card that only pairs the board is no
+# out, one that pairs a hole card is. An out is clean when it cannot be
+# handing someone a better hand: against known opponent cards that means it
+# leaves every opponent behind, otherwise that it does not pair the board
+# below a full house, bring a third card of its suit below a flush or open a
+# straight below a straight. The 1,081 turn and river pairs of a flop are
+# evaluated in one NumPy batch when numpy is installed.
+
+STRAIGHT_WINDOWS = tuple(0b11111 << low for low in range(9)) + (WHEEL,)
+
+_HANDS = {hand.value: hand for hand in PokerHands}
+
+def hand_class(category: int) -> int:
+    # 0 high card, 1 pair, 2 two pair, 3 trips ... 8 straight flush
+    if category == HIGH_CARD:
+        return 0
+    if category <= PAIR + 14:
+        return 1
+    if category < THREE_OF_A_KIND:
+        return 2
+    return min(category, STRAIGHT_FLUSH) - THREE_OF_A_KIND + 3
+
+# class of three or four board cards by their largest rank count
+# (1, 2 or 3 of a kind, 4 of a kind) and their number of pairs
+_SMALL_BOARD_CLASSES = {(1, 0): 0, (2, 1): 1, (2, 2): 2, (3, 0): 3, (3, 1): 3, (4, 0): 7}
+
+def _board_class(suit_masks, product, cards) -> int:
+    if len(cards) >= 5:
+        return hand_class(category_of(evaluate_state(suit_masks, product, len(cards))))
+    counts = {}
+    for card in cards:
+        counts[card >> 2] = counts.get(card >> 2, 0) + 1
+    pairs = sum(1 for count in counts.values() if count == 2)
+    return _SMALL_BOARD_CLASSES[max(counts.values()), pairs]
+
+@dataclass(frozen=True)
+class CardOutcome:
+    card: Card
+    strength: int
+    hand: PokerHands
+    improves: bool
+    clean: bool     # always False when the card does not improve
+
+@dataclass(frozen=True)
+class OutsReport:
+    strength: int                   # of the hand as it is now
+    hand: PokerHands
+    cards: tuple[CardOutcome, ...]  # every unseen card
+    next_street: float              # chance the next card is an out
+    by_river: float                 # chance of improving by the river, runner runner included
+
+    @property
+    def outs(self) -> list[CardOutcome]:
+        return [outcome for outcome in self.cards if outcome.improves]
+
+    @property
+    def clean_outs(self) -> list[CardOutcome]:
+        return [outcome for outcome in self.cards if outcome.clean]
+
+    @property
+    def tainted_outs(self) -> list[CardOutcome]:
+        return [outcome for outcome in self.cards if outcome.improves and not outcome.clean]
+
+    def outs_by_hand(self) -> dict[PokerHands, int]:
+        counts = {}
+        for outcome in self.outs:
+            counts[outcome.hand] = counts.get(outcome.hand, 0) + 1
+        return counts
+
+def _state(cards):
+    suit_masks = [0, 0, 0, 0]
+    product = 1
+    for card in cards:
+        suit_masks[card & 3] |= CARD_BITS[card]
+        product *= CARD_PRIMES[card]
+    return suit_masks, product
+
+def _with_card(suit_masks, product, size, card) -> int:
+    # strength of the state plus one card, leaving the state as it was
+    suit = card & 3
+    suit_masks[suit] |= CARD_BITS[card]
+    strength = evaluate_state(suit_masks, product * CARD_PRIMES[card], size + 1)
+    suit_masks[suit] ^= CARD_BITS[card]
+    return strength
+
+def _straight_possible(rank_mask) -> bool:
+    # three board ranks inside one straight leave a straight to two hole cards
+    return any(bin(rank_mask & window).count("1") >= 3 for window in STRAIGHT_WINDOWS)
+
+def _tainted_by_board(card, category, board_suits, board_rank_mask) -> bool:
+    rank_bit = CARD_BITS[card]
+    if category < FULL_HOUSE and board_rank_mask & rank_bit:
+        return True
+    if category < FLUSH and board_suits[card & 3] >= 2:
+        return True
+    return (category < STRAIGHT and not _straight_possible(board_rank_mask)
+            and _straight_possible(board_rank_mask | rank_bit))
+
+def _improved(new_class, new_board_class, hero_class, board_class) -> bool:
+    # the hand's class rises by more than the board's does
+    return new_class > hero_class and new_class - hero_class > new_board_class - board_class
+
+def _runner_runner(hero, unseen, hero_class, board_class) -> int:
+    # turn and river pairs that improve the flop hand, one pair at a time
+    size = len(hero)
+    suit_masks, product = _state(hero)
+    board_masks, board_product = _state(hero[2:])
+    improved = 0
+    for index, first in enumerate(unseen):
+        suit = first & 3
+        suit_masks[suit] |= CARD_BITS[first]
+        board_masks[suit] |= CARD_BITS[first]
+        first_product = product * CARD_PRIMES[first]
+        first_board_product = board_product * CARD_PRIMES[first]
+        for second in unseen[index + 1:]:
+            new_class = hand_class(category_of(_with_card(suit_masks, first_product, size + 1, second)))
+            if new_class > hero_class:
+                new_board_class = hand_class(category_of(_with_card(board_masks, first_board_product, 4, second)))
+                improved += _improved(new_class, new_board_class, hero_class, board_class)
+        suit_masks[suit] ^= CARD_BITS[first]
+        board_masks[suit] ^= CARD_BITS[first]
+    return improved
+
+_CLASSES = None     # hand_class per category, as a NumPy array
+
+def _runner_runner_batch(hero, unseen, hero_class, board_class) -> int:
+    # _runner_runner with every pair evaluated in one NumPy batch; raises
+    # ImportError without numpy
+    global _CLASSES
+    import numpy as np
+    from .batch import evaluate_with
+    if _CLASSES is None:
+        _CLASSES = np.array([hand_class(category) if category else 0 for category in range(STRAIGHT_FLUSH + 2)])
+    unseen = np.array(unseen)
+    first, second = np.triu_indices(len(unseen), 1)
+    runouts = np.stack([unseen[first], unseen[second]], axis=1)
+    new_classes = _CLASSES[evaluate_with(hero, runouts) >> CATEGORY_SHIFT]
+    new_board_classes = _CLASSES[evaluate_with(hero[2:], runouts) >> CATEGORY_SHIFT]
+    return int(((new_classes > hero_class) & (new_classes - hero_class > new_board_classes - board_class)).sum())
+
+def analyze_outs(hole: list[Card], board: list[Card], opponents: list[list[Card]] | None = None) -> OutsReport:
+    # outs of two hole cards on a three or four card board; opponents are
+    # any hole cards known to be out of the deck
+    if len(hole) != 2 or len(board) not in (3, 4):
+        raise ValueError("Outs need two hole cards and a flop or turn board")
+    hero = [card.id for card in hole] + [card.id for card in board]
+    board_ids = hero[2:]
+    opponent_ids = [[card.id for card in cards] + board_ids for cards in opponents or []]
+    known = set(hero).union(*opponent_ids)
+    if len(known) != len(hero) + sum(len(cards) - len(board_ids) for cards in opponent_ids):
+        raise ValueError("The same card was given twice")
+    unseen = [card for card in range(NUMBER_OF_CARDS) if card not in known]
+
+    size = len(hero)
+    suit_masks, product = _state(hero)
+    strength = evaluate_state(suit_masks, product, size)
+    category = category_of(strength)
+    hero_class = hand_class(category)
+    board_masks, board_product = _state(board_ids)
+    board_class = _board_class(board_masks, board_product, board_ids)
+    opponent_states = [_state(cards) for cards in opponent_ids]
+    board_suits = [0, 0, 0, 0]
+    board_rank_mask = 0
+    for card in board_ids:
+        board_suits[card & 3] += 1
+        board_rank_mask |= CARD_BITS[card]
+
+    def improves(new_category, new_board):
+        return _improved(hand_class(new_category), _board_class(board_masks, board_product, new_board),
+                         hero_class, board_class)
+
+    outcomes = []
+    out_cards = set()
+    for card in unseen:
+        new_strength = _with_card(suit_masks, product, size, card)
+        new_category = category_of(new_strength)
+        board_masks[card & 3] |= CARD_BITS[card]
+        board_product *= CARD_PRIMES[card]
+        is_out = improves(new_category, board_ids + [card])
+        board_masks[card & 3] ^= CARD_BITS[card]
+        board_product //= CARD_PRIMES[card]
+        clean = False
+        if is_out:
+            out_cards.add(card)
+            if opponent_states:
+                clean = all(_with_card(masks, opponent_product, size, card) < new_strength
+                            for masks, opponent_product in opponent_states)
+            else:
+                clean = not _tainted_by_board(card, new_category, board_suits, board_rank_mask)
+        outcomes.append(CardOutcome(CARDS[card], new_strength, _HANDS[new_category], is_out, clean))
+
+    next_street = len(out_cards) / len(unseen)
+    by_river = next_street
+    if len(board_ids) == 3:
+        # every turn and river pair, as an out on the turn can still be
+        # matched by the board on the river
+        try:
+            improved = _runner_runner_batch(hero, unseen, hero_class, board_class)
+        except ImportError:
+            improved = _runner_runner(hero, unseen, hero_class, board_class)
+        by_river = improved / comb(len(unseen), 2)
+        if stats.ENABLED:
+            stats.count("outs.evaluations", comb(len(unseen), 2))
+    if stats.ENABLED:
+        stats.count("outs.evaluations", len(unseen))
+    return OutsReport(strength, _HANDS[category], tuple(outcomes), next_street, by_river)
@@ -21,8 +21,13 @@ class Attitude(Enum):
     PASSIVE = "passive"
     AGGRESSIVE = "aggressive"
     CHAOTIC = "chaotic"
+    SEARCH = "search"   # rollouts from the current state, see src.search
     PLAYER = "player"
 
+def fallback_action(available):
+    # what a seat that did not answer in time does
+    return PlayerActions.CHECK if PlayerActions.CHECK in available else PlayerActions.FOLD
+
 class Player:
     def __init__(self, name, chips=500, attitude=Attitude.PLAYER):
         self.name = name
@@ -30,6 +35,7 @@ class Player:
         self.attitude = attitude
         self.state = PlayerState.ACTIVE
         self.cards = []
+        self.contributed = 0  # chips put in the pot this hand
 
     def action(self, game_state):
         if self.attitude == Attitude.PLAYER:
@@ -38,22 +44,24 @@ class Player:
                 print(f"The board cards are: {game_state.board_cards}")
             available_actions = self.available_actions(game_state)
             available_actions = [str(action) for action in available_actions]
-            player_input = input(f"Available actions: {', '.join(available_actions)} ").lower()
-            if player_input == "check":
-                return PlayerActions.CHECK
-            elif player_input == "call":
-                return PlayerActions.CALL
-            elif player_input == "raise":
-                return PlayerActions.RAISE
-            elif player_input == "fold":
-                return PlayerActions.FOLD
-            else:
+            while True:
+                player_input = input(f"Available actions: {', '.join(available_actions)} ").lower()
+                if player_input == "check":
+                    return PlayerActions.CHECK
+                elif player_input == "call":
+                    return PlayerActions.CALL
+                elif player_input == "raise":
+                    return PlayerActions.RAISE
+                elif player_input == "fold":
+                    return PlayerActions.FOLD
                 print("Invalid input. Please try again.")
-                return self.action(game_state)
         else:
             return self.ai_action(game_state)
     
     def ai_action(self, game_state):
+        if self.attitude == Attitude.SEARCH:
+            from .search import search_action
+            return search_action(game_state, game_state.players.index(self))
         # Placeholder for AI decision-making logic
         if PlayerActions.CALL in self.available_actions(game_state):
             return PlayerActions.CALL
@@ -64,7 +72,8 @@ class Player:
     
     def available_actions(self, game_state):
         actions = [PlayerActions.FOLD]
-        if self.chips >= game_state.big_blind:
+        if self.chips > 0:
+            # a stack short of the big blind calls with what it has
             actions.append(PlayerActions.CALL)
         if self.chips >= game_state.big_blind * 2:
             actions.append(PlayerActions.RAISE)
@@ -78,6 +87,7 @@ class Player:
         if amount > self.chips:
             raise ValueError("Not enough chips to bet that amount")
         self.chips -= amount
+        self.contributed += amount
         return amount
 
     def fold(self):
@@ -0,0 +1,108 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+import numpy as np
+
+from .player import PlayerActions
+
+# Batched decisions for array based bots. A Policy sees every pending
+# decision from many tables at once as one DecisionBatch and answers with a
+# vector of action codes, an index into ACTIONS per row:
+#
+#     class MyModel(Policy):
+#         def decide(self, batch):
+#             return model.predict(batch.features()).argmax(axis=1)
+#
+# runner.play_batched keeps the tables paused at their decision points and
+# submits them together.
+
+ACTIONS = list(PlayerActions)
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+NO_CARD = -1   # padding for hole cards not dealt and the board before the river
+
+FOLD, CHECK, CALL = ACTION_CODES[PlayerActions.FOLD], ACTION_CODES[PlayerActions.CHECK], ACTION_CODES[PlayerActions.CALL]
+
+@dataclass(frozen=True)
+class DecisionBatch:
+    tables: np.ndarray     # (N,) index of the table asking
+    seats: np.ndarray      # (N,) seat to act
+    holes: np.ndarray      # (N, 2) hole card ids
+    boards: np.ndarray     # (N, 5) board card ids padded with NO_CARD
+    pots: np.ndarray       # (N,)
+    stacks: np.ndarray     # (N,) chips behind of the seat to act
+    big_blinds: np.ndarray # (N,)
+    available: np.ndarray  # (N, len(ACTIONS)) bool mask of legal actions
+
+    @classmethod
+    def from_games(cls, decisions):
+        # decisions is a list of (table, game, seat) waiting on an action
+        size = len(decisions)
+        tables = np.empty(size, dtype=np.int64)
+        seats = np.empty(size, dtype=np.int64)
+        holes = np.full((size, 2), NO_CARD, dtype=np.int64)
+        boards = np.full((size, 5), NO_CARD, dtype=np.int64)
+        pots = np.empty(size, dtype=np.int64)
+        stacks = np.empty(size, dtype=np.int64)
+        big_blinds = np.empty(size, dtype=np.int64)
+        available = np.zeros((size, len(ACTIONS)), dtype=bool)
+        for row, (table, game, seat) in enumerate(decisions):
+            player = game.players[seat]
+            tables[row] = table
+            seats[row] = seat
+            holes[row, :len(player.cards)] = [card.id for card in player.cards]
+            boards[row, :len(game.board_cards)] = [card.id for card in game.board_cards]
+            pots[row] = game.pot
+            stacks[row] = player.chips
+            big_blinds[row] = game.big_blind
+            for action in player.available_actions(game):
+                available[row, ACTION_CODES[action]] = True
+        return cls(tables, seats, holes, boards, pots, stacks, big_blinds, available)
+
+    def __len__(self):
+        return len(self.seats)
+
+    def streets(self) -> np.ndarray:
+        # 0 preflop to 3 on the river, as TexasHoldem.street
+        return np.searchsorted([3, 4, 5], (self.boards != NO_CARD).sum(axis=1), side="right")
+
+    def features(self) -> np.ndarray:
+        # one float row per decision: hole and board one hot over 52 cards,
+        # then pot and stack in big blinds and the legal action mask
+        size = len(self)
+        cards = np.zeros((size, 104), dtype=np.float32)
+        held = self.holes != NO_CARD
+        cards[np.nonzero(held)[0], self.holes[held]] = 1
+        dealt = self.boards != NO_CARD
+        cards[np.nonzero(dealt)[0], 52 + self.boards[dealt]] = 1
+        chips = np.stack([self.pots, self.stacks], axis=1) / self.big_blinds[:, None]
+        return np.hstack([cards, chips.astype(np.float32), self.available.astype(np.float32)])
+
+    def legal(self, actions) -> np.ndarray:
+        # actions as codes, with any illegal choice replaced by check, or fold
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (len(self),):
+            raise ValueError(f"Expected {len(self)} actions, got shape {actions.shape}")
+        in_range = (actions >= 0) & (actions < len(ACTIONS))
+        allowed = in_range & self.available[np.arange(len(self)), np.where(in_range, actions, 0)]
+        fallback = np.where(self.available[:, CHECK], CHECK, FOLD)
+        return np.where(allowed, actions, fallback)
+
+class Policy(ABC):
+    @abstractmethod
+    def decide(self, batch: DecisionBatch) -> np.ndarray:
+        # one action code per row of the batch
+        ...
+
+class CallingPolicy(Policy):
+    # Player.ai_action for a whole batch: call, else check, else fold
+    def decide(self, batch):
+        return np.where(batch.available[:, CALL], CALL, np.where(batch.available[:, CHECK], CHECK, FOLD))
+
+class RandomPolicy(Policy):
+    # a uniformly random legal action per row
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def decide(self, batch):
+        weights = self.rng.random(batch.available.shape) * batch.available
+        return weights.argmax(axis=1)
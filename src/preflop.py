@@ -0,0 +1,109 @@
+import mmap
+import os
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# All-in equity of the 169 canonical starting hands against 1-9 random
+# opponents, stored as little endian float32 after a small header and read
+# straight out of a memory map. Build it with
+#
+#     python -m src.preflop [rounds] [workers]
+#
+# Hands index a 13x13 grid by rank index (0 is a two, 12 an ace): pairs on the
+# diagonal, suited hands at [high][low] and offsuit hands at [low][high].
+MAGIC = b"HSPF"
+VERSION = 1
+HEADER = struct.Struct("<4sHHH6x")
+HANDS = 169
+MAX_OPPONENTS = 9
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "preflop_equity.bin")
+DEFAULT_ROUNDS = 100000  # per hand, what the shipped table was built with
+
+def hand_index(card_a: int, card_b: int) -> int:
+    # canonical starting hand of two card ids
+    high, low = max(card_a >> 2, card_b >> 2), min(card_a >> 2, card_b >> 2)
+    if (card_a & 3) == (card_b & 3):
+        return high * 13 + low
+    return low * 13 + high
+
+def representative(index: int) -> tuple[int, int]:
+    # two card ids for a canonical starting hand
+    row, column = divmod(index, 13)
+    if row > column:
+        return row * 4, column * 4
+    return row * 4, column * 4 + 1
+
+class PreflopTable:
+    def __init__(self, path: str = DEFAULT_PATH):
+        with open(path, "rb") as table_file:
+            self._map = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, hands, max_opponents = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or hands != HANDS:
+            raise ValueError(f"{path} is not a preflop equity table")
+        self.max_opponents = max_opponents
+        self._equities = memoryview(self._map)[HEADER.size:].cast("f")
+
+    def equity(self, card_a: int, card_b: int, opponents: int) -> float:
+        # share of the pot the hand wins against opponents random hands
+        if not 1 <= opponents <= self.max_opponents:
+            raise ValueError(f"Table covers 1-{self.max_opponents} opponents, not {opponents}")
+        return self._equities[hand_index(card_a, card_b) * self.max_opponents + opponents - 1]
+
+    def rates(self, card_a: int, card_b: int, number_of_players: int) -> list[float]:
+        # simulate style win rates, seat 0 holding the two cards
+        hero = self.equity(card_a, card_b, number_of_players - 1)
+        return [hero] + [(1 - hero) / (number_of_players - 1)] * (number_of_players - 1)
+
+_TABLE = None
+
+def load_table(path: str = DEFAULT_PATH) -> PreflopTable | None:
+    # the shared table at path, or None if it has not been built
+    global _TABLE
+    if _TABLE is None or path != DEFAULT_PATH:
+        if not os.path.exists(path):
+            return None
+        table = PreflopTable(path)
+        if path != DEFAULT_PATH:
+            return table
+        _TABLE = table
+    return _TABLE
+
+def _hand_equities(index: int, rounds: int, seed: int) -> list[float]:
+    # Monte Carlo equity of one canonical hand against 1-9 opponents, every
+    # opponent count sharing the same deals
+    import numpy as np
+    from .batch import evaluate_many
+
+    hole = representative(index)
+    rng = np.random.default_rng([seed, index])
+    remaining = np.array([card for card in range(52) if card not in hole], dtype=np.int64)
+    needed = 5 + 2 * MAX_OPPONENTS
+    deals = remaining[np.argsort(rng.random((rounds, remaining.size)), axis=1)[:, :needed]]
+    board = deals[:, :5]
+    hero = evaluate_many(np.hstack([np.broadcast_to(np.array(hole), (rounds, 2)), board]))
+    opponents = [evaluate_many(np.hstack([deals[:, 5 + 2 * seat:7 + 2 * seat], board])) for seat in range(MAX_OPPONENTS)]
+
+    equities = []
+    best = np.zeros(rounds, dtype=np.int64)
+    ties = np.zeros(rounds, dtype=np.int64)
+    for strengths in opponents:
+        ties = np.where(strengths > best, 1, ties + (strengths == best))
+        best = np.maximum(best, strengths)
+        share = np.where(hero > best, 1.0, np.where(hero == best, 1.0 / (ties + 1), 0.0))
+        equities.append(float(share.mean()))
+    return equities
+
+def build_table(path: str = DEFAULT_PATH, rounds: int = DEFAULT_ROUNDS, workers: int | None = None, seed: int = 0):
+    # write a table of Monte Carlo equities to path, needs numpy
+    with ProcessPoolExecutor(workers) as pool:
+        rows = list(pool.map(_hand_equities, range(HANDS), [rounds] * HANDS, [seed] * HANDS))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as table_file:
+        table_file.write(HEADER.pack(MAGIC, VERSION, HANDS, MAX_OPPONENTS))
+        table_file.write(struct.pack(f"<{HANDS * MAX_OPPONENTS}f", *(equity for row in rows for equity in row)))
+
+if __name__ == "__main__":
+    build_table(rounds=int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROUNDS,
+                workers=int(sys.argv[2]) if len(sys.argv) > 2 else None)
@@ -0,0 +1,217 @@
+import random
+from bisect import bisect_right
+from itertools import accumulate, combinations
+from math import comb, prod
+
+from . import stats
+from .card import NUMBER_OF_CARDS, Card
+from .equity import EXACT_LIMIT
+from .evaluator import evaluate7
+
+# Hand ranges in the usual shorthand, a comma separated list of
+#
+#     QQ  QQ+  QQ-99        pairs, and every pair from QQ up or from QQ down to 99
+#     AK  AKs  AKo          both, suited or offsuit combos
+#     A2s+  KTo+  AJs-A8s   every kicker from A2s up to AKs, KTo to KQo, AJs down to A8s
+#     AhKh                  one exact combo
+#
+# each optionally weighted as in "AKs:0.5". A parsed range maps holdings,
+# (higher card id, lower card id), to their weight; later tokens override
+# earlier ones.
+#
+# range_equity deals every seat from its range. Small spots are enumerated
+# exactly over the compatible combos. Larger spots are sampled without
+# rejection: each seat draws from its own combos with the ones blocked by
+# cards already dealt skipped over, and every deal is weighted by how much
+# range weight the blocking removed, which keeps the estimate unbiased.
+
+RANK_CHARS = "23456789TJQKA"
+
+def _rank(char: str) -> int:
+    index = RANK_CHARS.find(char.upper())
+    if index < 0:
+        raise ValueError(f"Unknown rank {char!r}")
+    return index
+
+def _combos(high: int, low: int, kind: str) -> list[tuple[int, int]]:
+    # holdings of two rank indexes, kind is "s", "o" or "" for both
+    holdings = []
+    for suit_a in range(4):
+        for suit_b in range(4):
+            if high == low and suit_b <= suit_a:
+                continue
+            if high != low and (kind == "s" and suit_a != suit_b or kind == "o" and suit_a == suit_b):
+                continue
+            card_a, card_b = high * 4 + suit_a, low * 4 + suit_b
+            holdings.append((max(card_a, card_b), min(card_a, card_b)))
+    return holdings
+
+def _token_combos(token: str) -> list[tuple[int, int]]:
+    if len(token) == 4 and token[1].upper() in "HDCS":
+        card_a, card_b = Card.from_string(token[:2]).id, Card.from_string(token[2:]).id
+        if card_a == card_b:
+            raise ValueError(f"{token!r} holds the same card twice")
+        return [(max(card_a, card_b), min(card_a, card_b))]
+    first, _, last = token.partition("-")
+    plus = first.endswith("+")
+    first = first.rstrip("+")
+    if len(first) not in (2, 3) or len(first) == 3 and first[2] not in "so":
+        raise ValueError(f"Cannot read range token {token!r}")
+    high, low, kind = _rank(first[0]), _rank(first[1]), first[2:]
+    high, low = max(high, low), min(high, low)
+    if high == low and kind:
+        raise ValueError(f"Pairs cannot be suited or offsuit: {token!r}")
+    if last:
+        if len(last) != len(first) or last[2:] != kind or (high == low) != (last[0] == last[1]):
+            raise ValueError(f"Cannot read range token {token!r}")
+        end_high, end_low = max(_rank(last[0]), _rank(last[1])), min(_rank(last[0]), _rank(last[1]))
+        if high == low:
+            ranks = [(rank, rank) for rank in range(min(high, end_high), max(high, end_high) + 1)]
+        elif end_high == high:
+            ranks = [(high, kicker) for kicker in range(min(low, end_low), max(low, end_low) + 1)]
+        else:
+            raise ValueError(f"Range {token!r} must keep its top card")
+    elif plus:
+        ranks = ([(rank, rank) for rank in range(high, 13)] if high == low
+                 else [(high, kicker) for kicker in range(low, high)])
+    else:
+        ranks = [(high, low)]
+    return [holding for rank_high, rank_low in ranks for holding in _combos(rank_high, rank_low, kind)]
+
+def parse_range(text) -> dict[tuple[int, int], float]:
+    # holdings to weights from range shorthand, or a mapping of shorthand to weights
+    items = text.items() if isinstance(text, dict) else [(token, None) for token in text.split(",")]
+    holdings = {}
+    for token, weight in items:
+        token = token.strip()
+        if not token:
+            continue
+        if weight is None:
+            token, _, weight_text = token.partition(":")
+            weight = float(weight_text) if weight_text else 1.0
+        if weight < 0:
+            raise ValueError(f"Negative weight for {token!r}")
+        for holding in _token_combos(token.strip()):
+            holdings[holding] = weight
+    return {holding: weight for holding, weight in holdings.items() if weight > 0}
+
+def _holdings(seat_range) -> dict[tuple[int, int], float]:
+    # a parsed range as is, anything else through parse_range
+    if isinstance(seat_range, dict) and all(isinstance(key, tuple) for key in seat_range):
+        return seat_range
+    return parse_range(seat_range)
+
+class _SeatRange:
+    # one seat's combos laid out for sampling with blocked combos skipped
+    def __init__(self, holdings: dict):
+        self.holdings = list(holdings)
+        self.weights = [holdings[holding] for holding in self.holdings]
+        self.cumulative = list(accumulate(self.weights))
+        self.total = self.cumulative[-1]
+        self.by_card = [[] for _ in range(NUMBER_OF_CARDS)]   # combo indexes holding each card
+        for index, (card_a, card_b) in enumerate(self.holdings):
+            self.by_card[card_a].append(index)
+            self.by_card[card_b].append(index)
+
+    def draw(self, used: set, rng) -> tuple[int, float] | None:
+        # a combo index drawn by weight among those not touching used, and
+        # the weight left to draw from; None when every combo is blocked
+        blocked_set = {index for card in used for index in self.by_card[card]}
+        blocked = sorted(blocked_set)
+        available = self.total - sum(self.weights[index] for index in blocked)
+        if available <= 1e-12 * self.total:
+            return None
+        target = rng.random() * available
+        for index in blocked:
+            # every blocked combo starting at or before target pushes it past its weight
+            if self.cumulative[index] - self.weights[index] <= target:
+                target += self.weights[index]
+            else:
+                break
+        index = min(bisect_right(self.cumulative, target), len(self.holdings) - 1)
+        if index in blocked_set:
+            # float rounding at the edge of a blocked interval
+            index = min((other for other in range(len(self.holdings)) if other not in blocked_set),
+                        key=lambda other: abs(other - index))
+        return index, available
+
+def _share_wins(strengths, weight, wins):
+    best = max(strengths)
+    winners = [seat for seat, strength in enumerate(strengths) if strength == best]
+    for seat in winners:
+        wins[seat] += weight / len(winners)
+
+def _exact(ranges, board, remaining):
+    wins = [0.0] * len(ranges)
+    total = 0.0
+    for extra in combinations(remaining, 5 - len(board)):
+        full_board = board + list(extra)
+        on_board = set(extra)
+        seats = [{holding: (weight, evaluate7(list(holding) + full_board)) for holding, weight in holdings.items()
+                  if holding[0] not in on_board and holding[1] not in on_board} for holdings in ranges]
+        for weight, strengths in _assignments(seats, 0, set()):
+            _share_wins(strengths, weight, wins)
+            total += weight
+    if total == 0:
+        raise ValueError("The ranges have no compatible holdings")
+    return [win_count / total for win_count in wins]
+
+def _assignments(seats, seat, used):
+    # every compatible holding per seat, as (weight product, strengths)
+    if seat == len(seats):
+        yield 1.0, []
+        return
+    for holding, (weight, strength) in seats[seat].items():
+        if holding[0] in used or holding[1] in used:
+            continue
+        for rest_weight, rest in _assignments(seats, seat + 1, used | set(holding)):
+            yield weight * rest_weight, [strength] + rest
+
+def _sampled(ranges, board, remaining, rounds, rng):
+    seats = [_SeatRange(holdings) for holdings in ranges]
+    missing = 5 - len(board)
+    wins = [0.0] * len(seats)
+    total = 0.0
+    for _ in range(rounds):
+        used = set()
+        hands = []
+        weight = 1.0
+        for seat in seats:
+            drawn = seat.draw(used, rng)
+            if drawn is None:
+                break
+            index, available = drawn
+            holding = seat.holdings[index]
+            used.update(holding)
+            hands.append(holding)
+            weight *= available
+        else:
+            extra = rng.sample([card for card in remaining if card not in used], missing)
+            full_board = board + extra
+            _share_wins([evaluate7(list(holding) + full_board) for holding in hands], weight, wins)
+            total += weight
+    if total == 0:
+        raise ValueError("The ranges have no compatible holdings")
+    return [win_count / total for win_count in wins]
+
+def range_equity(ranges, board=None, dead=None, rounds: int = 10000, exact: bool | None = None,
+                 seed=None) -> list[float]:
+    # share of the pot each seat wins with its range, ranges as shorthand or
+    # parsed dicts. exact None enumerates when that is within
+    # equity.EXACT_LIMIT deals and samples rounds deals otherwise.
+    ranges = [_holdings(seat_range) for seat_range in ranges]
+    board = [card.id for card in board or []]
+    known = set(board) | {card.id for card in dead or []}
+    ranges = [{holding: weight for holding, weight in holdings.items()
+               if holding[0] not in known and holding[1] not in known} for holdings in ranges]
+    if len(ranges) < 2 or not all(ranges):
+        raise ValueError("Every seat needs a range with a holding the board and dead cards allow")
+    remaining = [card for card in range(NUMBER_OF_CARDS) if card not in known]
+    size = comb(len(remaining), 5 - len(board)) * prod(len(holdings) for holdings in ranges)
+    if exact or exact is None and size <= EXACT_LIMIT:
+        if stats.ENABLED:
+            stats.count("ranges.exact")
+        return _exact(ranges, board, remaining)
+    if stats.ENABLED:
+        stats.count("ranges.rounds", rounds)
+    return _sampled(ranges, board, remaining, rounds, random.Random(seed))
@@ -0,0 +1,159 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from .history import HandHistoryWriter
+from .holdem import TexasHoldem
+from .player import Attitude
+
+# Plays complete TexasHoldem hands between AI seats with no console I/O,
+# spreading tables over worker processes:
+#
+#     python -m src.runner --tables 32 --hands 10000 --players 6 --workers 8
+
+# the default seats; Attitude.SEARCH spends a time budget on every decision
+AI_ATTITUDES = [attitude for attitude in Attitude if attitude not in (Attitude.PLAYER, Attitude.SEARCH)]
+
+@dataclass(frozen=True)
+class TableResult:
+    hands: int
+    net_chips: list[int]   # per seat, after subtracting every buy in
+    buy_ins: list[int]     # per seat, including the first
+
+@dataclass(frozen=True)
+class RunReport:
+    tables: int
+    hands: int
+    seconds: float
+    net_chips: list[int]   # per seat, summed over every table
+    buy_ins: list[int]
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        seats = "\n".join(f"\tSeat {seat}: {net:+d} chips over {buy_ins} buy ins"
+                          for seat, (net, buy_ins) in enumerate(zip(self.net_chips, self.buy_ins)))
+        return (f"{self.hands} hands on {self.tables} tables in {self.seconds:.2f}s "
+                f"({self.hands_per_second:.0f} hands/sec)\n{seats}")
+
+def play_table(number_of_players: int, hands: int, starting_chips: int = 500, big_blind: int = 10,
+               attitudes: list[Attitude] | None = None, seed: int | str | None = None,
+               history_path: str | None = None) -> TableResult:
+    # hands complete hands at one table; a player who busts buys back in for
+    # starting_chips. Every hand is appended to history_path when it is given.
+    attitudes = attitudes or [AI_ATTITUDES[seat % len(AI_ATTITUDES)] for seat in range(number_of_players)]
+    if Attitude.PLAYER in attitudes:
+        raise ValueError("Headless tables cannot seat Attitude.PLAYER")
+    game = TexasHoldem([f"Player {seat}" for seat in range(number_of_players)], starting_chips, big_blind,
+                       rng=random.Random(seed))
+    for player, attitude in zip(game.players, attitudes):
+        player.attitude = attitude
+    buy_ins = [1] * number_of_players
+    writer = HandHistoryWriter(history_path) if history_path else None
+    for _ in range(hands):
+        for seat, player in enumerate(game.players):
+            if player.chips < big_blind:
+                player.chips += starting_chips
+                buy_ins[seat] += 1
+        payouts = game.play_hand()
+        if writer:
+            writer.write_game(game, payouts)
+    if writer:
+        writer.close()
+    net_chips = [player.chips - starting_chips * buy_in for player, buy_in in zip(game.players, buy_ins)]
+    return TableResult(hands, net_chips, buy_ins)
+
+def run(tables: int = 8, hands: int = 1000, number_of_players: int = 6, starting_chips: int = 500,
+        big_blind: int = 10, attitudes: list[Attitude] | None = None, workers: int | None = None,
+        seed: int = 0, history_dir: str | None = None) -> RunReport:
+    # every table gets its own seed, so a run is repeatable for any number of
+    # workers. With history_dir each table logs to table_<n>.hh in it.
+    history_paths = [os.path.join(history_dir, f"table_{table}.hh") if history_dir else None for table in range(tables)]
+    arguments = [[number_of_players] * tables, [hands] * tables, [starting_chips] * tables,
+                 [big_blind] * tables, [attitudes] * tables, [f"{seed}:{table}" for table in range(tables)],
+                 history_paths]
+    start = time.perf_counter()
+    if workers is not None and workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(play_table, *arguments))
+    else:
+        results = [play_table(*table_arguments) for table_arguments in zip(*arguments)]
+    seconds = time.perf_counter() - start
+    return RunReport(tables, sum(result.hands for result in results), seconds,
+                     [sum(result.net_chips[seat] for result in results) for seat in range(number_of_players)],
+                     [sum(result.buy_ins[seat] for result in results) for seat in range(number_of_players)])
+
+def play_batched(policy, tables: int = 8, hands: int = 1000, number_of_players: int = 6,
+                 starting_chips: int = 500, big_blind: int = 10, seed: int = 0) -> RunReport:
+    # every seat of every table decided by policy. The tables run in lock
+    # step in this process: each pass collects the decision every table is
+    # waiting on into one DecisionBatch and sends the answers back.
+    from .policy import ACTIONS, DecisionBatch
+
+    games = [TexasHoldem([f"Player {seat}" for seat in range(number_of_players)], starting_chips, big_blind,
+                         rng=random.Random(f"{seed}:{table}")) for table in range(tables)]
+    buy_ins = [[1] * number_of_players for _ in range(tables)]
+    played = [0] * tables
+    steps = [None] * tables
+    pending = {}  # table -> seat waiting on an action
+
+    def advance(table, action=None):
+        # run table up to its next decision, starting new hands as they finish
+        game = games[table]
+        while True:
+            try:
+                if steps[table] is None:
+                    for seat, player in enumerate(game.players):
+                        if player.chips < big_blind:
+                            player.chips += starting_chips
+                            buy_ins[table][seat] += 1
+                    steps[table] = game.hand_steps()
+                    pending[table] = next(steps[table])
+                else:
+                    pending[table] = steps[table].send(action)
+                return
+            except StopIteration:
+                steps[table] = None
+                pending.pop(table, None)
+                played[table] += 1
+                if played[table] >= hands:
+                    return
+
+    start = time.perf_counter()
+    if hands > 0:
+        for table in range(tables):
+            advance(table)
+    while pending:
+        waiting = list(pending.items())
+        batch = DecisionBatch.from_games([(table, games[table], seat) for table, seat in waiting])
+        actions = batch.legal(policy.decide(batch))
+        for (table, _), code in zip(waiting, actions.tolist()):
+            advance(table, ACTIONS[code])
+    seconds = time.perf_counter() - start
+    net_chips = [[player.chips - starting_chips * buy_in for player, buy_in in zip(game.players, table_buy_ins)]
+                 for game, table_buy_ins in zip(games, buy_ins)]
+    return RunReport(tables, sum(played), seconds,
+                     [sum(table[seat] for table in net_chips) for seat in range(number_of_players)],
+                     [sum(table[seat] for table in buy_ins) for seat in range(number_of_players)])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play headless AI-only holdem tables")
+    parser.add_argument("--tables", type=int, default=8)
+    parser.add_argument("--hands", type=int, default=1000, help="hands per table")
+    parser.add_argument("--players", type=int, default=6, help="seats per table")
+    parser.add_argument("--chips", type=int, default=500, help="starting chips and buy in")
+    parser.add_argument("--big-blind", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--history-dir", default=None, help="write a binary hand history per table here")
+    args = parser.parse_args(argv)
+    print(run(args.tables, args.hands, args.players, args.chips, args.big_blind,
+              workers=args.workers, seed=args.seed, history_dir=args.history_dir))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import random
+import time
+from math import log, sqrt
+
+from . import stats
+from .player import PlayerActions
+
+# Decisions for Attitude.SEARCH seats: information set Monte Carlo search
+# over the seat's available actions. Every iteration restores the game from
+# one snapshot, redeals whatever the seat cannot see (opponent hole cards and
+# the rest of the deck), plays the candidate action and rolls the hand out
+# to the end with rollout_action for every seat. UCB1 spreads the iterations
+# over the candidates until time_budget runs out, and the action with the
+# best mean chip result is played. The game is left exactly as it was found.
+
+TIME_BUDGET = 0.05      # seconds per decision
+MAX_ITERATIONS = 2000
+EXPLORATION = 1.4
+
+def rollout_action(game, seat, rng):
+    # a cheap stand in for the other players: mostly calls, sometimes raises or folds
+    available = game.players[seat].available_actions(game)
+    roll = rng.random()
+    if roll < 0.1:
+        return PlayerActions.FOLD
+    if roll < 0.25 and PlayerActions.RAISE in available:
+        return PlayerActions.RAISE
+    return PlayerActions.CALL if PlayerActions.CALL in available else PlayerActions.FOLD
+
+def _determinize(game, seat, known, rng):
+    # one deal consistent with what seat can see
+    deck = game.deck
+    deck.rng = rng
+    deck.clear_dead()
+    deck.reset(shuffle=False)
+    deck.mark_dead(known)
+    deck.shuffle()
+    for other, player in enumerate(game.players):
+        if other != seat and player.cards:
+            player.cards = [deck.draw_card(), deck.draw_card()]
+
+def _play_out(game, seat, action, rng, rollout):
+    game.apply_action(seat, action)
+    steps = game.remaining_steps(seat)
+    try:
+        acting = next(steps)
+        while True:
+            acting = steps.send(rollout(game, acting, rng))
+    except StopIteration:
+        pass
+
+def search_action(game, seat, time_budget=None, max_iterations=None, exploration=EXPLORATION,
+                  rng=None, rollout=rollout_action):
+    # the action for seat with the best mean chip result over the rollouts;
+    # the budget and iteration cap default to the module settings
+    time_budget = TIME_BUDGET if time_budget is None else time_budget
+    max_iterations = MAX_ITERATIONS if max_iterations is None else max_iterations
+    player = game.players[seat]
+    available = player.available_actions(game)
+    if len(available) == 1:
+        return available[0]
+    rng = rng or random.Random()
+    known = [card.id for card in player.cards + game.board_cards]
+    start_chips = player.chips
+    scale = max(start_chips + game.pot, 1)  # rewards are kept near [-1, 1] for UCB1
+    visits = [0] * len(available)
+    totals = [0.0] * len(available)
+    snapshot = game.snapshot()
+    deadline = time.perf_counter() + time_budget
+    iterations = 0
+    try:
+        while iterations < max_iterations and (iterations < len(available) or time.perf_counter() < deadline):
+            if iterations < len(available):
+                choice = iterations
+            else:
+                bonus = exploration * sqrt(log(iterations))
+                choice = max(range(len(available)),
+                             key=lambda index: totals[index] / visits[index] + bonus / sqrt(visits[index]))
+            _determinize(game, seat, known, rng)
+            _play_out(game, seat, available[choice], rng, rollout)
+            visits[choice] += 1
+            totals[choice] += (player.chips - start_chips) / scale
+            iterations += 1
+            game.restore(snapshot)
+    finally:
+        game.restore(snapshot)
+    if stats.ENABLED:
+        stats.count("search.decisions")
+        stats.count("search.rollouts", iterations)
+    return available[max(range(len(available)), key=lambda index: totals[index] / visits[index] if visits[index] else -1)]
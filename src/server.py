@@ -0,0 +1,226 @@
+import argparse
+import asyncio
+import json
+import random
+
+from .holdem import TexasHoldem
+from .player import Attitude, fallback_action
+
+# Hosts many TexasHoldem tables on one asyncio event loop. Agents connect
+# over TCP or a Unix socket and speak newline delimited JSON:
+#
+#     agent  -> {"type": "join", "name": "bot-1"}
+#     server -> {"type": "seated", "table": 0, "seat": 3}
+#     server -> {"type": "action", "id": 17, "hand": 5, "street": 1, "cards": ["AS", "KD"],
+#                "board": ["2C", "7H", "9S"], "pot": 60, "chips": 480, "available": ["Fold", "Call"]}
+#     agent  -> {"id": 17, "action": "Call"}
+#     server -> {"type": "result", "hand": 5, "board": [...], "payouts": [...], "chips": [...]}
+#     server -> {"type": "done", "chips": [...]}
+#
+# An agent that does not answer within action_timeout, answers with an
+# action that is not available or disconnects checks if it can and folds
+# otherwise. Seats are filled in join order and a table starts once full.
+#
+#     python -m src.server --port 9999 --seats 6 --hands 1000
+
+def parse_action(reply, available):
+    # the PlayerActions an agent asked for, or None if it is not available
+    name = str(reply.get("action", "")).lower()
+    for action in available:
+        if action.value.lower() == name:
+            return action
+    return None
+
+class LocalAgent:
+    # an in process seat deciding with Player.ai_action
+    def __init__(self, name):
+        self.name = name
+
+    async def decide(self, game, seat, request, timeout):
+        return game.players[seat].ai_action(game)
+
+    async def send(self, message):
+        pass
+
+class RemoteAgent:
+    def __init__(self, name, reader, writer):
+        self.name = name
+        self.reader = reader
+        self.writer = writer
+        self.connected = True
+
+    async def send(self, message):
+        if not self.connected:
+            return
+        try:
+            self.writer.write(json.dumps(message).encode() + b"\n")
+            await self.writer.drain()
+        except (ConnectionError, RuntimeError):
+            self.connected = False
+
+    async def decide(self, game, seat, request, timeout):
+        await self.send(request)
+        available = game.players[seat].available_actions(game)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.connected:
+            try:
+                line = await asyncio.wait_for(self.reader.readline(), deadline - loop.time())
+            except asyncio.TimeoutError:
+                return None
+            if not line:
+                self.connected = False
+                break
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                return None
+            # replies to requests that already timed out are dropped
+            if isinstance(reply, dict) and reply.get("id") == request["id"]:
+                return parse_action(reply, available)
+        return None
+
+    def close(self):
+        if self.connected:
+            self.connected = False
+            self.writer.close()
+
+class AsyncTable:
+    def __init__(self, table_id, agents, starting_chips=500, big_blind=10, action_timeout=5.0, seed=None):
+        self.table_id = table_id
+        self.agents = agents
+        self.action_timeout = action_timeout
+        self.game = TexasHoldem([agent.name for agent in agents], starting_chips, big_blind, rng=random.Random(seed))
+        for player in self.game.players:
+            player.attitude = Attitude.PASSIVE
+        self._request_id = 0
+
+    def _request(self, seat):
+        game = self.game
+        player = game.players[seat]
+        self._request_id += 1
+        return {
+            "type": "action", "id": self._request_id, "hand": game.hand_number, "street": game.street(),
+            "cards": [card.to_string() for card in player.cards],
+            "board": [card.to_string() for card in game.board_cards],
+            "pot": game.pot, "chips": player.chips,
+            "available": [str(action) for action in player.available_actions(game)],
+        }
+
+    async def play_hand(self):
+        # drives TexasHoldem.hand_steps, awaiting every decision
+        game = self.game
+        steps = game.hand_steps()
+        try:
+            seat = next(steps)
+            while True:
+                available = game.players[seat].available_actions(game)
+                action = await self.agents[seat].decide(game, seat, self._request(seat), self.action_timeout)
+                seat = steps.send(action if action in available else fallback_action(available))
+        except StopIteration as finished:
+            payouts = finished.value
+        await self._broadcast({"type": "result", "hand": game.hand_number,
+                               "board": [card.to_string() for card in game.board_cards], "payouts": payouts,
+                               "chips": [player.chips for player in game.players]})
+        return payouts
+
+    async def play(self, hands=None):
+        # hands complete hands, or until fewer than two players have chips
+        played = 0
+        while hands is None or played < hands:
+            if sum(player.chips > 0 for player in self.game.players) < 2:
+                break
+            await self.play_hand()
+            played += 1
+        await self._broadcast({"type": "done", "chips": [player.chips for player in self.game.players]})
+        for agent in self.agents:
+            if isinstance(agent, RemoteAgent):
+                agent.close()
+        return played
+
+    async def _broadcast(self, message):
+        await asyncio.gather(*(agent.send(message) for agent in self.agents))
+
+class TableServer:
+    def __init__(self, seats=6, hands=None, starting_chips=500, big_blind=10, action_timeout=5.0, seed=0):
+        self.seats = seats
+        self.hands = hands
+        self.starting_chips = starting_chips
+        self.big_blind = big_blind
+        self.action_timeout = action_timeout
+        self.seed = seed
+        self.tables = []       # AsyncTable per started table
+        self.table_tasks = []
+        self._waiting = []     # agents seated at the table being filled
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        self._server = await asyncio.start_server(self._handle_agent, host, port)
+        return self._server.sockets[0].getsockname()
+
+    async def start_unix(self, path):
+        self._server = await asyncio.start_unix_server(self._handle_agent, path)
+        return path
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self.table_tasks:
+            task.cancel()
+
+    async def _handle_agent(self, reader, writer):
+        try:
+            line = await asyncio.wait_for(reader.readline(), self.action_timeout)
+            message = json.loads(line)
+        except (asyncio.TimeoutError, ValueError):
+            writer.close()
+            return
+        if not isinstance(message, dict) or message.get("type") != "join":
+            writer.close()
+            return
+        agent = RemoteAgent(str(message.get("name", f"agent-{len(self._waiting)}")), reader, writer)
+        seated = {"type": "seated", "table": len(self.tables), "seat": len(self._waiting)}
+        self.seat_agent(agent)
+        await agent.send(seated)
+
+    def seat_agent(self, agent):
+        # add a local or remote agent to the table being filled, starting it once full
+        self._waiting.append(agent)
+        if len(self._waiting) == self.seats:
+            self._start_table()
+
+    def _start_table(self):
+        table = AsyncTable(len(self.tables), self._waiting, self.starting_chips, self.big_blind,
+                           self.action_timeout, seed=f"{self.seed}:{len(self.tables)}")
+        self._waiting = []
+        self.tables.append(table)
+        self.table_tasks.append(asyncio.create_task(table.play(self.hands)))
+
+async def serve(host, port, unix_path, **table_options):
+    server = TableServer(**table_options)
+    if unix_path:
+        await server.start_unix(unix_path)
+    else:
+        await server.start(host, port)
+    await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host holdem tables for remote agents")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9999)
+    parser.add_argument("--unix", default=None, help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--seats", type=int, default=6, help="agents per table")
+    parser.add_argument("--hands", type=int, default=None, help="hands per table, unlimited by default")
+    parser.add_argument("--chips", type=int, default=500)
+    parser.add_argument("--big-blind", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=5.0, help="seconds an agent has to act")
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.host, args.port, args.unix, seats=args.seats, hands=args.hands,
+                      starting_chips=args.chips, big_blind=args.big_blind, action_timeout=args.timeout))
+
+if __name__ == "__main__":
+    main()
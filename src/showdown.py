@@ -0,0 +1,52 @@
+# Showdown resolution on integer strengths and integer chips. Seats are
+# indexes into the table; a strength of None marks a folded seat, which can
+# still have chips in the pot but is never paid.
+
+def best_seats(strengths, seats=None) -> list[int]:
+    # seats sharing the highest strength in one pass, optionally limited to seats
+    best = None
+    winners = []
+    for seat in range(len(strengths)) if seats is None else seats:
+        strength = strengths[seat]
+        if strength is None:
+            continue
+        if best is None or strength > best:
+            best = strength
+            winners = [seat]
+        elif strength == best:
+            winners.append(seat)
+    return winners
+
+def side_pots(contributions) -> list[tuple[int, list[int]]]:
+    # (amount, contributing seats) for the main pot and then every side pot
+    pots = []
+    previous = 0
+    for level in sorted(set(contribution for contribution in contributions if contribution > 0)):
+        contributors = [seat for seat, contribution in enumerate(contributions) if contribution >= level]
+        pots.append(((level - previous) * len(contributors), contributors))
+        previous = level
+    return pots
+
+def split(amount: int, winners: list[int], button: int, number_of_seats: int) -> dict[int, int]:
+    # equal integer shares, odd chips one each to the winners closest to the left of the button
+    share, odd_chips = divmod(amount, len(winners))
+    ordered = sorted(winners, key=lambda seat: (seat - button - 1) % number_of_seats)
+    return {seat: share + (1 if place < odd_chips else 0) for place, seat in enumerate(ordered)}
+
+def resolve(strengths, contributions, dead_money: int = 0, button: int = 0) -> list[int]:
+    # chips paid to every seat. dead_money is pot money no seat is credited
+    # with and joins the main pot; a side pot with no live seat in it is an
+    # uncalled bet and goes back to the seats that put it in.
+    number_of_seats = len(strengths)
+    payouts = [0] * number_of_seats
+    pots = side_pots(contributions)
+    if dead_money:
+        if pots:
+            pots[0] = (pots[0][0] + dead_money, pots[0][1])
+        else:
+            pots = [(dead_money, list(range(number_of_seats)))]
+    for amount, contributors in pots:
+        winners = best_seats(strengths, contributors) or contributors
+        for seat, chips in split(amount, winners, button, number_of_seats).items():
+            payouts[seat] += chips
+    return payouts
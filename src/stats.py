@@ -0,0 +1,85 @@
+import atexit
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from functools import wraps
+
+# Optional hot path counters and phase timings. Everything is off unless
+# HOLDEM_STATS is set or enable() is called; call sites guard on ENABLED so
+# a disabled build pays one attribute check per instrumented call.
+#
+#     HOLDEM_STATS=1 python app.py              profile printed to stderr at exit
+#     HOLDEM_STATS=profile.json python app.py   profile written as JSON at exit
+#
+# Counts are per process; simulate counts rounds in the calling process and
+# its chunks send their deal and evaluate times back, so worker pools are
+# still covered.
+ENV_VAR = "HOLDEM_STATS"
+
+ENABLED = os.environ.get(ENV_VAR, "") not in ("", "0")
+
+counters = Counter()
+timings = defaultdict(float)   # seconds per phase
+calls = Counter()              # timed calls per phase
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+def reset():
+    counters.clear()
+    timings.clear()
+    calls.clear()
+
+def count(name: str, amount: int = 1):
+    counters[name] += amount
+
+def add_time(phase: str, seconds: float):
+    timings[phase] += seconds
+    calls[phase] += 1
+
+def timed(phase: str):
+    # decorator adding the wrapped call's wall time to phase while enabled
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                add_time(phase, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+def snapshot() -> dict:
+    return {
+        "counters": dict(counters),
+        "timings": {phase: {"seconds": seconds, "calls": calls[phase]} for phase, seconds in timings.items()},
+    }
+
+def report() -> str:
+    lines = ["holdem stats"]
+    for name, value in sorted(counters.items()):
+        lines.append(f"\t{name:28} {value:>14,}")
+    for phase, seconds in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+        lines.append(f"\t{phase:28} {seconds:>13.4f}s over {calls[phase]:,} calls")
+    return "\n".join(lines)
+
+def _dump():
+    target = os.environ.get(ENV_VAR, "")
+    if target in ("1", "stderr", "true"):
+        print(report(), file=sys.stderr)
+    else:
+        with open(target, "w") as profile_file:
+            json.dump(snapshot(), profile_file, indent=2)
+
+if ENABLED:
+    atexit.register(_dump)
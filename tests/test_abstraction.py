@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+
+from src.card import Card
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from src import abstraction
+    from src.abstraction import build_buckets, kmeans_emd
+    from src.indexer import index
+
+def cards(text):
+    return [Card.from_string(card) for card in text.split()]
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestAbstraction(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "buckets.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_preflop_buckets_order_hands_by_strength(self):
+        table = build_buckets(0, 8, self.path, runouts=256, seed=1)
+        try:
+            assert len(table) == 169, "Every starting hand should be stored"
+            assert os.path.getsize(self.path) == abstraction.HEADER.size + 2 * 169, \
+                "A whole street should be stored as a flat array"
+            aces = table.bucket(cards("Ah As"), [])
+            trash = table.bucket(cards("7c 2d"), [])
+            assert aces == 7 and trash < aces, "Aces should land in the strongest bucket"
+            assert table.bucket(cards("Kd Qd"), []) == table.bucket(cards("Ks Qs"), []), \
+                "Suit isomorphic hands should share a bucket"
+        finally:
+            table.close()
+
+    def test_flop_subset_and_ehs2_feature(self):
+        states = [index(cards(hole), cards("Qh Jh 2c")) for hole in ("Ah Kh", "Ah Kc", "Qs Qd", "7s 3d", "2h 2d", "9c 8c")]
+        table = build_buckets(1, 3, self.path, feature="ehs2", runouts=128, states=states)
+        try:
+            assert len(table) == len(states), "Only the given states should be stored"
+            assert table.bucket(cards("7s 3d"), cards("Qh Jh 2c")) == 0, "Air should be in the weakest bucket"
+            assert table.bucket(cards("Qs Qd"), cards("Qh Jh 2c")) == 2, "A set should be in the strongest bucket"
+            with self.assertRaises(KeyError):
+                table.bucket(cards("5s 4s"), cards("Qh Jh 2c"))
+            with self.assertRaises(ValueError):
+                table.bucket(cards("5s 4s"), cards("Qh Jh 2c 3d"))
+        finally:
+            table.close()
+        with self.assertRaises(ValueError):
+            build_buckets(1, 3, self.path, feature="equity", states=states)
+
+    def test_resumes_from_checkpoint(self):
+        checkpoint = os.path.join(self.directory.name, "checkpoint")
+        calls = []
+        original = abstraction._chunk_features
+
+        def counting(*args):
+            calls.append(args[6])
+            return original(*args)
+
+        abstraction._chunk_features = counting
+        try:
+            build_buckets(0, 4, self.path, checkpoint_dir=checkpoint, chunk_size=50, runouts=32).close()
+            assert calls == [0, 1, 2, 3], "Every chunk should be computed on the first run"
+            os.remove(os.path.join(checkpoint, "features_2.npz"))
+            calls.clear()
+            first = open(self.path, "rb").read()
+            build_buckets(0, 4, self.path, checkpoint_dir=checkpoint, chunk_size=50, runouts=32).close()
+            assert calls == [2], "Only the missing chunk should be recomputed"
+            assert open(self.path, "rb").read() == first, "A resumed build should match the original"
+        finally:
+            abstraction._chunk_features = original
+        with self.assertRaises(ValueError):
+            build_buckets(0, 4, self.path, checkpoint_dir=checkpoint, chunk_size=50, runouts=64)
+        with self.assertRaises(ValueError):
+            build_buckets(0, 4, self.path, checkpoint_dir=checkpoint, chunk_size=50, runouts=32, states=range(100))
+        with self.assertRaises(ValueError):
+            build_buckets(1, 4, self.path, checkpoint_dir=checkpoint, chunk_size=50, runouts=32, states=range(169))
+
+    def test_kmeans_emd_separates_shifted_histograms(self):
+        rng = np.random.default_rng(3)
+        weak = np.zeros((40, 10))
+        weak[np.arange(40), rng.integers(0, 3, 40)] = 1
+        strong = np.zeros((40, 10))
+        strong[np.arange(40), rng.integers(7, 10, 40)] = 1
+        centroids, buckets = kmeans_emd(np.vstack([strong, weak]), 2, seed=5)
+        assert (buckets[:40] == 1).all() and (buckets[40:] == 0).all(), "Clusters should split weak from strong"
+        assert np.allclose(centroids.sum(axis=1), 1), "Centroids should stay histograms"
+        _, small_blocks = kmeans_emd(np.vstack([strong, weak]), 2, seed=5, memory=8 * 2 * 10 * 3)
+        assert (small_blocks == buckets).all(), "Block size changed the clustering"
+
+if __name__ == "__main__":
+    unittest.main()
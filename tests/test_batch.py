@@ -0,0 +1,84 @@
+import random
+import unittest
+
+from src import evaluator
+from src.card import Card
+from src.deck import Deck
+from src.hand import Hand
+from src.holdem import TexasHoldem
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from src.batch import deal_many, equity_many, evaluate_with
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatchEvaluation(unittest.TestCase):
+
+    def test_matches_single_hand_evaluation(self):
+        rng = random.Random(7)
+        for size in (5, 6, 7):
+            hands = [rng.sample(range(52), size) for _ in range(2000)]
+            strengths = Hand.score_many(np.array(hands))
+            expected = [evaluator.evaluate(hand) for hand in hands]
+            assert strengths.tolist() == expected, f"Batch strengths differ for {size} cards"
+
+    def test_flushes_and_straights(self):
+        hands = [[48, 44, 40, 36, 32, 0, 5],   # royal flush in hearts
+                 [48, 1, 6, 11, 12, 30, 41],  # wheel
+                 [48, 40, 28, 20, 4, 45, 2]]  # ace high flush
+        strengths = Hand.score_many(np.array(hands))
+        categories = [evaluator.category_of(strength) for strength in strengths.tolist()]
+        assert categories == [evaluator.ROYAL_FLUSH, evaluator.STRAIGHT, evaluator.FLUSH], "Categories were wrong"
+
+    def test_rejects_bad_shapes(self):
+        with self.assertRaises(ValueError):
+            Hand.score_many(np.zeros((3, 4), dtype=np.int64))
+
+    def test_evaluate_with_a_fixed_base(self):
+        rng = random.Random(11)
+        for base_size, extra_size in ((3, 2), (5, 2), (4, 1), (6, 1)):
+            base = rng.sample(range(52), base_size)
+            rest = [card for card in range(52) if card not in base]
+            extras = [rng.sample(rest, extra_size) for _ in range(500)]
+            expected = [evaluator.evaluate(base + extra) for extra in extras]
+            assert evaluate_with(base, np.array(extras)).tolist() == expected, f"Wrong strengths for {base_size} base cards"
+        flush_base = [48, 44, 40]   # ace, king and queen of hearts
+        assert evaluate_with(flush_base, np.array([[36, 32], [0, 4]])).tolist() == \
+            [evaluator.evaluate(flush_base + [36, 32]), evaluator.evaluate(flush_base + [0, 4])], "Flushes were missed"
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestDealMany(unittest.TestCase):
+
+    def test_deals_are_valid_and_skip_dead_cards(self):
+        deals = deal_many(2000, 9, dead=[0, 51], rng=1)
+        assert deals.shape == (2000, 9) and deals.dtype == np.int64, "Unexpected deal array"
+        assert all(len(set(row)) == 9 for row in deals.tolist()), "A deal repeated a card"
+        assert not np.isin(deals, [0, 51]).any(), "Dead cards were dealt"
+
+    def test_every_card_and_position_is_equally_likely(self):
+        deals = deal_many(100000, 3, rng=2)
+        for position in range(3):
+            counts = np.bincount(deals[:, position], minlength=52)
+            assert abs(counts / 100000 * 52 - 1).max() < 0.06, "Deals were not uniform"
+
+    def test_seeded_deals_repeat(self):
+        assert (deal_many(50, 7, rng=5) == deal_many(50, 7, rng=np.random.default_rng(5))).all(), \
+            "Same seed dealt differently"
+
+    def test_deck_deals_from_what_is_left(self):
+        deck = Deck(random.Random(0))
+        drawn = [deck.draw_card().id for _ in range(10)]
+        assert not np.isin(deck.deal_many(500, 5, seed=1), drawn).any(), "Drawn cards were dealt again"
+
+    def test_vectorized_equity_matches_simulate(self):
+        hand = Card.cards_from_strings(["AS", "KS"])
+        rates = equity_many([card.id for card in hand], [], 3, 60000, rng=3)
+        expected = TexasHoldem(["Alice"]).simulate(hand, 3, 60000, exact=False, seed=3)
+        assert max(abs(rate - other) for rate, other in zip(rates, expected)) < 0.015, "Vectorized equity differs"
+
+if __name__ == '__main__':
+    unittest.main()
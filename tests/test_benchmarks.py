@@ -0,0 +1,19 @@
+import unittest
+
+from benchmarks import run
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_compare_flags_regressions(self):
+        baseline = {"fast": 100.0, "slow": 100.0}
+        results = {"fast": 110.0, "slow": 130.0, "new": 5.0}
+        assert run.compare(results, baseline, 0.25) == ["slow"], "Regression was not flagged"
+
+    def test_every_benchmark_runs(self):
+        for name, setup in run.BENCHMARKS.items():
+            function, operations = setup()
+            function()
+            assert operations > 0, f"{name} did not report its operations"
+
+if __name__ == '__main__':
+    unittest.main()
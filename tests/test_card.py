@@ -0,0 +1,57 @@
+import pickle
+import unittest
+
+from src.card import Card, Rank, Suit, CARDS
+from src.deck import Deck
+
+class TestCard(unittest.TestCase):
+
+    def test_cards_are_interned(self):
+        assert Card(Rank.ACE, Suit.SPADES) is Card.from_string("AS"), "Cards were not interned"
+        assert Card.from_string("10h") is Card(Rank.TEN, Suit.HEARTS), "Numeric rank was not parsed"
+        assert pickle.loads(pickle.dumps(CARDS[7])) is CARDS[7], "Unpickled card was not interned"
+
+    def test_card_ids(self):
+        assert len({card.id for card in CARDS}) == 52, "Card ids were not unique"
+        card = Card.from_string("QD")
+        assert card.rank == Rank.QUEEN and card.suit == Suit.DIAMONDS, "Card id decoded wrong"
+        assert Card.from_int(int(card)) is card, "Card did not round trip through int"
+
+    def test_legacy_rank_letters(self):
+        # first-letter parsing maps F to five and S to seven
+        assert Card.from_string("FC").rank == Rank.FIVE, "F was not five"
+        assert Card.from_string("SC").rank == Rank.SEVEN, "S was not seven"
+
+    def test_deck_draws_cards(self):
+        deck = Deck()
+        card = deck.draw_specific_card(Rank.TWO, Suit.CLUBS)
+        assert card is Card(Rank.TWO, Suit.CLUBS), "Specific card was not drawn"
+        assert len(deck) == 51, "Deck did not shrink"
+        assert deck.draw_specific_card(Rank.TWO, Suit.CLUBS) is None, "Card was drawn twice"
+        assert isinstance(deck.draw_card(), Card), "Deck did not return a Card"
+
+    def test_deck_refuses_to_overdraw(self):
+        deck = Deck()
+        deck.mark_dead(range(40))
+        with self.assertRaises(ValueError):
+            deck.draw_card_ids(13)
+        assert len(set(deck.draw_card_ids(12))) == 12 and len(deck) == 0, "Every live card should be drawable"
+
+    def test_deck_reset_keeps_dead_cards_out(self):
+        deck = Deck()
+        dead = [Card.from_string("AS").id, Card.from_string("KD").id]
+        deck.mark_dead(dead)
+        assert len(deck) == 50, "Dead cards were still in the deck"
+        drawn = deck.draw_card_ids(10)
+        assert len(set(drawn)) == 10 and not set(drawn) & set(dead), "Drawn cards repeated or were dead"
+        deck.reset(shuffle=False)
+        assert len(deck) == 50, "Reset did not return the drawn cards"
+        assert deck.draw_specific_card(Rank.ACE, Suit.SPADES) is None, "Dead card came back on reset"
+        assert deck.dead == (1 << dead[0]) | (1 << dead[1]), "Dead mask was wrong"
+        deck.clear_dead()
+        deck.reset()
+        assert len(deck) == 52 and deck.dead == 0, "Clearing dead cards did not restore them"
+        assert sorted(card.id for card in deck.cards) == list(range(52)), "Deck lost or repeated cards"
+
+if __name__ == '__main__':
+    unittest.main()
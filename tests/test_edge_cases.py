@@ -1,6 +1,8 @@
 import unittest
 
+from src.card import Card
 from src.hand import Hand, PokerScore, PokerHands
+from src.holdem import TexasHoldem
 
 # Your test cases will go here
 class TestHoldemEdgeCases(unittest.TestCase):
@@ -11,5 +13,20 @@ class TestHoldemEdgeCases(unittest.TestCase):
         hand_2 = Hand.from_strings(["KS", "QC"] + common_cards)
         assert hand_1 > hand_2, "Ace did not beat vs King"
 
+    def test_six_and_seven_cards_match_five(self):
+        six = Hand.from_strings(["AS", "KS", "QS", "JS", "9S", "TD"])
+        assert six.score_hand().hand == PokerHands.FLUSH, "Six card flush was not found"
+        seven = Hand.from_strings(["9S", "9H", "9D", "4C", "4S", "4H", "AS"])
+        assert seven.score_hand().hand == PokerHands.FULL_HOUSE, "Seven card full house was not found"
+        assert seven.score_hand().tie_breaker == 9, "Full house did not keep the best trips"
+
+    def test_board_plays_for_everyone(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        game.board_cards = Card.cards_from_strings(["AS", "KS", "QS", "JS", "TS"])
+        game.players[0].cards = Card.cards_from_strings(["2C", "3D"])
+        game.players[1].cards = Card.cards_from_strings(["4C", "5D"])
+        winners = game.determine_winner()
+        assert [winner[0] for winner in winners] == ["Alice", "Bob"], "Royal flush on board was not split"
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
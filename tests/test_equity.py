@@ -0,0 +1,99 @@
+import unittest
+from unittest import mock
+
+from src import equity
+from src.card import Card
+from src.holdem import TexasHoldem
+
+def ids(card_strings):
+    return [card.id for card in Card.cards_from_strings(card_strings)]
+
+class TestExactEquity(unittest.TestCase):
+
+    def test_isomorphic_runouts_match_full_enumeration(self):
+        hole = ids(["AS", "AH"])
+        board = ids(["KC", "KD", "2S", "2H"])
+        assert len(equity.suit_symmetries(hole + board)) == 4, "Suit swaps were not found"
+        collapsed = equity.exact_equity(hole, board, 2)
+        with mock.patch.object(equity, "suit_symmetries", return_value=[(0, 1, 2, 3)]):
+            full = equity.exact_equity(hole, board, 2)
+        for collapsed_share, full_share in zip(collapsed, full):
+            self.assertAlmostEqual(collapsed_share, full_share)
+
+    def test_nuts_on_the_river(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        hand = Card.cards_from_strings(["AS", "KS"])
+        board = Card.cards_from_strings(["QS", "JS", "TS", "2D", "3C"])
+        assert game.simulate(hand, 3, board=board) == [1.0, 0.0, 0.0], "Royal flush did not win every deal"
+
+    def test_auto_mode_falls_back_to_sampling(self):
+        assert equity.exact_size(2, 0, 2) > equity.EXACT_LIMIT, "Preflop was small enough to enumerate"
+        assert equity.exact_size(6, 4, 2) <= equity.EXACT_LIMIT, "Turn heads up was too large to enumerate"
+        game = TexasHoldem(["Alice", "Bob"])
+        with mock.patch.object(equity, "exact_equity") as exact_equity:
+            rates = game.simulate(Card.cards_from_strings(["AS", "KS"]), 2, number_of_rounds=20,
+                                  board=Card.cards_from_strings(["2D", "7C", "9H"]))
+        exact_equity.assert_not_called()
+        self.assertAlmostEqual(sum(rates), 1.0)
+
+class TestParallelSimulate(unittest.TestCase):
+
+    def test_seeded_runs_match_across_workers(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        hand = Card.cards_from_strings(["9S", "9H"])
+        single = game.simulate(hand, 3, number_of_rounds=600, exact=False, seed=42)
+        parallel = game.simulate(hand, 3, number_of_rounds=600, exact=False, seed=42, workers=2)
+        assert single == parallel, "Parallel run differed from the single process run"
+        other = game.simulate(hand, 3, number_of_rounds=600, exact=False, seed=43)
+        assert single != other, "Different seeds gave the same deals"
+
+class TestStreamingSimulate(unittest.TestCase):
+
+    def test_stops_at_tolerance(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        hand = Card.cards_from_strings(["AS", "AH"])
+        estimates = list(game.simulate_stream(hand, 2, tolerance=0.05, seed=1, exact=False))
+        assert estimates[-1].converged(0.05), "Stream stopped before converging"
+        assert not any(estimate.converged(0.05) for estimate in estimates[:-1]), "Stream kept going after converging"
+        assert estimates[-1].rates[0] > 0.75, "Aces were not a favourite"
+
+    def test_matches_simulate_with_the_same_seed(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        hand = Card.cards_from_strings(["7S", "2H"])
+        estimates = list(game.simulate_stream(hand, 3, tolerance=0.0, max_rounds=500, seed=5, exact=False))
+        assert [estimate.rounds for estimate in estimates] == [250, 500], "Stream did not stop at max_rounds"
+        assert estimates[-1].rates == game.simulate(hand, 3, number_of_rounds=500, seed=5, exact=False), "Stream and simulate differ"
+
+    def test_rejects_more_players_than_the_deck_holds(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        hand = Card.cards_from_strings(["AS", "KD"])
+        for exact in (None, False, True):
+            with self.assertRaises(ValueError):
+                game.simulate(hand, 25, exact=exact)
+        with self.assertRaises(ValueError):
+            next(game.simulate_stream(hand, 25, exact=False))
+        assert len(game.simulate(hand, 23, number_of_rounds=50, exact=False)) == 23, "A full deck should still deal"
+
+    def test_rejects_empty_max_rounds(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        hand = Card.cards_from_strings(["7S", "2H"])
+        with self.assertRaises(ValueError):
+            next(game.simulate_stream(hand, 3, max_rounds=0, exact=False))
+
+    def test_small_spots_are_exact(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        hand = Card.cards_from_strings(["AS", "KS"])
+        board = Card.cards_from_strings(["QS", "JS", "TS", "2D", "3C"])
+        estimates = list(game.simulate_stream(hand, 2, board=board))
+        assert len(estimates) == 1 and estimates[0].standard_errors == [0.0, 0.0], "River was not enumerated"
+
+    def test_exact_true_enumerates_once(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        hand = Card.cards_from_strings(["AS", "KD"])
+        board = Card.cards_from_strings(["2C", "7H", "9S", "TD"])
+        estimates = list(game.simulate_stream(hand, 2, board=board, tolerance=0.0, exact=True))
+        assert len(estimates) == 1 and estimates[0].rounds == 0, "exact=True fell back to sampling"
+        assert estimates[0].rates == game.simulate(hand, 2, board=board, exact=True), "Stream and simulate differ"
+
+if __name__ == '__main__':
+    unittest.main()
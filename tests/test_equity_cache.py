@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import equity
+from src.card import Card
+from src.equity_cache import EquityCache
+from src.holdem import TexasHoldem
+
+class TestEquityCache(unittest.TestCase):
+
+    def test_suit_relabellings_share_a_key(self):
+        hearts = EquityCache.key(Card.cards_from_strings(["AH", "KH"]), Card.cards_from_strings(["QH", "JH", "2C"]), 3)
+        spades = EquityCache.key(Card.cards_from_strings(["KS", "AS"]), Card.cards_from_strings(["2D", "QS", "JS"]), 3)
+        offsuit = EquityCache.key(Card.cards_from_strings(["AH", "KS"]), Card.cards_from_strings(["QH", "JH", "2C"]), 3)
+        assert hearts == spades, "Suit relabelling changed the key"
+        assert hearts != offsuit, "Different spots shared a key"
+
+    def test_simulate_reuses_isomorphic_spots(self):
+        game = TexasHoldem(["Alice"], equity_cache=EquityCache())
+        first = game.simulate(Card.cards_from_strings(["AH", "KH"]), 4, number_of_rounds=500, exact=False)
+        with mock.patch("src.holdem._simulate_chunk") as simulate_chunk:
+            again = game.simulate(Card.cards_from_strings(["AD", "KD"]), 4, number_of_rounds=300, exact=False)
+        simulate_chunk.assert_not_called()
+        assert again == first, "Cached rates were not returned"
+        more = game.simulate(Card.cards_from_strings(["AD", "KD"]), 4, number_of_rounds=750, exact=False)
+        assert more != first, "Entry sampled from fewer rounds answered a larger request"
+
+    def test_dead_cards_are_part_of_the_key(self):
+        game = TexasHoldem(["Alice"], equity_cache=EquityCache())
+        hand = Card.cards_from_strings(["AH", "KH"])
+        board = Card.cards_from_strings(["QH", "JH", "2C", "3D"])
+        live = game.simulate(hand, 2, board=board)
+        dead = game.simulate(hand, 2, board=board, dead=Card.cards_from_strings(["TH"]))
+        expected = equity.exact_equity([card.id for card in hand], [card.id for card in board], 2, [Card.from_string("TH").id])
+        assert dead == expected and dead != live, "Dead card was ignored"
+
+    def test_lru_evicts_the_oldest_entry(self):
+        cache = EquityCache(maxsize=2)
+        cache.put("a", [1.0], None)
+        cache.put("b", [0.5], None)
+        cache.get("a", None)
+        cache.put("c", [0.25], None)
+        assert len(cache) == 2 and cache.get("b", None) is None, "Least recently used entry was kept"
+        assert cache.get("a", None) == [1.0], "Recently used entry was evicted"
+
+    def test_disk_store_survives_restarts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "equity.sqlite")
+            hand = Card.cards_from_strings(["7S", "7C"])
+            board = Card.cards_from_strings(["2H", "9D", "KS"])
+            with EquityCache(path=path) as cache:
+                rates = TexasHoldem(["Alice"], equity_cache=cache).simulate(hand, 3, 500, board=board, exact=False)
+            with EquityCache(path=path) as cache:
+                game = TexasHoldem(["Alice"], equity_cache=cache)
+                with mock.patch("src.holdem._simulate_chunk") as simulate_chunk:
+                    again = game.simulate(Card.cards_from_strings(["7H", "7D"]), 3, 500,
+                                          board=Card.cards_from_strings(["2S", "9C", "KH"]), exact=False)
+                simulate_chunk.assert_not_called()
+            assert again == rates, "Stored rates were not read back"
+
+if __name__ == '__main__':
+    unittest.main()
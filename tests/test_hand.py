@@ -1,5 +1,6 @@
 import unittest
 
+from src.card import Card
 from src.hand import Hand, PokerScore, PokerHands
 
 # Your test cases will go here
@@ -114,5 +115,50 @@ class TestHoldemHand(unittest.TestCase):
         assert score.hand == PokerHands.TWO_PAIR_EIGHTS_HIGH, "Hand was not scored correctly"
         assert score.tie_breaker == 14, "Tie breaker was not 14"
 
+    def test_kickers_break_ties(self):
+        common_cards = ["AD", "AH", "7S", "8C", "2D"]
+        hand_1 = Hand.from_strings(["KS", "3C"] + common_cards)
+        hand_2 = Hand.from_strings(["KC", "4C"] + common_cards)
+        assert hand_1 == hand_2, "Unplayed kicker changed the result"
+        hand_3 = Hand.from_strings(["QS", "JC"] + common_cards)
+        assert hand_1 > hand_3, "King kicker did not beat queen kicker"
+
+    def test_wheel_loses_to_six_high_straight(self):
+        wheel = Hand.from_strings(["AS", "2C", "3D", "4H", "5S"])
+        six_high = Hand.from_strings(["6S", "2C", "3D", "4H", "5S"])
+        assert wheel < six_high, "Wheel beat a six high straight"
+        assert wheel.score_hand().hand == PokerHands.STRAIGHT, "Wheel was not a straight"
+
+    def test_score_from_strength(self):
+        hand = Hand.from_strings(["QS", "QD", "QC", "4H", "4S", "2D", "9C"])
+        strength = hand.evaluate()
+        score = hand.score_hand()
+        assert score.hand == PokerHands.FULL_HOUSE, "Hand was not scored correctly"
+        assert score.strength == strength, "Score did not keep the strength"
+        assert len(score.cards) == 5, "Best cards were not five cards"
+
+    def test_streets_are_scored_incrementally(self):
+        import random
+        from src import evaluator
+        rng = random.Random(7)
+        for _ in range(200):
+            cards = [Card.from_int(card) for card in rng.sample(range(52), 7)]
+            hand = Hand(cards[:2])
+            for size in range(3, 8):
+                hand.add_card(cards[size - 1])
+                expected = evaluator.evaluate([card.id for card in cards[:size]])
+                assert hand.evaluate() == expected, "Incremental strength differed from a full evaluation"
+
+    def test_cache_sees_changes_to_cards(self):
+        cards = Card.cards_from_strings(["2S", "5D", "9C", "JH", "KS"])
+        hand = Hand(cards)
+        high_card = hand.evaluate()
+        cards.append(Card.from_string("KD"))
+        assert hand.evaluate() > high_card, "Card appended to the list was ignored"
+        hand.cards[0] = Card.from_string("KH")
+        assert hand.score_hand().hand == PokerHands.THREE_OF_A_KIND, "Replaced card was ignored"
+        hand.remove_card(Card.from_string("KH"))
+        assert hand.score_hand().hand == PokerHands.PAIR_OF_KINGS, "Removed card was still scored"
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+from src import history, runner
+from src.history import HandHistory
+from src.player import PlayerActions
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class TestHandHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "table.hh")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        with history.HandHistoryWriter(self.path) as writer:
+            writer.write(7, 40, [0, 40, 0], 2, [0, 5, 10, 15, 51], [[48, 49], [44, 45], [40, 41]],
+                         [(0, 0, None, 5), (0, 1, None, 10), (0, 2, PlayerActions.CALL, 10), (1, 0, PlayerActions.FOLD, 0)])
+        with HandHistory(self.path) as hands:
+            assert len(hands) == 1, "Record was not written"
+            hand = hands[0]
+            assert hand.hand_number == 7 and hand.pot == 40 and hand.button == 2, "Header fields were wrong"
+            assert hand.payouts == [0, 40, 0], "Payouts were wrong"
+            assert [card.id for card in hand.board] == [0, 5, 10, 15, 51], "Board was wrong"
+            assert [[card.id for card in hole] for hole in hand.holes] == [[48, 49], [44, 45], [40, 41]], "Holes were wrong"
+            assert hand.actions[2] == (0, 2, PlayerActions.CALL, 10), "Action was wrong"
+            assert hand.actions[0][2] is None, "Blind was not recorded"
+
+    def test_runner_logs_every_hand(self):
+        result = runner.play_table(3, 25, seed=2, history_path=self.path)
+        with HandHistory(self.path) as hands:
+            assert len(hands) == result.hands, "Not every hand was logged"
+            assert [hand.hand_number for hand in hands] == list(range(1, 26)), "Hands were out of order"
+            for hand in hands:
+                assert hand.pot == sum(hand.payouts), "Pot did not match the payouts"
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_structured_array_view(self):
+        runner.play_table(4, 10, seed=5, history_path=self.path)
+        hands = HandHistory(self.path)
+        records = hands.as_array()
+        assert records.dtype.itemsize == history.RECORD_SIZE, "dtype did not match the record size"
+        assert records["hand_number"].tolist() == [hand.hand_number for hand in hands], "Array view differs"
+        assert records["pot"].tolist() == [hand.pot for hand in hands], "Array pots differ"
+        del records
+
+if __name__ == '__main__':
+    unittest.main()
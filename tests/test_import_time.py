@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from src import evaluator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# seconds a fresh interpreter may spend importing the game modules; they
+# measure well under 0.1s, the rest is headroom for slow machines
+IMPORT_BUDGET = 0.5
+
+def _run(code):
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+
+class TestImportTime(unittest.TestCase):
+
+    def test_import_does_not_load_tables(self):
+        loaded = _run("import src.holdem, src.hand, src.evaluator as evaluator;"
+                      "print(evaluator._ARRAYS is not None or evaluator._HASH_KEYS is not None)")
+        assert loaded.strip() == "False", "Importing built or mapped the evaluator tables"
+
+    def test_import_budget(self):
+        code = ("import time; start = time.perf_counter(); import src.hand, src.holdem;"
+                "print(time.perf_counter() - start)")
+        seconds = min(float(_run(code)) for _ in range(3))
+        assert seconds < IMPORT_BUDGET, f"Import took {seconds:.3f}s, over the {IMPORT_BUDGET}s budget"
+
+    def test_first_evaluation_maps_the_data_file(self):
+        strength = _run("from src import evaluator; print(evaluator.evaluate7([51, 47, 43, 39, 35, 0, 1]),"
+                        "evaluator.table_arrays()[0].obj.__class__.__name__)")
+        assert strength.split() == [str(evaluator.evaluate7([51, 47, 43, 39, 35, 0, 1])), "mmap"], \
+            "Tables were not read from the mapped file"
+
+    def test_data_file_is_current(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tables.bin")
+            evaluator.write_tables(path)
+            with open(path, "rb") as built, open(evaluator.DATA_PATH, "rb") as shipped:
+                assert built.read() == shipped.read(), "Run python -m src.evaluator to rebuild the table file"
+
+if __name__ == '__main__':
+    unittest.main()
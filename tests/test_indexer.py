@@ -0,0 +1,65 @@
+import random
+import unittest
+
+from src import indexer
+from src.card import Card, Suit
+from src.equity import canonical_spot
+
+def cards(text):
+    return [Card.from_string(card) for card in text.split()]
+
+class TestIndexer(unittest.TestCase):
+
+    def test_street_sizes(self):
+        sizes = [indexer.size(street) for street in range(4)]
+        assert sizes == [169, 1286792, 13960050, 123156254], f"Unexpected state counts {sizes}"
+
+    def test_preflop_round_trip_is_dense(self):
+        seen = set()
+        for index in range(indexer.size(0)):
+            hole, board = indexer.cards(index, 0)
+            assert board == [] and indexer.index(hole, board) == index, f"Index {index} does not round trip"
+            seen.add(canonical_spot([card.id for card in hole], []))
+        assert len(seen) == 169, "Every index should be a different starting hand"
+
+    def test_round_trips_on_later_streets(self):
+        rng = random.Random(3)
+        for street in (1, 2, 3):
+            for index in rng.sample(range(indexer.size(street)), 2000):
+                hole, board = indexer.ids(index, street)
+                assert len(board) == indexer.BOARD_CARDS[street], "The board should fit the street"
+                assert indexer.index_ids(hole, board) == index, f"Index {index} on street {street} does not round trip"
+
+    def test_isomorphic_spots_share_an_index(self):
+        rng = random.Random(5)
+        for street in (1, 2, 3):
+            indexes = {}
+            for _ in range(1000):
+                dealt = rng.sample(range(52), 2 + indexer.BOARD_CARDS[street])
+                hole, board = dealt[:2], dealt[2:]
+                index = indexer.index_ids(hole, board)
+                spot = canonical_spot(hole, board)
+                assert indexes.setdefault(spot, index) == index, "Isomorphic spots should share an index"
+                assert canonical_spot(*indexer.ids(index, street)) == spot, "An index should map back to its spot"
+            assert len(set(indexes.values())) == len(indexes), "Different spots should not share an index"
+
+    def test_cards_use_card_and_suit(self):
+        first = indexer.index(cards("Ah Kh"), cards("Qh Jh 2c"))
+        assert first == indexer.index(cards("Ks As"), cards("2d Js Qs")), "Card order and suit names should not matter"
+        assert first != indexer.index(cards("Ah Kc"), cards("Qh Jh 2c")), "Different spots should not share an index"
+        hole, board = indexer.cards(first, 1)
+        assert all(isinstance(card.suit, Suit) for card in hole + board), "cards should return Card objects"
+        assert len({card.suit for card in hole + board}) == 2, "The spot should keep its two suits"
+
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            indexer.index(cards("Ah Kh"), cards("Qh Jh"))
+        with self.assertRaises(ValueError):
+            indexer.index(cards("Ah Kh"), cards("Ah Jh 2c"))
+        with self.assertRaises(ValueError):
+            indexer.cards(indexer.size(1), 1)
+        with self.assertRaises(ValueError):
+            indexer.size(4)
+
+if __name__ == "__main__":
+    unittest.main()
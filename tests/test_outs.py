@@ -0,0 +1,92 @@
+import random
+import unittest
+from collections import Counter
+from itertools import combinations
+
+from src import evaluator, outs
+from src.card import Card
+from src.hand import PokerHands
+from src.outs import analyze_outs, hand_class
+
+class TestOuts(unittest.TestCase):
+
+    def test_flush_draw(self):
+        report = analyze_outs(Card.cards_from_strings(["AH", "KH"]), Card.cards_from_strings(["2H", "7H", "9C", "3S"]))
+        assert report.hand == PokerHands.HIGH_CARD, "Current hand was not ace high"
+        assert report.outs_by_hand()[PokerHands.FLUSH] == 9, "Did not find nine flush cards"
+        assert len(report.cards) == 46, "Not every unseen card was reported"
+        assert report.next_street == report.by_river == len(report.outs) / 46, "Turn probabilities were wrong"
+
+    def test_probabilities_match_enumeration(self):
+        hole = Card.cards_from_strings(["8S", "9S"])
+        board = Card.cards_from_strings(["TD", "JS", "2C"])
+        report = analyze_outs(hole, board)
+        known = [card.id for card in hole + board]
+        board_ids = known[2:]
+        unseen = [card for card in range(52) if card not in known]
+
+        def board_class(cards):
+            if len(cards) >= 5:
+                return hand_class(evaluator.category_of(evaluator.evaluate(cards)))
+            counts = sorted(Counter(card >> 2 for card in cards).values(), reverse=True)
+            return {4: 7, 3: 3}.get(counts[0], counts.count(2))
+
+        def improves(extra):
+            before = hand_class(evaluator.category_of(evaluator.evaluate(known)))
+            after = hand_class(evaluator.category_of(evaluator.evaluate(known + extra)))
+            return after > before and after - before > board_class(board_ids + extra) - board_class(board_ids)
+
+        improved = sum(improves(list(runout)) for runout in combinations(unseen, 2))
+        assert abs(report.by_river - improved / len(list(combinations(unseen, 2)))) < 1e-12, "River odds were wrong"
+        outs = {card for card in unseen if improves([card])}
+        assert {outcome.card.id for outcome in report.outs} == outs, "Outs differed from a full evaluation"
+
+    def test_batched_runner_runner_matches_the_python_loop(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("numpy is not installed")
+        rng = random.Random(1)
+        for _ in range(30):
+            hero = rng.sample(range(52), 5)
+            unseen = [card for card in range(52) if card not in hero]
+            hero_class = hand_class(evaluator.category_of(evaluator.evaluate(hero)))
+            board_class = rng.randrange(3)
+            assert outs._runner_runner_batch(hero, unseen, hero_class, board_class) == \
+                outs._runner_runner(hero, unseen, hero_class, board_class), f"Batch differed for {hero}"
+
+    def test_board_pairing_cards_are_not_outs(self):
+        report = analyze_outs(Card.cards_from_strings(["AH", "KH"]), Card.cards_from_strings(["2H", "7H", "9C"]))
+        outs = {outcome.card.to_string() for outcome in report.outs}
+        assert len(outs) == 15 and "7D" not in outs and "AS" in outs, "Board pairing cards were counted as outs"
+        assert abs(report.next_street - 15 / 47) < 1e-12, "Next street odds counted board pairing cards"
+        report = analyze_outs(Card.cards_from_strings(["8S", "8D"]), Card.cards_from_strings(["2C", "5H", "JD", "3S"]))
+        assert {outcome.card.to_string() for outcome in report.outs} == {"8H", "8C"}, "Only the set cards improve"
+
+    def test_board_pairing_outs_are_tainted(self):
+        report = analyze_outs(Card.cards_from_strings(["AS", "KD"]), Card.cards_from_strings(["2C", "7H", "9S"]))
+        tainted = {outcome.card.to_string() for outcome in report.tainted_outs}
+        assert "7D" not in {outcome.card.to_string() for outcome in report.outs}, "Pairing the board was an out"
+        assert not tainted and len(report.clean_outs) == 6, "Pairing a hole card should be a clean out"
+        report = analyze_outs(Card.cards_from_strings(["AS", "AD"]), Card.cards_from_strings(["2C", "7H", "9S", "KH"]))
+        tainted = {outcome.card.to_string() for outcome in report.tainted_outs}
+        assert tainted == {"AH"}, "A set card bringing a third heart should be tainted"
+
+    def test_known_opponents_decide_clean_outs(self):
+        hole = Card.cards_from_strings(["AH", "KH"])
+        board = Card.cards_from_strings(["2H", "7H", "9C", "3S"])
+        report = analyze_outs(hole, board, [Card.cards_from_strings(["9S", "9D"])])
+        clean = {outcome.card.to_string() for outcome in report.clean_outs}
+        assert "QH" in clean, "Flush card that beats the set was tainted"
+        assert "3H" not in clean and "9H" not in clean, "Card filling up the set was clean"
+        assert len(report.cards) == 44, "Opponent cards were counted as unseen"
+
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            analyze_outs(Card.cards_from_strings(["AH", "KH"]), Card.cards_from_strings(["2H", "7H"]))
+        with self.assertRaises(ValueError):
+            analyze_outs(Card.cards_from_strings(["AH", "KH"]), Card.cards_from_strings(["2H", "7H", "9C"]),
+                         [Card.cards_from_strings(["AH", "QS"])])
+
+if __name__ == '__main__':
+    unittest.main()
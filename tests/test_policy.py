@@ -0,0 +1,72 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src import runner
+
+if np is not None:
+    from src.policy import ACTION_CODES, CallingPolicy, DecisionBatch, Policy, RandomPolicy
+
+from src.card import Card
+from src.holdem import TexasHoldem
+from src.player import PlayerActions
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestPolicy(unittest.TestCase):
+
+    def test_batch_features(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        game.players[0].cards = Card.cards_from_strings(["AS", "KD"])
+        game.board_cards = Card.cards_from_strings(["2C", "7H", "9S"])
+        game.pot = 30
+        batch = DecisionBatch.from_games([(5, game, 0)])
+        assert batch.holes.tolist() == [[51, 45]], "Hole cards were not encoded as ids"
+        assert batch.boards.tolist() == [[2, 20, 31, -1, -1]], "Board was not padded"
+        assert batch.streets().tolist() == [1], "Street was not the flop"
+        features = batch.features()
+        assert features.shape == (1, 104 + 2 + len(PlayerActions)), "Unexpected feature width"
+        assert features[0, :104].sum() == 5, "Cards were not one hot encoded"
+
+    def test_features_skip_undealt_hole_cards(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        batch = DecisionBatch.from_games([(0, game, 0)])
+        assert batch.holes.tolist() == [[-1, -1]], "Missing hole cards were not padded"
+        assert batch.features()[0, :104].sum() == 0, "Hole padding was encoded as a card"
+
+    def test_illegal_actions_fall_back(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        game.players[0].chips = 0
+        batch = DecisionBatch.from_games([(0, game, 0), (0, game, 1)])
+        raise_ = ACTION_CODES[PlayerActions.RAISE]
+        assert batch.legal([raise_, raise_]).tolist() == [ACTION_CODES[PlayerActions.FOLD], raise_], \
+            "Illegal action was not replaced"
+
+    def test_calling_policy_matches_ai_action(self):
+        batched = runner.play_batched(CallingPolicy(), tables=2, hands=20, number_of_players=3, seed=4)
+        sequential = runner.run(tables=2, hands=20, number_of_players=3, seed=4)
+        assert batched.hands == 40, "Not every hand was played"
+        assert batched.net_chips == sequential.net_chips, "Batched play diverged from Player.ai_action"
+
+    def test_decisions_are_batched_across_tables(self):
+        class Recording(RandomPolicy):
+            sizes = []
+
+            def decide(self, batch):
+                self.sizes.append(len(batch))
+                return super().decide(batch)
+
+        policy = Recording(seed=1)
+        report = runner.play_batched(policy, tables=6, hands=10, number_of_players=4, seed=2)
+        assert report.hands == 60, "Not every hand was played"
+        assert sum(report.net_chips) == 0, "Chips were created or lost"
+        assert max(policy.sizes) == 6, "Decisions were not collected from every table"
+
+    def test_policy_must_be_implemented(self):
+        with self.assertRaises(TypeError):
+            Policy()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import preflop
+from src.card import Card
+from src.holdem import TexasHoldem
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def ids(card_strings):
+    return [card.id for card in Card.cards_from_strings(card_strings)]
+
+class TestPreflopTable(unittest.TestCase):
+
+    def test_canonical_hands(self):
+        indexes = {preflop.hand_index(card_a, card_b) for card_a in range(52) for card_b in range(52) if card_a != card_b}
+        assert indexes == set(range(preflop.HANDS)), "Starting hands did not cover all 169 classes"
+        assert preflop.hand_index(*ids(["AS", "KS"])) == preflop.hand_index(*ids(["KH", "AH"])), "Suited hands differ"
+        assert preflop.hand_index(*ids(["AS", "KH"])) != preflop.hand_index(*ids(["AS", "KS"])), "Offsuit matched suited"
+        for index in range(preflop.HANDS):
+            assert preflop.hand_index(*preflop.representative(index)) == index, "Representative was not in its class"
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_build_and_lookup(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "preflop.bin")
+            preflop.build_table(path, rounds=200, workers=1)
+            table = preflop.load_table(path)
+            aces = table.equity(*ids(["AS", "AH"]), 1)
+            seven_deuce = table.equity(*ids(["7S", "2H"]), 1)
+            assert aces > 0.7 > seven_deuce, "Table did not rank aces above seven deuce"
+            rates = table.rates(*ids(["AS", "AH"]), 4)
+            self.assertAlmostEqual(sum(rates), 1.0, places=5)
+
+    def test_simulate_answers_preflop_from_the_table(self):
+        if preflop.load_table() is None:
+            self.skipTest("preflop table has not been built")
+        game = TexasHoldem(["Alice", "Bob"])
+        with mock.patch("src.holdem._simulate_chunk") as simulate_chunk:
+            rates = game.simulate(Card.cards_from_strings(["AS", "AH"]), 2)
+        simulate_chunk.assert_not_called()
+        self.assertAlmostEqual(rates[0], 0.85, delta=0.01)
+
+if __name__ == '__main__':
+    unittest.main()
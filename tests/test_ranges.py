@@ -0,0 +1,56 @@
+import unittest
+
+from src import equity
+from src.card import Card
+from src.holdem import TexasHoldem
+from src.ranges import parse_range, range_equity
+
+def ids(card_strings):
+    return [card.id for card in Card.cards_from_strings(card_strings)]
+
+class TestRangeParsing(unittest.TestCase):
+
+    def test_shorthand_counts(self):
+        assert len(parse_range("22+")) == 78, "Pairs were not expanded"
+        assert len(parse_range("A2s+")) == 48, "Suited kickers were not expanded"
+        assert len(parse_range("KTo+")) == 36, "Offsuit kickers were not expanded"
+        assert len(parse_range("AJs-A8s, QQ-99, AK")) == 16 + 24 + 16, "Dash ranges were not expanded"
+        assert len(parse_range("22+, A2s+, KTo+")) == 78 + 48 + 36, "Combined range was wrong"
+
+    def test_weights_and_exact_combos(self):
+        holdings = parse_range("AK:0.5, AsKs")
+        ace_king = tuple(ids(["AS", "KS"]))
+        assert holdings[ace_king] == 1.0 and len(holdings) == 16, "Later token did not override the weight"
+        assert set(parse_range({"AKo": 0.25}).values()) == {0.25}, "Mapping weights were ignored"
+
+    def test_rejects_bad_tokens(self):
+        for token in ("AAs", "AKx", "AKs-KQs", "1K"):
+            with self.assertRaises(ValueError):
+                parse_range(token)
+
+class TestRangeEquity(unittest.TestCase):
+
+    def test_single_combo_against_any_two_matches_exact_equity(self):
+        board = Card.cards_from_strings(["2C", "7D", "JS", "4H", "9H"])
+        any_two = {holding: 1.0 for holding in parse_range("22+, A2+, K2+, Q2+, J2+, T2+, 92+, 82+, 72+, 62+, 52+, 42+, 32")}
+        assert len(any_two) == 1326, "Any two cards was not every holding"
+        rates = range_equity(["AhJh", any_two], board)
+        expected = equity.exact_equity(ids(["AH", "JH"]), [card.id for card in board], 2)
+        assert max(abs(rate - other) for rate, other in zip(rates, expected)) < 1e-9, "Range equity differs from exact"
+
+    def test_sampling_matches_enumeration(self):
+        board = Card.cards_from_strings(["2C", "7D", "JS", "4H"])
+        exact = range_equity(["AA, KK", "AA, AKs, QQ"], board, exact=True)
+        sampled = range_equity(["AA, KK", "AA, AKs, QQ"], board, rounds=20000, exact=False, seed=3)
+        assert abs(exact[0] - sampled[0]) < 0.015, "Sampled range equity is biased"
+
+    def test_dead_cards_and_blockers(self):
+        board = Card.cards_from_strings(["AS", "2C", "7D"])
+        rates = TexasHoldem(["Alice"]).simulate_ranges(["AA", "KK"], board, dead=Card.cards_from_strings(["AH"]))
+        assert rates == range_equity(["AdAc", "KK"], board, Card.cards_from_strings(["AH"])), \
+            "Dead and board cards did not remove combos"
+        with self.assertRaises(ValueError):
+            range_equity(["AA", "AhAs"], Card.cards_from_strings(["AD", "AC", "2C"]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import random
+import unittest
+from unittest import mock
+
+from src import runner
+from src.holdem import TexasHoldem
+from src.player import Attitude, PlayerActions, PlayerState
+
+class TestRunner(unittest.TestCase):
+
+    def test_chips_are_conserved(self):
+        result = runner.play_table(4, 50, seed=3)
+        assert result.hands == 50, "Table did not play every hand"
+        assert sum(result.net_chips) == 0, "Chips were created or lost"
+
+    def test_runs_without_console_io(self):
+        with mock.patch("builtins.input") as console_input, mock.patch("builtins.print") as console_print:
+            report = runner.run(tables=2, hands=20, number_of_players=3, seed=1)
+        console_input.assert_not_called()
+        console_print.assert_not_called()
+        assert report.hands == 40 and report.hands_per_second > 0, "Report did not count hands"
+
+    def test_runs_repeat_across_workers(self):
+        single = runner.run(tables=2, hands=20, number_of_players=3, seed=4)
+        parallel = runner.run(tables=2, hands=20, number_of_players=3, seed=4, workers=2)
+        assert single.net_chips == parallel.net_chips, "Worker count changed the results"
+
+    def test_short_stack_stays_in_after_calling_all_in(self):
+        game = TexasHoldem(["a", "b", "c"], 40, rng=random.Random(3))
+        for player in game.players:
+            player.attitude = Attitude.PASSIVE
+        payouts = game.play_hand()
+        assert game.players[0].state == PlayerState.ALL_IN, "Seat emptied by a call was not all in"
+        assert (3, 0, PlayerActions.FOLD, 0) not in game.actions, "All in seat was made to fold"
+        assert sum(payouts) == 120 and sum(player.chips for player in game.players) == 120, "Pot was not paid out"
+        result = runner.play_table(3, 50, starting_chips=40, attitudes=[Attitude.PASSIVE] * 3, seed=3)
+        assert sum(result.net_chips) == 0, "Chips were created or lost with short stacks"
+
+    def test_stack_short_of_the_big_blind_calls_all_in(self):
+        game = TexasHoldem(["a", "b", "c"], 45, rng=random.Random(3))
+        for player in game.players:
+            player.attitude = Attitude.PASSIVE
+        game.play_hand()
+        folds = [action for action in game.actions if action[1] == 0 and action[2] == PlayerActions.FOLD]
+        assert not folds and game.players[0].state == PlayerState.ALL_IN, "Short stack was made to fold"
+        assert (3, 0, PlayerActions.CALL, 5) in game.actions, "Short stack did not call with what it had"
+        assert sum(player.chips for player in game.players) == 135, "Chips were created or lost"
+        result = runner.play_table(3, 50, starting_chips=45, attitudes=[Attitude.PASSIVE] * 3, seed=3)
+        assert sum(result.net_chips) == 0, "Chips were created or lost with short stacks"
+
+    def test_rejects_human_seats(self):
+        with self.assertRaises(ValueError):
+            runner.play_table(2, 1, attitudes=[Attitude.PLAYER, Attitude.PASSIVE])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import random
+import time
+import unittest
+from unittest import mock
+
+from src import runner, search
+from src.card import Card
+from src.holdem import TexasHoldem
+from src.player import Attitude, PlayerActions
+
+def _game_at_first_decision(seed=1, players=3):
+    game = TexasHoldem([f"Player {seat}" for seat in range(players)], rng=random.Random(seed))
+    for player in game.players:
+        player.attitude = Attitude.PASSIVE
+    steps = game.hand_steps()
+    return game, steps, next(steps)
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_restore_undoes_the_rest_of_the_hand(self):
+        game, steps, seat = _game_at_first_decision()
+        snapshot = game.snapshot()
+        before = ([(player.chips, player.state, list(player.cards)) for player in game.players],
+                  game.pot, list(game.board_cards), len(game.actions), game.deck.cards)
+        for _ in range(4):
+            try:
+                seat = steps.send(PlayerActions.CALL)
+            except StopIteration:
+                break
+        game.restore(snapshot)
+        after = ([(player.chips, player.state, list(player.cards)) for player in game.players],
+                 game.pot, list(game.board_cards), len(game.actions), game.deck.cards)
+        assert after == before, "Restore did not bring the game back"
+
+class TestSearch(unittest.TestCase):
+
+    def test_search_leaves_the_game_untouched(self):
+        game, steps, seat = _game_at_first_decision()
+        rng_state = game.deck.rng.getstate()
+        before = game.snapshot()
+        deck = game.deck.cards
+        action = search.search_action(game, seat, time_budget=0.02, rng=random.Random(0))
+        assert action in game.players[seat].available_actions(game), "Search picked an unavailable action"
+        assert game.deck.rng.getstate() == rng_state, "Search used the game's generator"
+        assert game.snapshot()[:5] == before[:5] and game.deck.cards == deck, "Search changed the game"
+
+    def test_search_keeps_to_the_time_budget(self):
+        game, steps, seat = _game_at_first_decision(players=6)
+        start = time.perf_counter()
+        search.search_action(game, seat, time_budget=0.05, rng=random.Random(0))
+        assert time.perf_counter() - start < 0.25, "Search ran well past its budget"
+
+    def test_seeded_search_repeats(self):
+        game, steps, seat = _game_at_first_decision()
+        first = search.search_action(game, seat, time_budget=60, max_iterations=60, rng=random.Random(4))
+        again = search.search_action(game, seat, time_budget=60, max_iterations=60, rng=random.Random(4))
+        assert first == again, "Same generator gave a different decision"
+
+    def test_nuts_are_not_folded(self):
+        game, steps, seat = _game_at_first_decision()
+        game.players[seat].cards = Card.cards_from_strings(["AS", "KS"])
+        game.board_cards = Card.cards_from_strings(["QS", "JS", "TS"])
+        game.deck.mark_dead([card.id for card in game.players[seat].cards + game.board_cards])
+        action = search.search_action(game, seat, time_budget=60, max_iterations=150, rng=random.Random(1))
+        assert action != PlayerActions.FOLD, "Search folded a royal flush"
+
+    def test_search_seats_play_whole_hands(self):
+        with mock.patch.object(search, "TIME_BUDGET", 0.002):
+            result = runner.play_table(3, 5, attitudes=[Attitude.SEARCH, Attitude.PASSIVE, Attitude.PASSIVE], seed=2)
+        assert result.hands == 5 and sum(result.net_chips) == 0, "Search seat broke the table"
+
+if __name__ == '__main__':
+    unittest.main()
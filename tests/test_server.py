@@ -0,0 +1,65 @@
+import asyncio
+import json
+import unittest
+
+from src.player import PlayerActions
+from src.server import LocalAgent, TableServer
+
+async def play_agent(host, port, name, answer):
+    # a scripted agent: answer is an action name, or None to never reply
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(json.dumps({"type": "join", "name": name}).encode() + b"\n")
+    await writer.drain()
+    messages = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        message = json.loads(line)
+        messages.append(message)
+        if message["type"] == "action" and answer is not None:
+            writer.write(json.dumps({"id": message["id"], "action": answer}).encode() + b"\n")
+            await writer.drain()
+        if message["type"] == "done":
+            break
+    writer.close()
+    return messages
+
+class TestTableServer(unittest.TestCase):
+
+    def test_remote_agents_and_timeouts(self):
+        async def scenario():
+            server = TableServer(seats=2, hands=3, action_timeout=0.05)
+            host, port = (await server.start())[:2]
+            caller, sleeper = await asyncio.gather(play_agent(host, port, "caller", "Call"),
+                                                   play_agent(host, port, "sleeper", None))
+            await asyncio.gather(*server.table_tasks)
+            await server.close()
+            return server, caller, sleeper
+
+        server, caller, sleeper = asyncio.run(scenario())
+        results = [message for message in caller if message["type"] == "result"]
+        assert len(results) == 3, "Table did not play every hand"
+        assert caller[-1]["type"] == "done", "Agent was not told the table finished"
+        assert any(message["type"] == "action" for message in sleeper), "Silent agent was never asked to act"
+        sleeper_seat = sleeper[0]["seat"]
+        decisions = [action for action in server.tables[0].game.actions if action[2] is not None]
+        assert all(action[2] == PlayerActions.FOLD for action in decisions if action[1] == sleeper_seat), "Timeout did not fold"
+        assert all(action[2] == PlayerActions.CALL for action in decisions if action[1] != sleeper_seat), "Reply was ignored"
+        assert sum(results[-1]["chips"]) == 1000, "Chips were created or lost"
+
+    def test_many_tables_share_one_loop(self):
+        async def scenario():
+            server = TableServer(seats=3, hands=5, action_timeout=0.05)
+            for table in range(20):
+                for seat in range(3):
+                    server.seat_agent(LocalAgent(f"bot-{table}-{seat}"))
+            played = await asyncio.gather(*server.table_tasks)
+            await server.close()
+            return played
+
+        played = asyncio.run(scenario())
+        assert played == [5] * 20, "Tables did not all finish"
+
+if __name__ == '__main__':
+    unittest.main()
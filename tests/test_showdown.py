@@ -0,0 +1,68 @@
+import unittest
+from unittest import mock
+
+from src import showdown
+from src.card import Card
+from src.holdem import TexasHoldem
+from src.hand import PokerHands
+from src.player import PlayerState
+
+class TestShowdown(unittest.TestCase):
+
+    def test_side_pots_from_all_in_stacks(self):
+        # seat 0 is all in for 50 with the best hand, seats 1 and 2 play on for 200
+        payouts = showdown.resolve([300, 200, 100], [50, 200, 200])
+        assert payouts == [150, 300, 0], "Side pot was not paid to the best remaining hand"
+
+    def test_odd_chips_go_left_of_the_button(self):
+        payouts = showdown.resolve([100, 100, 100, 50], [25, 25, 25, 25], button=1)
+        assert payouts == [33, 33, 34, 0], "Odd chip did not go to the first winner left of the button"
+        assert sum(payouts) == 100, "Chips were created or lost"
+
+    def test_folded_chips_stay_in_the_pot(self):
+        payouts = showdown.resolve([None, 200, 100], [40, 30, 30])
+        assert payouts == [10, 90, 0], "Uncalled chips were not returned"
+
+    def test_ties_are_found_without_sorting(self):
+        assert showdown.best_seats([5, None, 9, 9, 1]) == [2, 3], "Tied seats were not found"
+
+    def test_table_pays_side_pots(self):
+        game = TexasHoldem(["Alice", "Bob", "Carol"])
+        game.board_cards = Card.cards_from_strings(["2S", "7D", "9C", "JH", "3S"])
+        game.players[0].cards = Card.cards_from_strings(["AS", "AH"])
+        game.players[1].cards = Card.cards_from_strings(["KS", "KH"])
+        game.players[2].cards = Card.cards_from_strings(["QS", "QH"])
+        for player, amount in zip(game.players, [100, 300, 300]):
+            game.add_to_pot(player.bet(amount))
+        game.players[0].state = PlayerState.ALL_IN
+        winners = game.determine_winner()
+        assert [winner[0] for winner in winners] == ["Alice"], "Aces did not win the showdown"
+        with mock.patch.object(game, "_showdown_strengths", side_effect=AssertionError("Hands were evaluated twice")):
+            payouts = game.distribute_winnings(winners)
+        assert payouts == [300, 400, 0], "Pots were paid wrong"
+        assert [player.chips for player in game.players] == [700, 600, 200], "Chips were not credited"
+        assert game.pot == 0, "Pot was not emptied"
+
+    def test_uncontested_winner_has_a_real_hand(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        game.board_cards = Card.cards_from_strings(["2S", "7D", "9C", "JH", "3S"])
+        game.players[0].cards = Card.cards_from_strings(["AS", "AH"])
+        game.players[1].cards = Card.cards_from_strings(["KS", "KH"])
+        game.players[1].state = PlayerState.FOLDED
+        winners = game.determine_winner()
+        assert [winner[0] for winner in winners] == ["Alice"], "The only live player did not win"
+        assert winners[0][1].value.hand == PokerHands.PAIR_OF_ACES, "Uncontested winner's hand was not evaluated"
+
+    def test_stale_strengths_are_not_paid(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        game.board_cards = Card.cards_from_strings(["2S", "7D", "9C", "JH", "3S"])
+        game.players[0].cards = Card.cards_from_strings(["AS", "AH"])
+        game.players[1].cards = Card.cards_from_strings(["KS", "KH"])
+        for player in game.players:
+            game.add_to_pot(player.bet(100))
+        winners = game.determine_winner()
+        game.players[1].cards = Card.cards_from_strings(["JS", "JD"])
+        assert game.distribute_winnings(winners) == [0, 200], "Strengths from before the change were paid"
+
+if __name__ == '__main__':
+    unittest.main()
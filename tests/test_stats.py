@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from src import stats
+from src.card import Card
+from src.hand import Hand
+from src.holdem import TexasHoldem
+
+class TestStats(unittest.TestCase):
+
+    def setUp(self):
+        stats.reset()
+        stats.enable()
+
+    def tearDown(self):
+        stats.disable()
+        stats.reset()
+
+    def test_counts_hot_paths(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        game.simulate(Card.cards_from_strings(["AS", "KS"]), 3, number_of_rounds=300, exact=False, seed=1)
+        hand = Hand.from_strings(["AS", "KS", "QS", "JS", "TS", "2D", "3C"])
+        hand.evaluate()
+        hand.evaluate()
+        hand.score_hand()
+        counters = stats.snapshot()["counters"]
+        assert counters["simulate.rounds"] == 300, "Rounds were not counted"
+        assert counters["simulate.evaluations"] == 900, "Simulated evaluations were not counted"
+        assert counters["deck.resets"] >= 300, "Deck resets were not counted"
+        assert counters["hand.evaluations"] == 1 and counters["hand.cache_hits"] >= 1, "Hand cache was not counted"
+        assert counters["hand.combinations"] >= 1, "Combinations were not counted"
+        assert stats.snapshot()["timings"]["simulate"]["calls"] == 1, "Simulate was not timed"
+
+    def test_merges_chunk_timings_from_workers(self):
+        game = TexasHoldem(["Alice", "Bob"])
+        game.simulate(Card.cards_from_strings(["AS", "KS"]), 3, number_of_rounds=600, exact=False, seed=1, workers=2)
+        timings = stats.snapshot()["timings"]
+        for phase in ("simulate.deal", "simulate.evaluate"):
+            assert timings[phase]["calls"] == 3, f"{phase} was not timed for every chunk"
+            assert timings[phase]["seconds"] > 0, f"{phase} recorded no time"
+        assert timings["simulate.deal"]["seconds"] + timings["simulate.evaluate"]["seconds"] \
+            < timings["simulate"]["seconds"], "Chunk phases should fit inside the simulate call"
+
+    def test_disabled_records_nothing(self):
+        stats.disable()
+        game = TexasHoldem(["Alice", "Bob"])
+        game.deal()
+        Hand.from_strings(["AS", "KS", "QS", "JS", "TS"]).evaluate()
+        assert stats.snapshot() == {"counters": {}, "timings": {}}, "Disabled stats recorded data"
+
+    def test_env_var_dumps_at_exit(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            script = "from src.holdem import TexasHoldem\nTexasHoldem(['Alice', 'Bob']).deal()\n"
+            environment = dict(os.environ, **{stats.ENV_VAR: path})
+            subprocess.run([sys.executable, "-c", script], check=True, env=environment,
+                           cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            with open(path) as profile_file:
+                profile = json.load(profile_file)
+            assert profile["timings"]["deal"]["calls"] == 1, "Profile did not record the deal"
+
+if __name__ == '__main__':
+    unittest.main()